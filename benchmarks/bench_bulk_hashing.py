@@ -0,0 +1,56 @@
+"""
+Throughput of bcrypt hashing for bulk user creation: the old sequential loop
+versus PasswordUtils.hash_passwords_async on the process pool.
+
+    python -m benchmarks.bench_bulk_hashing --sizes 100 1000 10000
+
+The sequential loop is only timed up to --sequential-limit users and
+extrapolated beyond that, since 10k bcrypt hashes take minutes on one core.
+"""
+
+import argparse
+import asyncio
+import time
+
+from task.utils.password_utils import PasswordUtils
+
+
+def bench_sequential(size: int, limit: int) -> float:
+    sample = min(size, limit)
+    start = time.perf_counter()
+    for i in range(sample):
+        PasswordUtils.hash_password(f"password{i}")
+    return (time.perf_counter() - start) * size / sample
+
+
+async def bench_parallel(size: int) -> float:
+    passwords = [f"password{i}" for i in range(size)]
+    start = time.perf_counter()
+    hashed = await PasswordUtils.hash_passwords_async(passwords)
+    elapsed = time.perf_counter() - start
+    assert len(hashed) == size
+    return elapsed
+
+
+async def main(args: argparse.Namespace) -> None:
+    await PasswordUtils.hash_passwords_async(["warmup"])
+    workers = PasswordUtils.bulk_pool.max_workers
+    print(f"process pool workers: {workers}")
+    print(
+        f"{'users':>8} {'sequential s':>14} {'parallel s':>12} {'hashes/s':>10} {'speedup':>8}"
+    )
+    for size in args.sizes:
+        sequential = bench_sequential(size, args.sequential_limit)
+        parallel = await bench_parallel(size)
+        print(
+            f"{size:>8} {sequential:>14.2f} {parallel:>12.2f} "
+            f"{size / parallel:>10.1f} {sequential / parallel:>7.1f}x"
+        )
+    PasswordUtils.bulk_pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--sequential-limit", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,115 @@
+"""
+Compares cache codecs on realistic UserRelDto lists: encode/decode time and
+payload size, plus the memory Redis reports for the stored key when a Redis
+server is reachable.
+
+    python -m benchmarks.bench_cache_codec --users 1000 --projects-per-user 3
+
+Codecs whose optional packages (msgpack, zstandard, lz4) are not installed
+are skipped. The "json-text" row is the previous stdlib json text format.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from benchmarks.bench_users_cache_hit import build_page
+from task.apps.users.schemas import UserRelListAdapter
+from task.settings.settings import settings
+from task.utils.cache_codec import CacheCodec
+
+
+def build_codecs(threshold: int) -> dict[str, CacheCodec]:
+    codecs = {}
+    for serializer in CacheCodec.SERIALIZERS:
+        for compression in CacheCodec.COMPRESSIONS:
+            try:
+                codec = CacheCodec(serializer, compression, threshold=threshold)
+            except RuntimeError:
+                continue
+            codecs[f"{serializer}+{compression}"] = codec
+    return codecs
+
+
+def timed(func, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def redis_memory(redis: Redis | None, key: str, payload: bytes) -> int | None:
+    if redis is None:
+        return None
+    await redis.set(key, payload)
+    usage = await redis.memory_usage(key)
+    await redis.delete(key)
+    return usage
+
+
+async def main(args: argparse.Namespace) -> None:
+    page = build_page(args.users, args.projects_per_user)
+    value = UserRelListAdapter.dump_python(page.users, mode="json")
+
+    redis = Redis.from_url(args.redis_url)
+    try:
+        await redis.ping()
+    except RedisError:
+        await redis.aclose()
+        redis = None
+
+    rows = []
+    text_payload = json.dumps([json.dumps(user) for user in value]).encode()
+    rows.append(
+        (
+            "json-text",
+            timed(
+                lambda: json.dumps([json.dumps(user) for user in value]), args.repeat
+            ),
+            timed(
+                lambda: [json.loads(user) for user in json.loads(text_payload)],
+                args.repeat,
+            ),
+            len(text_payload),
+            await redis_memory(redis, "bench:codec", text_payload),
+        )
+    )
+    for name, codec in build_codecs(args.threshold).items():
+        payload = codec.dumps(value)
+        assert codec.loads(payload) == value
+        rows.append(
+            (
+                name,
+                timed(lambda: codec.dumps(value), args.repeat),
+                timed(lambda: codec.loads(payload), args.repeat),
+                len(payload),
+                await redis_memory(redis, "bench:codec", payload),
+            )
+        )
+    if redis is not None:
+        await redis.aclose()
+
+    print(
+        f"{'codec':<18} {'encode us':>10} {'decode us':>10} "
+        f"{'bytes':>10} {'redis bytes':>12}"
+    )
+    for name, encode, decode, size, memory in rows:
+        memory = "-" if memory is None else str(memory)
+        print(f"{name:<18} {encode:10.1f} {decode:10.1f} {size:10d} {memory:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--redis-url", default=os.getenv("BENCH_REDIS_URL", settings.redis_cache_url)
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects-per-user", type=int, default=3)
+    parser.add_argument("--threshold", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+"""
+Runs a fixed number of concurrent workers against the database through the
+async engine for several pool sizes and reports throughput, latency
+percentiles and how long requests waited for a pooled connection.
+
+    python -m benchmarks.bench_db_pool --pool-sizes 1,2,5,10,20,40 --concurrency 64
+
+Each "request" checks out a session and runs the user lookup by id followed
+by `pg_sleep(--query-ms)`, which stands in for the rest of the request's
+database work. max_overflow is 0 so the pool size is the only limit.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from task.apps.users.models import User
+from task.settings.settings import settings
+
+
+async def worker(
+    session_factory: async_sessionmaker,
+    deadline: float,
+    query_ms: float,
+    max_user_id: int,
+    latencies: list[float],
+    waits: list[float],
+) -> None:
+    sleep = text("SELECT pg_sleep(:seconds)")
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        async with session_factory() as session:
+            connection = await session.connection()
+            waits.append(time.perf_counter() - start)
+            await connection.execute(
+                select(User.id, User.username).where(
+                    User.id == random.randint(1, max_user_id)
+                )
+            )
+            if query_ms:
+                await connection.execute(sleep, {"seconds": query_ms / 1000})
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args: argparse.Namespace, pool_size: int) -> dict:
+    options = settings.db_engine_options | {
+        "pool_size": pool_size,
+        "max_overflow": 0,
+        "pool_timeout": 60,
+        "echo": False,
+    }
+    engine = create_async_engine(args.db_url, **options)
+    session_factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+    async with engine.connect() as conn:
+        max_user_id = await conn.scalar(text("SELECT coalesce(max(id), 1) FROM users"))
+
+    latencies: list[float] = []
+    waits: list[float] = []
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            worker(
+                session_factory, deadline, args.query_ms, max_user_id, latencies, waits
+            )
+            for _ in range(args.concurrency)
+        )
+    )
+    await engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": len(latencies) / args.duration,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+        "wait": statistics.fmean(waits) * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"concurrency={args.concurrency} duration={args.duration}s "
+        f"query_ms={args.query_ms}"
+    )
+    print(f"{'pool':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'wait ms':>10}")
+    for pool_size in args.pool_sizes:
+        result = await run(args, pool_size)
+        print(
+            f"{pool_size:>6} {result['rps']:>10.0f} {result['p50']:>10.2f} "
+            f"{result['p99']:>10.2f} {result['wait']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL", settings.db_url))
+    parser.add_argument(
+        "--pool-sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=[1, 2, 5, 10, 20, 40],
+    )
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--query-ms", type=float, default=2)
+    asyncio.run(main(parser.parse_args()))
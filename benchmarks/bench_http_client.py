@@ -0,0 +1,95 @@
+"""
+Compares outbound GET latency with a fresh httpx.AsyncClient per request
+(the old `httpx_client` dependency) against the shared, pooled client built
+by create_http_client.
+
+    python -m benchmarks.bench_http_client --requests 500 --concurrency 10
+
+By default the jsonplaceholder stub is served locally with uvicorn, so only
+the TCP connect is saved; pass --url https://jsonplaceholder.typicode.com/posts
+to include the TLS handshake of a real remote API.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+import uvicorn
+
+from task.settings.settings import settings
+from task.tests.stubs.jsonplaceholder import JSONPlaceholderStub
+from task.utils.http_client import create_http_client
+
+
+async def fresh_client_get(url: str, shared: httpx.AsyncClient) -> None:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(url)
+        response.raise_for_status()
+
+
+async def shared_client_get(url: str, shared: httpx.AsyncClient) -> None:
+    response = await shared.get(url)
+    response.raise_for_status()
+
+
+async def measure(
+    get, url: str, shared: httpx.AsyncClient, requests: int, concurrency: int
+) -> dict:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await get(url, shared)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = None
+    url = args.url
+    if url is None:
+        stub = JSONPlaceholderStub(latency_ms=args.stub_latency_ms)
+        config = uvicorn.Config(stub, port=args.port, log_level="warning")
+        server = uvicorn.Server(config)
+        serving = asyncio.create_task(server.serve())
+        while not server.started:
+            await asyncio.sleep(0.01)
+        url = f"http://127.0.0.1:{args.port}/posts"
+
+    print(f"{url} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'client':<8} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    shared = create_http_client(settings)
+    for name, get in (("fresh", fresh_client_get), ("shared", shared_client_get)):
+        result = await measure(get, url, shared, args.requests, args.concurrency)
+        print(
+            f"{name:<8} {result['rps']:>10.0f} {result['p50']:>10.2f} "
+            f"{result['p99']:>10.2f}"
+        )
+
+    await shared.aclose()
+    if server is not None:
+        server.should_exit = True
+        await serving
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--stub-latency-ms", type=float, default=0)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,50 @@
+"""
+Measures the cost of verifying one access token with each available JWT
+backend against a TokenUtils.decode_token call served from the verified
+token cache.
+
+    python -m benchmarks.bench_jwt --iterations 20000
+
+The PyJWT rows are skipped when PyJWT is not installed. Backend rows call
+the backend directly, so they show the per-request cost without the cache.
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+
+from task.settings.settings import settings
+from task.utils.token_utils import JoseBackend, PyJWTBackend, TokenUtils, pyjwt
+
+SECRET = "bench-secret-key-of-a-reasonable-length"
+
+
+def measure(fn: Callable[[], object], iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main(args: argparse.Namespace) -> None:
+    settings.SECRET_KEY = SECRET
+    token = TokenUtils.create_access_token({"sub": "bench_user"})
+    rows = {
+        "jose": lambda: JoseBackend.decode(token, SECRET, settings.ALG),
+    }
+    if pyjwt is not None:
+        rows["pyjwt"] = lambda: PyJWTBackend.decode(token, SECRET, settings.ALG)
+    rows["cached"] = lambda: TokenUtils.decode_token(token)
+
+    print(f"iterations={args.iterations}")
+    print(f"{'decode':<8} {'us/call':>10} {'calls/s':>12}")
+    for name, fn in rows.items():
+        us = measure(fn, args.iterations)
+        print(f"{name:<8} {us:>10.2f} {1e6 / us:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    main(parser.parse_args())
@@ -0,0 +1,130 @@
+"""
+Compares the ORM read path of GET /users/all (selectinload, per-object
+model_validate, per-object model_dump_json for the cache) with the projection
+path (Core rows, one TypeAdapter validation, one dump_json) and reports CPU
+time and allocations per 10k users.
+
+    python -m benchmarks.bench_lean_read --users 10000 --projects-per-user 2
+
+Run it against a scratch database: the users and projects tables are
+truncated and reseeded when their size does not match.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+import tracemalloc
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+
+from task.apps.users.models import User
+from task.apps.users.repository import UserRepository
+from task.apps.users.schemas import UserRelDto, UserRelListAdapter
+from task.settings.settings import settings
+from task.utils.database import Base
+
+
+async def orm_path(session) -> bytes:
+    result = await session.execute(select(User).options(selectinload(User.projects)))
+    users = result.scalars().all()
+    users_dto = [UserRelDto.model_validate(user) for user in users]
+    return json.dumps([user.model_dump_json() for user in users_dto]).encode()
+
+
+async def projection_path(session) -> bytes:
+    users = await UserRepository.get_rows(session=session)
+    users_dto = UserRelListAdapter.validate_python(users)
+    return UserRelListAdapter.dump_json(users_dto)
+
+
+PATHS = {"orm": orm_path, "projection": projection_path}
+
+
+async def seed(engine, users: int, projects_per_user: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = await conn.scalar(text("SELECT count(*) FROM users"))
+        if existing == users:
+            return
+        await conn.execute(text("TRUNCATE users, projects RESTART IDENTITY CASCADE"))
+        await conn.execute(
+            text(
+                """
+                INSERT INTO users (username, email, hashed_password)
+                SELECT 'user_' || n, 'user_' || n || '@example.com', 'x'
+                FROM generate_series(1, :users) AS n
+                """
+            ),
+            {"users": users},
+        )
+        await conn.execute(
+            text(
+                """
+                INSERT INTO projects (
+                    name, status, start_time, end_time, description,
+                    person_in_charge
+                )
+                SELECT
+                    'project_' || n, 'NEW', now(), now(), '',
+                    1 + n % :users
+                FROM generate_series(1, :projects) AS n
+                """
+            ),
+            {"users": users, "projects": users * projects_per_user},
+        )
+
+
+async def measure(Session, path, repeat: int) -> dict:
+    async with Session() as session:
+        await path(session)
+
+    cpu = []
+    for _ in range(repeat):
+        async with Session() as session:
+            start = time.process_time()
+            await path(session)
+            cpu.append(time.process_time() - start)
+
+    async with Session() as session:
+        tracemalloc.start()
+        await path(session)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {"cpu": min(cpu), "peak": peak}
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    await seed(engine, users=args.users, projects_per_user=args.projects_per_user)
+    Session = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    scale = 10_000 / args.users
+    results = {}
+    for name, path in PATHS.items():
+        results[name] = await measure(Session, path, repeat=args.repeat)
+    await engine.dispose()
+
+    print(f"{'path':<12} {'cpu ms/10k':>12} {'peak MiB/10k':>14}")
+    for name, result in results.items():
+        print(
+            f"{name:<12} {result['cpu'] * 1000 * scale:12.1f} "
+            f"{result['peak'] / 2**20 * scale:14.2f}"
+        )
+    orm, projection = results["orm"], results["projection"]
+    print(
+        f"\nprojection vs orm: cpu x{orm['cpu'] / projection['cpu']:.1f}, "
+        f"peak memory x{orm['peak'] / projection['peak']:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL", settings.db_url))
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects-per-user", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=5)
+    asyncio.run(main(parser.parse_args()))
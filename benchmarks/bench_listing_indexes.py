@@ -0,0 +1,149 @@
+"""
+Seeds users/projects and compares query plans and latencies of the project
+listing and user lookup queries without and with the listing indexes.
+
+    python -m benchmarks.bench_listing_indexes --users 10000 --projects 1000000
+
+Run it against a scratch database: the tables are created if missing and the
+indexes declared on the models are dropped and recreated.
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+from task.apps.project.models import Project
+from task.apps.users.models import User
+from task.settings.settings import settings
+from task.utils.database import Base
+
+
+QUERIES = {
+    "status + sort create_time, page 1": """
+        SELECT * FROM projects WHERE status = 'IN_PROGRESS'
+        ORDER BY create_time DESC, id DESC LIMIT 11
+    """,
+    "status + sort start_time, page 5000": """
+        SELECT * FROM projects WHERE status = 'NEW'
+        ORDER BY start_time, id LIMIT 11 OFFSET 49990
+    """,
+    "status + sort end_time, keyset page": """
+        SELECT * FROM projects WHERE status = 'COMPLETED'
+          AND (end_time, id) > (now() - interval '30 days', 0)
+        ORDER BY end_time, id LIMIT 11
+    """,
+    "person_in_charge + status": """
+        SELECT * FROM projects WHERE person_in_charge = 42 AND status = 'NEW'
+        ORDER BY id LIMIT 11
+    """,
+    "count by status": """
+        SELECT count(*) FROM projects WHERE status = 'NEW'
+    """,
+    "user by username": """
+        SELECT * FROM users WHERE username = 'user_4242'
+    """,
+    "user by email": """
+        SELECT * FROM users WHERE email = 'user_4242@example.com'
+    """,
+}
+
+INDEXES = [*Project.__table__.indexes, *User.__table__.indexes]
+
+
+async def seed(conn: AsyncConnection, users: int, projects: int) -> None:
+    await conn.run_sync(Base.metadata.create_all)
+    existing = await conn.scalar(text("SELECT count(*) FROM projects"))
+    if existing >= projects:
+        return
+    await conn.execute(text("TRUNCATE users, projects RESTART IDENTITY CASCADE"))
+    await conn.execute(
+        text(
+            """
+            INSERT INTO users (username, email, hashed_password)
+            SELECT 'user_' || n, 'user_' || n || '@example.com', 'x'
+            FROM generate_series(1, :users) AS n
+            """
+        ),
+        {"users": users},
+    )
+    await conn.execute(
+        text(
+            """
+            INSERT INTO projects (
+                name, status, create_time, start_time, end_time,
+                description, person_in_charge
+            )
+            SELECT
+                'project_' || n,
+                (ARRAY['NEW', 'IN_PROGRESS', 'COMPLETED'])[1 + n % 3]::projectstatus,
+                now() - (n % 100000) * interval '1 minute',
+                now() - (n % 50000) * interval '1 hour',
+                now() + (n % 50000) * interval '1 hour',
+                '',
+                1 + n % :users
+            FROM generate_series(1, :projects) AS n
+            """
+        ),
+        {"users": users, "projects": projects},
+    )
+
+
+async def run_queries(conn: AsyncConnection, repeat: int) -> dict:
+    await conn.execute(text("ANALYZE users"))
+    await conn.execute(text("ANALYZE projects"))
+    results = {}
+    for name, sql in QUERIES.items():
+        plan = await conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {sql}"))
+        await conn.execute(text(sql))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            await conn.execute(text(sql))
+        elapsed = (time.perf_counter() - start) / repeat * 1000
+        results[name] = (elapsed, [row[0] for row in plan])
+    return results
+
+
+def report(title: str, results: dict, verbose: bool) -> None:
+    print(f"\n=== {title} ===")
+    for name, (elapsed, plan) in results.items():
+        print(f"{name:<40} {elapsed:9.3f} ms")
+        if verbose:
+            for line in plan:
+                print(f"    {line}")
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.db_url)
+    async with engine.begin() as conn:
+        await seed(conn, users=args.users, projects=args.projects)
+
+    async with engine.begin() as conn:
+        for index in INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        before = await run_queries(conn, repeat=args.repeat)
+
+    async with engine.begin() as conn:
+        for index in INDEXES:
+            await conn.run_sync(index.create, checkfirst=True)
+        after = await run_queries(conn, repeat=args.repeat)
+    await engine.dispose()
+
+    report("without indexes", before, args.verbose)
+    report("with indexes", after, args.verbose)
+    print("\n=== speedup ===")
+    for name in QUERIES:
+        print(f"{name:<40} x{before[name][0] / max(after[name][0], 1e-6):8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db-url", default=os.getenv("BENCH_DB_URL", settings.db_url))
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--projects", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true", help="print query plans")
+    asyncio.run(main(parser.parse_args()))
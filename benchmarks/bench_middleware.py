@@ -0,0 +1,110 @@
+"""
+Compares requests/sec of a trivial endpoint with the auth and rate limit
+middlewares registered as @app.middleware("http") functions (Starlette
+BaseHTTPMiddleware, linear startswith scan over include_paths) against the
+pure ASGI AuthMiddleware and RateLimitMiddleware.
+
+    python -m benchmarks.bench_middleware --requests 20000 --include-paths 50
+
+Requests are driven straight through the ASGI interface, without a server
+or HTTP client, and the limiter always allows, so only the middleware
+plumbing is measured. No Redis or database is needed.
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from task.apps.auth.middleware import AuthMiddleware
+from task.utils.rate_limiter import RateLimitMiddleware, RateLimitResult
+
+ALLOWED = RateLimitResult(
+    allowed=True, limit=10**9, remaining=10**9, reset=60, retry_after=0, policy=""
+)
+
+
+class AllowAll:
+    async def hit(self, path: str, identity: str, username: str | None = None):
+        return ALLOWED
+
+
+def build_app(variant: str, include_paths: list[str]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    limiter = AllowAll()
+    if variant == "base_http":
+
+        @app.middleware("http")
+        async def auth_middleware(request: Request, call_next):
+            if any(request.url.path.startswith(path) for path in include_paths):
+                return JSONResponse({"detail": "Unauthorized"}, status_code=401)
+            return await call_next(request)
+
+        @app.middleware("http")
+        async def rate_limiter_middleware(request: Request, call_next):
+            result = await limiter.hit(request.url.path, request.client.host)
+            response = await call_next(request)
+            response.headers.update(result.headers())
+            return response
+
+    elif variant == "asgi":
+        app.add_middleware(AuthMiddleware, include_paths=include_paths)
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+    return app
+
+
+async def call(app: FastAPI) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def measure(app: FastAPI, requests: int) -> float:
+    # The first call builds the middleware stack.
+    await call(app)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app)
+    return requests / (time.perf_counter() - start)
+
+
+async def main(args: argparse.Namespace) -> None:
+    include_paths = [f"/api/protected_{n}" for n in range(args.include_paths)]
+    print(f"requests={args.requests} include_paths={args.include_paths}")
+    print(f"{'variant':<10} {'req/s':>10} {'us/req':>10}")
+    for variant in ("none", "base_http", "asgi"):
+        rps = await measure(build_app(variant, include_paths), args.requests)
+        print(f"{variant:<10} {rps:>10.0f} {1e6 / rps:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--include-paths", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,116 @@
+"""
+Measures the per-request overhead of rate limiting on a trivial endpoint:
+
+    none            - no rate limiting
+    incr_expire     - the previous fixed window: INCR, then EXPIRE on the
+                      first hit (two round-trips)
+    token_bucket    - RateLimiter, one EVALSHA
+    sliding_window  - RateLimiter, one EVALSHA
+
+    python -m benchmarks.bench_rate_limiter --requests 5000 --concurrency 20
+
+Needs a running Redis (BENCH_REDIS_URL or the cache URL from settings). The
+limit is set high enough that every request is allowed.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from redis.asyncio import Redis
+
+from task.settings.settings import settings
+from task.utils.rate_limiter import RateLimiter, RateLimitRule
+
+
+def build_app(variant: str, redis: Redis) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if variant == "incr_expire":
+
+        @app.middleware("http")
+        async def incr_expire(request: Request, call_next):
+            key = f"bench:fixed:{request.client.host}"
+            current = await redis.incr(key)
+            if current == 1:
+                await redis.expire(key, 60)
+            return await call_next(request)
+
+    elif variant != "none":
+        limiter = RateLimiter(
+            redis=redis,
+            algorithm=variant,
+            default_rule=RateLimitRule(limit=10**9, window=60),
+        )
+
+        @app.middleware("http")
+        async def lua(request: Request, call_next):
+            result = await limiter.hit(request.url.path, f"ip:{request.client.host}")
+            response = await call_next(request)
+            response.headers.update(result.headers())
+            return response
+
+    return app
+
+
+async def measure(app: FastAPI, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        await client.get("/ping")
+
+        async def one() -> None:
+            async with semaphore:
+                start = time.perf_counter()
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50": quantiles[49] * 1000,
+        "p99": quantiles[98] * 1000,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    redis = Redis.from_url(args.redis_url, decode_responses=True)
+    print(f"requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'variant':<16} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for variant in ("none", "incr_expire", "token_bucket", "sliding_window"):
+        for pattern in ("bench:*", "rate_limit:*:ip:127.0.0.1"):
+            keys = [key async for key in redis.scan_iter(pattern)]
+            if keys:
+                await redis.delete(*keys)
+        result = await measure(
+            build_app(variant, redis), args.requests, args.concurrency
+        )
+        print(
+            f"{variant:<16} {result['rps']:>10.0f} {result['p50']:>10.2f} "
+            f"{result['p99']:>10.2f}"
+        )
+    await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--redis-url", default=os.getenv("BENCH_REDIS_URL", settings.redis_cache_url)
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
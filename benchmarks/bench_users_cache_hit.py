@@ -0,0 +1,117 @@
+"""
+Measures the latency of a GET /users/all cache hit through a FastAPI app for
+three ways of storing the page in the cache:
+
+    double  - JSON array of per-user JSON strings (json.loads, then
+              model_validate_json per user, then FastAPI serializes again)
+    model   - one JSON document validated back into UsersWithParamsDTO and
+              serialized again by FastAPI
+    bytes   - the stored body returned as is in a Response (current path)
+
+    python -m benchmarks.bench_users_cache_hit --users 100 --projects-per-user 3
+
+No Redis is needed: the cached value is kept in memory, so only the decode
+and encode work on the hit path is measured.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import FastAPI, Response
+
+from task.apps.project.models import ProjectStatus
+from task.apps.project.schemas import ProjectRelDto
+from task.apps.users.schemas import UserRelDto, UsersWithParamsDTO
+
+
+def build_page(users: int, projects_per_user: int) -> UsersWithParamsDTO:
+    now = datetime.now(timezone.utc)
+    return UsersWithParamsDTO(
+        users=[
+            UserRelDto(
+                id=user_id,
+                username=f"user_{user_id}",
+                email=f"user_{user_id}@example.com",
+                projects=[
+                    ProjectRelDto(
+                        id=user_id * projects_per_user + n,
+                        name=f"project_{user_id}_{n}",
+                        status=ProjectStatus.NEW,
+                        create_time=now,
+                        start_time=now,
+                        end_time=now,
+                        description="description",
+                        person_in_charge=user_id,
+                    )
+                    for n in range(projects_per_user)
+                ],
+            )
+            for user_id in range(users)
+        ],
+        has_prev=False,
+        has_next=True,
+    )
+
+
+def build_app(page: UsersWithParamsDTO) -> FastAPI:
+    double_cached = json.dumps(
+        {
+            "users": [user.model_dump_json() for user in page.users],
+            "has_prev": page.has_prev,
+            "has_next": page.has_next,
+        }
+    )
+    model_cached = page.model_dump_json()
+    app = FastAPI()
+
+    @app.get("/double")
+    async def double() -> UsersWithParamsDTO:
+        cached = json.loads(double_cached)
+        users = [UserRelDto.model_validate_json(user) for user in cached["users"]]
+        return UsersWithParamsDTO(
+            users=users, has_prev=cached["has_prev"], has_next=cached["has_next"]
+        )
+
+    @app.get("/model")
+    async def model() -> UsersWithParamsDTO:
+        return UsersWithParamsDTO.model_validate_json(model_cached)
+
+    @app.get("/bytes", response_model=UsersWithParamsDTO)
+    async def raw() -> Response:
+        return Response(content=model_cached, media_type="application/json")
+
+    return app
+
+
+async def main(args: argparse.Namespace) -> None:
+    page = build_page(args.users, args.projects_per_user)
+    app = build_app(page)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        bodies = {}
+        for path in ("double", "model", "bytes"):
+            response = await client.get(f"/{path}")
+            bodies[path] = response.json()
+            for _ in range(args.warmup):
+                await client.get(f"/{path}")
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                await client.get(f"/{path}")
+            elapsed = (time.perf_counter() - start) / args.requests * 1e6
+            print(f"{path:<8} {elapsed:10.1f} us/hit")
+    assert bodies["double"] == bodies["model"] == bodies["bytes"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--projects-per-user", type=int, default=3)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -1,15 +1,17 @@
 from fastapi import APIRouter
 
 from task.apps.api_integration.service import APIService
-from task.utils.dependencies import HttpClientDependency, RedisDependency
+from task.utils.dependencies import BinaryRedisDependency, HttpClientDependency
 
 
 integration_router = APIRouter(prefix="/other", tags=["Other API"])
 
 
 @integration_router.get("/posts")
-async def get_posts(client: HttpClientDependency, redis: RedisDependency):
+async def get_posts(client: HttpClientDependency, redis: BinaryRedisDependency):
     """
-    Делает запрос к внешнему API 'https://jsonplaceholder.typicode.com/posts' и возвращает список постов.
+    Делает запрос к внешнему API (settings.POSTS_API_URL, по умолчанию
+    'https://jsonplaceholder.typicode.com/posts') и возвращает список постов.
+    Использует общий HTTP-клиент приложения.
     """
     return await APIService.get_posts(client=client, redis=redis)
@@ -1,24 +1,39 @@
-import json
 import httpx
 from redis import Redis
 
+from task.settings.settings import settings
+from task.utils.cache_codec import cache_codec
 from task.utils.exceptions import ApiIntegrationException
+from task.utils.two_tier_cache import TwoTierCache
 
 
 class APIService:
+    cache = TwoTierCache(
+        maxsize=settings.CACHE_LOCAL_SIZE,
+        ttl=settings.CACHE_LOCAL_TTL,
+        family="posts",
+    )
+
     @classmethod
     async def get_posts(
         cls, client: httpx.AsyncClient, redis: Redis, ttl_cache: int = 300
     ):
         cache_key = "posts"
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            return json.loads(cached_data)
 
+        async def load() -> bytes:
+            try:
+                response = await client.get(settings.POSTS_API_URL)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                raise ApiIntegrationException
+            return cache_codec.dumps(response.json())
+
+        payload = await cls.cache.get_or_load(
+            cache_key, load, redis=redis, ttl=ttl_cache
+        )
         try:
-            response = await client.get("https://jsonplaceholder.typicode.com/posts")
-        except Exception:
-            raise ApiIntegrationException
-        data = response.json()
-        await redis.set(cache_key, json.dumps(data), ex=ttl_cache)
-        return data
+            return cache_codec.loads(payload)
+        except ValueError:
+            payload = await load()
+            await cls.cache.set(cache_key, payload, redis=redis, ttl=ttl_cache)
+            return cache_codec.loads(payload)
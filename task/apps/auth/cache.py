@@ -0,0 +1,80 @@
+import time
+
+from redis.asyncio import Redis
+
+from task.apps.users.schemas import UserDTO
+from task.settings.settings import settings
+from task.utils.two_tier_cache import TwoTierCache
+
+
+class PrincipalCache:
+    """
+    Principals by username in a TwoTierCache, so an invalidation on one
+    worker is published and drops the entry from every worker's tier 1.
+    """
+
+    cache = TwoTierCache(
+        maxsize=settings.AUTH_USER_LOCAL_CACHE_SIZE,
+        ttl=settings.AUTH_USER_LOCAL_CACHE_TTL,
+        family="principal",
+        stale_ttl=0,
+    )
+
+    @staticmethod
+    def key(username: str) -> str:
+        return f"auth:user:{username}"
+
+    @classmethod
+    async def get(cls, username: str, redis: Redis) -> UserDTO | None:
+        key = cls.key(username)
+        (cached_data,) = await cls.cache.get_many([key], redis=redis)
+        if not cached_data:
+            return None
+        cls.cache.local.set(key, cached_data)
+        return UserDTO.model_validate_json(cached_data)
+
+    @classmethod
+    async def set(cls, principal: UserDTO, redis: Redis) -> None:
+        await cls.cache.set(
+            cls.key(principal.username),
+            principal.model_dump_json(),
+            redis=redis,
+            ttl=settings.AUTH_USER_CACHE_TTL,
+        )
+
+    @classmethod
+    async def invalidate(cls, username: str, redis: Redis) -> None:
+        await cls.cache.delete(cls.key(username), redis=redis)
+
+
+class TokenVersions:
+    """
+    Per-user token version. Tokens issued in claims-trusted mode carry the
+    version current at login; bumping it on update or delete makes every
+    such token of that user stale at once, without tracking tokens.
+
+    Versions are nanosecond timestamps rather than a counter, so a version
+    that Redis lost (flush, eviction) is never handed out again and the
+    tokens revoked under it stay revoked. A missing version is treated as
+    "no valid token" by the caller.
+    """
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"auth:token_version:{user_id}"
+
+    @classmethod
+    async def get(cls, user_id: int, redis: Redis) -> str | None:
+        version = await redis.get(cls.key(user_id))
+        if isinstance(version, bytes):
+            version = version.decode()
+        return version
+
+    @classmethod
+    async def ensure(cls, user_id: int, redis: Redis) -> str:
+        await redis.set(cls.key(user_id), str(time.time_ns()), nx=True)
+        return await cls.get(user_id=user_id, redis=redis)
+
+    @classmethod
+    async def bump(cls, user_id: int, redis: Redis) -> None:
+        await redis.set(cls.key(user_id), str(time.time_ns()))
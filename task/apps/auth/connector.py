@@ -1,5 +1,5 @@
 from task.apps.users.repository import UserRepository
-from task.apps.users.schemas import UserAddDTO
+from task.apps.users.schemas import UserAddDTO, UserDTO
 from task.utils.dependencies import SessionDependency
 
 
@@ -13,6 +13,15 @@ class Connector:
             return None
         return UserAddDTO.model_validate(user)
 
+    @classmethod
+    async def get_principal(
+        cls, username: str, session: SessionDependency
+    ) -> UserDTO | None:
+        user = await UserRepository.get_by_username(username=username, session=session)
+        if not user:
+            return None
+        return UserDTO.model_validate(user)
+
     @classmethod
     async def get_by_email(
         cls, email: str, session: SessionDependency
@@ -1,7 +1,9 @@
-from fastapi import Header
-from jose import JWTError
+from fastapi import Depends, Header
+from redis.exceptions import RedisError
+from task.apps.auth.cache import PrincipalCache, TokenVersions
 from task.apps.auth.repository import AuthRepository
-from task.apps.users.schemas import UserAddDTO
+from task.apps.users.schemas import UserDTO
+from task.settings.settings import settings
 from task.utils.dependencies import RedisDependency, SessionDependency
 from task.utils.exceptions import (
     InvalidTokenException,
@@ -13,37 +15,84 @@ from task.utils.exceptions import (
 from task.utils.token_utils import TokenUtils
 
 
+class PrincipalResolver:
+    """
+    Resolves usernames to principals at most once per request. FastAPI caches
+    the `get_principal_resolver` dependency per request, so `get_current_user`
+    and `get_current_by_session` share one instance.
+    """
+
+    def __init__(self, session: SessionDependency, redis: RedisDependency):
+        self.session = session
+        self.redis = redis
+        self._principals: dict[str, UserDTO | None] = {}
+
+    async def resolve(self, username: str) -> UserDTO:
+        if username not in self._principals:
+            self._principals[username] = await self._load(username)
+        principal = self._principals[username]
+        if not principal:
+            raise ItemNotFoundException
+        return principal
+
+    async def from_claims(self, payload: dict) -> UserDTO:
+        """
+        Builds the principal from a claims-trusted token without touching
+        the database, once its version matches the user's current one. If
+        the version cannot be read the username is resolved as usual.
+        """
+        try:
+            version = await TokenVersions.get(user_id=payload["uid"], redis=self.redis)
+        except RedisError:
+            return await self.resolve(payload["sub"])
+        if version is None or payload.get("ver") != version:
+            raise InvalidTokenException
+        return UserDTO(
+            id=payload["uid"], username=payload["sub"], email=payload["email"]
+        )
+
+    async def _load(self, username: str) -> UserDTO | None:
+        principal = await PrincipalCache.get(username=username, redis=self.redis)
+        if principal:
+            return principal
+        principal = await AuthRepository.get_principal(
+            username=username, session=self.session
+        )
+        if principal:
+            await PrincipalCache.set(principal=principal, redis=self.redis)
+        return principal
+
+
+async def get_principal_resolver(
+    session: SessionDependency, redis: RedisDependency
+) -> PrincipalResolver:
+    return PrincipalResolver(session=session, redis=redis)
+
+
 async def get_current_user(
-    session: SessionDependency,
+    resolver: PrincipalResolver = Depends(get_principal_resolver),
     x_jwt_token: str = Header(..., alias="X-JWT-Token"),
-) -> UserAddDTO:
+) -> UserDTO:
     if not x_jwt_token:
         raise JWTTokenMissingException
     token = x_jwt_token
-    try:
-        payload = TokenUtils.decode_token(token)
-        if not payload:
-            raise InvalidTokenPayloadException
-        username = payload.get("sub")
-        if not username:
-            raise InvalidTokenPayloadException
-        user = await AuthRepository.get_by_username(username=username, session=session)
-        if not user:
-            raise ItemNotFoundException
-        return user
-    except JWTError:
-        raise InvalidTokenException
+    payload = TokenUtils.decode_token(token)
+    if not payload:
+        raise InvalidTokenPayloadException
+    username = payload.get("sub")
+    if not username:
+        raise InvalidTokenPayloadException
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and "uid" in payload:
+        return await resolver.from_claims(payload)
+    return await resolver.resolve(username)
 
 
 async def get_current_by_session(
-    session: SessionDependency,
     redis: RedisDependency,
+    resolver: PrincipalResolver = Depends(get_principal_resolver),
     x_session: str = Header(..., alias="X-Session"),
-):
+) -> UserDTO:
     username = await redis.get(f"session:{x_session}")
     if not username:
         raise SessionMissingException
-    user = await AuthRepository.get_by_username(username=username, session=session)
-    if not user:
-        raise ItemNotFoundException
-    return user
+    return await resolver.resolve(username)
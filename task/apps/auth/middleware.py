@@ -1,44 +1,59 @@
-from fastapi import Request, status
+from fastapi import status
 from fastapi.responses import JSONResponse
-from jose import JWTError
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from task.apps.auth.repository import AuthRepository
-from task.apps.auth.services import AuthService
 from task.utils.database import local_session
+from task.utils.exceptions import InvalidTokenException
+from task.utils.path_matcher import PrefixMatcher
+from task.utils.token_utils import TokenUtils
 
 include_paths = []
 
 
-async def auth_middleware(request: Request, call_next):
-    if any(
-        request.url.path.startswith(endpoint_path) for endpoint_path in include_paths
-    ):
+class AuthMiddleware:
+    """
+    Pure ASGI middleware authenticating requests under `include_paths` by
+    their bearer token and storing the principal in `request.state.user`.
+    Other requests pass through untouched, after a single regex match.
+    """
+
+    def __init__(self, app: ASGIApp, include_paths: list[str]):
+        self.app = app
+        self.matcher = PrefixMatcher(include_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.matcher.match(scope["path"]) is None:
+            await self.app(scope, receive, send)
+            return
+
+        auth_header = dict(scope["headers"]).get(b"authorization", b"").decode()
+        if not auth_header.startswith("Bearer "):
+            await self.reject("Authorization header missing or invalid")(
+                scope, receive, send
+            )
+            return
+        try:
+            payload = TokenUtils.decode_token(auth_header[7:])
+        except InvalidTokenException:
+            await self.reject("Invalid token")(scope, receive, send)
+            return
+        username = payload.get("sub")
+        if not username:
+            await self.reject("Invalid token")(scope, receive, send)
+            return
         async with local_session() as session:
-            auth_header = request.headers.get("Authorization")
-            if not auth_header or not auth_header.startswith("Bearer "):
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Authorization header missing or invalid"},
-                )
-            token = auth_header.split()[1]
-            try:
-                payload = AuthService.decode_token(token)
-                username = payload.get("sub")
-                if not username:
-                    raise JWTError("Invalid token payload")
-                user = await AuthRepository.get_by_username(
-                    username=username, session=session
-                )
-                if not user:
-                    return JSONResponse(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        content={"detail": "User not found"},
-                    )
-                request.state.user = user
-            except JWTError:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Invalid token"},
-                )
-    response = await call_next(request)
-    return response
+            user = await AuthRepository.get_principal(
+                username=username, session=session
+            )
+        if not user:
+            await self.reject("User not found")(scope, receive, send)
+            return
+        scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def reject(detail: str) -> JSONResponse:
+        return JSONResponse(
+            status_code=status.HTTP_401_UNAUTHORIZED, content={"detail": detail}
+        )
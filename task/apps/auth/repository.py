@@ -1,6 +1,6 @@
 from task.apps.auth.connector import Connector
 from task.apps.auth.schemas import AuthRegisterSchema
-from task.apps.users.schemas import UserAddDTO
+from task.apps.users.schemas import UserAddDTO, UserDTO
 from task.utils.dependencies import SessionDependency
 from task.utils.exceptions import EmailExistException, UsernameExistException
 
@@ -12,6 +12,12 @@ class AuthRepository:
     ) -> UserAddDTO | None:
         return await Connector.get_by_username(username=username, session=session)
 
+    @classmethod
+    async def get_principal(
+        cls, username: str, session: SessionDependency
+    ) -> UserDTO | None:
+        return await Connector.get_principal(username=username, session=session)
+
     @classmethod
     async def get_by_email(
         cls, email: str, session: SessionDependency
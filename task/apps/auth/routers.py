@@ -4,7 +4,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from task.apps.auth.dependencies import get_current_by_session, get_current_user
 from task.apps.auth.schemas import AuthRegisterSchema
 from task.apps.auth.services import AuthService
-from task.apps.users.schemas import UserAddDTO
+from task.apps.users.schemas import UserDTO
 from task.utils.dependencies import RedisDependency, SessionDependency
 
 
@@ -32,15 +32,15 @@ async def login_user(
 
 @auth_router.get("/me")
 async def get_me(
-    current_user_by_token: UserAddDTO = Depends(get_current_user),
-    current_user_by_session: UserAddDTO = Depends(get_current_by_session),
+    current_user_by_token: UserDTO = Depends(get_current_user),
+    current_user_by_session: UserDTO = Depends(get_current_by_session),
 ):
     return {"user": current_user_by_token}
 
 
 @auth_router.get("/profile")
 async def profile(
-    current_user_by_token: UserAddDTO = Depends(get_current_user),
-    current_user_by_session: UserAddDTO = Depends(get_current_by_session),
+    current_user_by_token: UserDTO = Depends(get_current_user),
+    current_user_by_session: UserDTO = Depends(get_current_by_session),
 ):
     return {"user": current_user_by_session}
@@ -1,8 +1,10 @@
 import uuid
 
+from task.apps.auth.cache import TokenVersions
 from task.apps.auth.repository import AuthRepository
 from task.apps.auth.schemas import AuthRegisterSchema
 
+from task.settings.settings import settings
 from task.utils.dependencies import RedisDependency, SessionDependency
 from task.utils.exceptions import InvalidCredentialsException
 from task.utils.password_utils import PasswordUtils
@@ -12,9 +14,17 @@ from task.utils.token_utils import TokenUtils
 class AuthService:
     @classmethod
     async def register(cls, data: AuthRegisterSchema, session: SessionDependency):
-        data.password = PasswordUtils.hash_password(data.password)
+        data.password = await cls.hash_password(data.password)
         return await AuthRepository.register_user(data=data, session=session)
 
+    @classmethod
+    async def hash_password(cls, password: str) -> str:
+        return await PasswordUtils.hash_password_async(password)
+
+    @classmethod
+    async def hash_passwords(cls, passwords: list[str]) -> list[str]:
+        return await PasswordUtils.hash_passwords_async(passwords)
+
     @classmethod
     async def login(
         cls,
@@ -24,12 +34,22 @@ class AuthService:
         redis: RedisDependency,
     ):
         user = await AuthRepository.get_by_username(username=username, session=session)
-        if not PasswordUtils.verify_password(password, user.hashed_password):
+        if not await PasswordUtils.verify_password_async(
+            password, user.hashed_password
+        ):
             raise InvalidCredentialsException
         session_id = str(uuid.uuid4())
         await redis.set(f"session:{session_id}", user.username, ex=600)
 
         payload = {"sub": user.username, "email": user.email}
+        if settings.AUTH_TRUST_TOKEN_CLAIMS:
+            principal = await AuthRepository.get_principal(
+                username=user.username, session=session
+            )
+            payload["uid"] = principal.id
+            payload["ver"] = await TokenVersions.ensure(
+                user_id=principal.id, redis=redis
+            )
         access_token = TokenUtils.create_access_token(payload)
         refresh_token = TokenUtils.create_refresh_token(payload)
         return {
@@ -1,6 +1,6 @@
 from datetime import datetime
 from enum import Enum as Enumeration
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Enum, Text, func
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, Enum, Text, func
 from task.utils.database import Base
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -13,6 +13,15 @@ class ProjectStatus(str, Enumeration):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        Index("ix_projects_person_in_charge_status", "person_in_charge", "status"),
+        Index("ix_projects_status_create_time_id", "status", "create_time", "id"),
+        Index("ix_projects_status_start_time_id", "status", "start_time", "id"),
+        Index("ix_projects_status_end_time_id", "status", "end_time", "id"),
+        Index("ix_projects_create_time_id", "create_time", "id"),
+        Index("ix_projects_start_time_id", "start_time", "id"),
+        Index("ix_projects_end_time_id", "end_time", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, unique=True, nullable=False)
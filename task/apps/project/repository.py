@@ -1,13 +1,67 @@
-from sqlalchemy import delete, func, insert, select, update
+from datetime import datetime
+import json
+from typing import AsyncIterator
+from asyncpg import InterfaceError, PostgresError
+from sqlalchemy import (
+    Row,
+    RowMapping,
+    Select,
+    String,
+    cast,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import selectinload
 from task.apps.project.models import Project
 from task.apps.project.schemas import ProjectAddDTO, ProjectParams, ProjectUpdateDTO
+from task.utils.bulk_copy import BulkCopy
+from task.settings.settings import settings
 from task.utils.dependencies import SessionDependency
-from task.utils.exceptions import DatabaseException, ItemNotFoundException
+from task.utils.exceptions import (
+    DatabaseException,
+    InvalidCursorException,
+    ItemNotFoundException,
+)
+from task.utils.pagination import CursorUtils, PaginationMode
 
 
 class ProjectRepository:
+    EXPORT_COLUMNS = (
+        Project.id,
+        Project.name,
+        cast(Project.status, String).label("status"),
+        Project.create_time,
+        Project.start_time,
+        Project.end_time,
+        Project.description,
+        Project.person_in_charge,
+    )
+    PROJECTION_COLUMNS = (
+        Project.id,
+        Project.name,
+        Project.status,
+        Project.create_time,
+        Project.start_time,
+        Project.end_time,
+        Project.description,
+        Project.person_in_charge,
+    )
+    STAGING_COLUMNS = {
+        "name": "varchar",
+        "status": "text",
+        "start_time": "timestamptz",
+        "end_time": "timestamptz",
+        "description": "text",
+        "person_in_charge": "integer",
+    }
+
     @classmethod
     async def get_by_id(cls, id: int, session: SessionDependency) -> Project:
         """
@@ -28,49 +82,204 @@ class ProjectRepository:
             raise DatabaseException
         return project
 
+    @classmethod
+    async def get_rows_by_person_in_charge(
+        cls, person_in_charge_ids: list[int] | None, session: SessionDependency
+    ) -> list[RowMapping]:
+        """
+        SELECT id, name, status, create_time, start_time, end_time,
+            description, person_in_charge
+        FROM projects
+        WHERE person_in_charge IN (:person_in_charge_ids)
+        ORDER BY id
+
+        Read-only projection: returns plain rows, no ORM objects. Without
+        ids every project is returned.
+        """
+        query = select(*cls.PROJECTION_COLUMNS).order_by(Project.id)
+        if person_in_charge_ids is not None:
+            query = query.where(Project.person_in_charge.in_(person_in_charge_ids))
+        try:
+            result = await session.execute(query)
+            rows = result.mappings().all()
+        except SQLAlchemyError:
+            raise DatabaseException
+        return list(rows)
+
     @classmethod
     async def get_with_params(
-        cls, params: ProjectParams, session: SessionDependency
+        cls,
+        params: ProjectParams,
+        session: SessionDependency,
+        total_count: int | None = None,
     ) -> dict:
         """
         SELECT * FROM projects
         WHERE status = :status AND person_in_charge = :person_in_charge
-        ORDER BY :sort_field ASC|DESC
-        LIMIT :page_size OFFSET :offset
+        ORDER BY :sort_field ASC|DESC, id ASC|DESC
+        LIMIT :page_size + 1 OFFSET :offset
         SELECT users WHERE users.id IN (projects.person_in_charge)
-        """
-        query = select(Project).options(selectinload(Project.user))
-
-        if params.status:
-            query = query.where(Project.status == params.status)
-
-        if params.person_in_charge:
-            query = query.where(Project.person_in_charge == params.person_in_charge)
-
-        if params.sort_field:
-            column = getattr(Project, params.sort_field.value)
-            query = query.order_by(column.desc() if params.sort_desc else column.asc())
 
-        count_query = select(func.count()).select_from(query.subquery())
-        total_count = await session.scalar(count_query)
-        if not total_count:
-            total_count = 0
+        Cursor mode replaces OFFSET with a keyset predicate:
+        WHERE (:sort_field, id) > (:last_value, :last_id)
+        """
+        if total_count is None:
+            total_count = await cls.count(params=params, session=session)
 
-        query = query.offset((params.page - 1) * params.page_size).limit(
-            params.page_size
+        query = cls._apply_filters(
+            select(Project).options(selectinload(Project.user)), params
+        )
+        sort_columns = cls._sort_columns(params)
+        query = query.order_by(
+            *(
+                column.desc() if params.sort_desc else column.asc()
+                for column in sort_columns
+            )
         )
+
+        if params.pagination == PaginationMode.CURSOR:
+            if params.cursor:
+                last_values = cls._decode_cursor(params)
+                keyset = tuple_(*sort_columns)
+                query = query.where(
+                    keyset < tuple_(*last_values)
+                    if params.sort_desc
+                    else keyset > tuple_(*last_values)
+                )
+        else:
+            query = query.offset((params.page - 1) * params.page_size)
+        query = query.limit(params.page_size + 1)
         try:
             result = await session.execute(query)
-            projects_res = result.scalars().all()
+            projects_res = list(result.scalars().all())
         except SQLAlchemyError:
             raise DatabaseException
+
+        has_next = len(projects_res) > params.page_size
+        projects_res = projects_res[: params.page_size]
+        if params.pagination == PaginationMode.CURSOR:
+            return {
+                "projects": projects_res,
+                "total_count": total_count,
+                "has_prev": params.cursor is not None,
+                "has_next": has_next,
+                "next_cursor": (
+                    cls._encode_cursor(params, projects_res[-1]) if has_next else None
+                ),
+            }
         return {
             "projects": projects_res,
             "total_count": total_count,
             "has_prev": params.page > 1,
-            "has_next": params.page * params.page_size < total_count,
+            "has_next": has_next,
         }
 
+    @classmethod
+    async def stream_rows(
+        cls, params: ProjectParams, session: SessionDependency
+    ) -> AsyncIterator[list[Row]]:
+        """
+        SELECT id, name, CAST(status AS VARCHAR), create_time, start_time,
+            end_time, description, person_in_charge
+        FROM projects
+        WHERE status = :status AND person_in_charge = :person_in_charge
+        ORDER BY :sort_field, id
+
+        Fetched through a server-side cursor in batches of EXPORT_BATCH_SIZE.
+        """
+        query = cls._apply_filters(select(*cls.EXPORT_COLUMNS), params)
+        query = query.order_by(
+            *(
+                column.desc() if params.sort_desc else column.asc()
+                for column in cls._sort_columns(params)
+            )
+        ).execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        try:
+            result = await session.stream(query)
+        except SQLAlchemyError:
+            raise DatabaseException
+        async for rows in result.partitions():
+            yield rows
+
+    @classmethod
+    async def count(cls, params: ProjectParams, session: SessionDependency) -> int:
+        """
+        SELECT count(*) FROM projects
+        WHERE status = :status AND person_in_charge = :person_in_charge
+        """
+        query = cls._apply_filters(select(func.count()).select_from(Project), params)
+        try:
+            total_count = await session.scalar(query)
+        except SQLAlchemyError:
+            raise DatabaseException
+        return total_count or 0
+
+    @classmethod
+    async def estimate_count(
+        cls, params: ProjectParams, session: SessionDependency
+    ) -> int:
+        """
+        EXPLAIN (FORMAT JSON) SELECT id FROM projects
+        WHERE status = :status AND person_in_charge = :person_in_charge
+        """
+        query = cls._apply_filters(select(Project.id), params)
+        compiled = query.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+        try:
+            plan = await session.scalar(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+        except SQLAlchemyError:
+            raise DatabaseException
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    @classmethod
+    def _apply_filters(cls, query: Select, params: ProjectParams) -> Select:
+        if params.status:
+            query = query.where(Project.status == params.status)
+        if params.person_in_charge:
+            query = query.where(Project.person_in_charge == params.person_in_charge)
+        return query
+
+    @classmethod
+    def _sort_columns(cls, params: ProjectParams) -> list:
+        if params.sort_field:
+            return [getattr(Project, params.sort_field.value), Project.id]
+        return [Project.id]
+
+    @classmethod
+    def _encode_cursor(cls, params: ProjectParams, project: Project) -> str:
+        sort_value = None
+        if params.sort_field:
+            sort_value = getattr(project, params.sort_field.value).isoformat()
+        return CursorUtils.encode(
+            {
+                "sort_field": params.sort_field.value if params.sort_field else None,
+                "sort_desc": params.sort_desc,
+                "value": sort_value,
+                "id": project.id,
+            }
+        )
+
+    @classmethod
+    def _decode_cursor(cls, params: ProjectParams) -> list:
+        data = CursorUtils.decode(params.cursor)
+        sort_field = params.sort_field.value if params.sort_field else None
+        if (
+            data.get("sort_field") != sort_field
+            or data.get("sort_desc") != params.sort_desc
+            or not isinstance(data.get("id"), int)
+        ):
+            raise InvalidCursorException
+        if not sort_field:
+            return [data["id"]]
+        try:
+            sort_value = datetime.fromisoformat(data["value"])
+        except (TypeError, ValueError):
+            raise InvalidCursorException
+        return [sort_value, data["id"]]
+
     @classmethod
     async def create(
         cls, project: ProjectAddDTO, session: SessionDependency
@@ -109,6 +318,59 @@ class ProjectRepository:
             raise DatabaseException
         return list(projects_res)
 
+    @classmethod
+    async def copy_many(
+        cls, projects: list[ProjectAddDTO], session: SessionDependency
+    ) -> list[str]:
+        """
+        COPY projects_staging (name, status, start_time, end_time, description, person_in_charge)
+        FROM STDIN
+
+        INSERT INTO projects (name, status, start_time, end_time, description, person_in_charge)
+        SELECT name, status::projectstatus, start_time, end_time, description, person_in_charge
+        FROM projects_staging
+        ON CONFLICT (name) DO NOTHING
+        RETURNING name
+        """
+        records = [
+            (
+                project.name,
+                project.status.value,
+                project.start_time,
+                project.end_time,
+                project.description,
+                project.person_in_charge,
+            )
+            for project in projects
+        ]
+        stmt = text(
+            """
+            INSERT INTO projects (
+                name, status, start_time, end_time, description, person_in_charge
+            )
+            SELECT
+                name, status::projectstatus, start_time, end_time,
+                description, person_in_charge
+            FROM projects_staging
+            ON CONFLICT (name) DO NOTHING
+            RETURNING name
+            """
+        )
+        try:
+            await BulkCopy.copy_to_staging(
+                session=session,
+                staging_table="projects_staging",
+                columns=cls.STAGING_COLUMNS,
+                records=records,
+            )
+            result = await session.execute(stmt)
+            names = result.scalars().all()
+            await session.commit()
+        except (SQLAlchemyError, PostgresError, InterfaceError):
+            await session.rollback()
+            raise DatabaseException
+        return list(names)
+
     @classmethod
     async def update(
         cls, id: int, project: ProjectUpdateDTO, session: SessionDependency
@@ -1,7 +1,9 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 
 from task.apps.project.schemas import (
+    ExportFormat,
     ProjectAddDTO,
     ProjectDTO,
     ProjectParams,
@@ -11,7 +13,9 @@ from task.apps.project.schemas import (
 )
 from task.apps.project.services import ProjectService
 from task.apps.auth.dependencies import get_current_by_session, get_current_user
+from task.utils.bulk_copy import BulkLoadResultDTO
 from task.utils.dependencies import RedisDependency, SessionDependency
+from task.utils.ndjson import ImportResultDTO
 
 
 project_router = APIRouter(
@@ -23,9 +27,32 @@ project_router = APIRouter(
 @project_router.get("/all")
 async def get_all(
     session: SessionDependency,
+    redis: RedisDependency,
     params: ProjectParams = Depends(),
 ) -> ProjectsWithParamsDTO:
-    return await ProjectService.get_with_params(params=params, session=session)
+    return await ProjectService.get_with_params(
+        params=params, session=session, redis=redis
+    )
+
+
+@project_router.get("/export")
+async def export_projects(
+    session: SessionDependency,
+    params: ProjectParams = Depends(),
+    export_format: ExportFormat = ExportFormat.NDJSON,
+) -> StreamingResponse:
+    media_type = (
+        "text/csv" if export_format == ExportFormat.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        ProjectService.export(
+            params=params, export_format=export_format, session=session
+        ),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename=projects.{export_format.value}"
+        },
+    )
 
 
 @project_router.get("/{project_id}")
@@ -65,6 +92,36 @@ async def create_projects(
     return new_projects
 
 
+@project_router.post("/bulk_load")
+async def bulk_load_projects(
+    project_data: list[ProjectAddDTO],
+    session: SessionDependency,
+    redis: RedisDependency,
+    session_header: Annotated[str, Depends(get_current_by_session)],
+    token: Annotated[str, Depends(get_current_user)],
+) -> BulkLoadResultDTO:
+    return await ProjectService.bulk_load(
+        projects_data=project_data,
+        session=session,
+        redis=redis,
+    )
+
+
+@project_router.post("/import")
+async def import_projects(
+    request: Request,
+    session: SessionDependency,
+    redis: RedisDependency,
+    session_header: Annotated[str, Depends(get_current_by_session)],
+    token: Annotated[str, Depends(get_current_user)],
+) -> ImportResultDTO:
+    return await ProjectService.import_ndjson(
+        stream=request.stream(),
+        session=session,
+        redis=redis,
+    )
+
+
 @project_router.patch("/update/{project_id}")
 async def update_project(
     project_id: int,
@@ -4,6 +4,7 @@ from typing import Optional
 from pydantic import BaseModel, ConfigDict, Field
 
 from task.apps.project.models import ProjectStatus
+from task.utils.pagination import PaginationMode
 
 
 class ProjectAddDTO(BaseModel):
@@ -34,15 +35,28 @@ class ProjectRelDto(ProjectDTO):
     pass
 
 
+class CountStrategy(Enum):
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATE = "estimate"
+
+
 class ProjectsWithParamsDTO(BaseModel):
     projects: list[ProjectRelDto]
     total_count: int
     has_prev: bool
     has_next: bool
+    next_cursor: Optional[str] = None
+    count_strategy: CountStrategy = CountStrategy.EXACT
 
     model_config = ConfigDict(from_attributes=True)
 
 
+class ExportFormat(Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class ProjectSortField(Enum):
     CREATE_TIME = "create_time"
     START_TIME = "start_time"
@@ -56,3 +70,5 @@ class ProjectParams(BaseModel):
     person_in_charge: Optional[int] = None
     sort_field: Optional[ProjectSortField] = None
     sort_desc: bool = False
+    pagination: PaginationMode = PaginationMode.PAGE
+    cursor: Optional[str] = None
@@ -1,5 +1,16 @@
+import csv
+import io
+from typing import AsyncIterator
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import Row
+
 from task.apps.project.repository import ProjectRepository
 from task.apps.project.schemas import (
+    CountStrategy,
+    ExportFormat,
     ProjectAddDTO,
     ProjectDTO,
     ProjectParams,
@@ -7,10 +18,16 @@ from task.apps.project.schemas import (
     ProjectUpdateDTO,
     ProjectsWithParamsDTO,
 )
+from task.apps.users.cache import UsersPageCache, user_cache
+from task.settings.settings import settings
+from task.utils.bulk_copy import BulkLoadResultDTO
 from task.utils.dependencies import RedisDependency, SessionDependency
+from task.utils.ndjson import ImportResultDTO, NDJSONImporter
 
 
 class ProjectService:
+    COUNT_CACHE_KEY = "projects:count"
+
     @classmethod
     async def get_by_id(
         cls,
@@ -22,11 +39,35 @@ class ProjectService:
 
     @classmethod
     async def get_with_params(
-        cls, params: ProjectParams, session: SessionDependency
+        cls,
+        params: ProjectParams,
+        session: SessionDependency,
+        redis: Redis | None = None,
     ) -> ProjectsWithParamsDTO:
-        projects_data = await ProjectRepository.get_with_params(
-            params=params, session=session
-        )
+        count_strategy = CountStrategy(settings.PROJECTS_COUNT_STRATEGY)
+        if count_strategy == CountStrategy.CACHED and redis is None:
+            count_strategy = CountStrategy.EXACT
+
+        if count_strategy == CountStrategy.EXACT:
+            projects_data = await ProjectRepository.get_with_params(
+                params=params, session=session
+            )
+        elif count_strategy == CountStrategy.CACHED:
+            projects_data = await ProjectRepository.get_with_params(
+                params=params,
+                session=session,
+                total_count=await cls._cached_count(
+                    params=params, session=session, redis=redis
+                ),
+            )
+        else:
+            projects_data = await ProjectRepository.get_with_params(
+                params=params,
+                session=session,
+                total_count=await ProjectRepository.estimate_count(
+                    params=params, session=session
+                ),
+            )
         projects = [
             ProjectRelDto.model_validate(project)
             for project in projects_data["projects"]
@@ -36,9 +77,74 @@ class ProjectService:
             "total_count": projects_data["total_count"],
             "has_prev": projects_data["has_prev"],
             "has_next": projects_data["has_next"],
+            "next_cursor": projects_data.get("next_cursor"),
+            "count_strategy": count_strategy,
         }
         return ProjectsWithParamsDTO.model_validate(result)
 
+    @classmethod
+    async def export(
+        cls,
+        params: ProjectParams,
+        export_format: ExportFormat,
+        session: SessionDependency,
+    ) -> AsyncIterator[bytes]:
+        encode = (
+            cls._encode_csv if export_format == ExportFormat.CSV else cls._encode_ndjson
+        )
+        header = True
+        async for rows in ProjectRepository.stream_rows(params=params, session=session):
+            yield encode(rows, header=header)
+            header = False
+
+    @staticmethod
+    def _encode_ndjson(rows: list[Row], header: bool) -> bytes:
+        if not rows:
+            return b""
+        keys = rows[0]._fields
+        return b"".join(
+            orjson.dumps(dict(zip(keys, row)), option=orjson.OPT_APPEND_NEWLINE)
+            for row in rows
+        )
+
+    @staticmethod
+    def _encode_csv(rows: list[Row], header: bool) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if header and rows:
+            writer.writerow(rows[0]._fields)
+        writer.writerows(
+            [
+                value.isoformat() if hasattr(value, "isoformat") else value
+                for value in row
+            ]
+            for row in rows
+        )
+        return buffer.getvalue().encode()
+
+    @classmethod
+    async def _cached_count(
+        cls, params: ProjectParams, session: SessionDependency, redis: Redis
+    ) -> int:
+        status = params.status.value if params.status else "*"
+        person_in_charge = params.person_in_charge or "*"
+        field = f"{status}:{person_in_charge}"
+        try:
+            cached_count = await redis.hget(cls.COUNT_CACHE_KEY, field)
+        except RedisError:
+            return await ProjectRepository.count(params=params, session=session)
+        if cached_count is not None:
+            return int(cached_count)
+        total_count = await ProjectRepository.count(params=params, session=session)
+        try:
+            await redis.hset(cls.COUNT_CACHE_KEY, field, total_count)
+            await redis.expire(
+                cls.COUNT_CACHE_KEY, settings.PROJECTS_COUNT_CACHE_TTL, nx=True
+            )
+        except RedisError:
+            pass
+        return total_count
+
     @classmethod
     async def create(
         cls,
@@ -47,8 +153,9 @@ class ProjectService:
         redis: RedisDependency,
     ) -> ProjectDTO:
         project = await ProjectRepository.create(project=project_data, session=session)
-        await redis.delete("users:all")
-        await redis.delete(f"user:{project.person_in_charge}")
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(cls.COUNT_CACHE_KEY)
+        await user_cache.delete(f"user:{project.person_in_charge}", redis=redis)
         return ProjectDTO.model_validate(project)
 
     @classmethod
@@ -61,9 +168,75 @@ class ProjectService:
         projects = await ProjectRepository.create_many(
             projects=projects_data, session=session
         )
-        await redis.delete("users:all")
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(cls.COUNT_CACHE_KEY)
+        if projects:
+            await user_cache.delete(
+                *{f"user:{project.person_in_charge}" for project in projects},
+                redis=redis,
+            )
         return [ProjectDTO.model_validate(project) for project in projects]
 
+    @classmethod
+    async def bulk_load(
+        cls,
+        projects_data: list[ProjectAddDTO],
+        session: SessionDependency,
+        redis: RedisDependency,
+    ) -> BulkLoadResultDTO:
+        names = await ProjectRepository.copy_many(
+            projects=projects_data, session=session
+        )
+        inserted = set(names)
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(cls.COUNT_CACHE_KEY)
+        if inserted:
+            await user_cache.delete(
+                *{
+                    f"user:{project.person_in_charge}"
+                    for project in projects_data
+                    if project.name in inserted
+                },
+                redis=redis,
+            )
+        return BulkLoadResultDTO(
+            inserted=len(names),
+            skipped=[
+                project.name
+                for project in projects_data
+                if project.name not in inserted
+            ],
+        )
+
+    @classmethod
+    async def import_ndjson(
+        cls,
+        stream: AsyncIterator[bytes],
+        session: SessionDependency,
+        redis: RedisDependency,
+    ) -> ImportResultDTO:
+        async def insert(projects: list[ProjectAddDTO]) -> list[str]:
+            return await ProjectRepository.copy_many(projects=projects, session=session)
+
+        async def on_inserted(projects: list[ProjectAddDTO]) -> None:
+            person_in_charge_ids = {project.person_in_charge for project in projects}
+            await user_cache.delete(
+                *(f"user:{id}" for id in person_in_charge_ids), redis=redis
+            )
+
+        result = await NDJSONImporter.run(
+            stream,
+            model=ProjectAddDTO,
+            insert=insert,
+            key=lambda project: project.name,
+            conflict_error="Project name already exists",
+            on_inserted=on_inserted,
+        )
+        if result.inserted:
+            await UsersPageCache.invalidate(redis=redis)
+            await redis.delete(cls.COUNT_CACHE_KEY)
+        return result
+
     @classmethod
     async def update(
         cls,
@@ -77,8 +250,9 @@ class ProjectService:
             project=project_data,
             session=session,
         )
-        await redis.delete("users:all")
-        await redis.delete(f"user:{project.person_in_charge}")
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(cls.COUNT_CACHE_KEY)
+        await user_cache.delete(f"user:{project.person_in_charge}", redis=redis)
         return ProjectDTO.model_validate(project)
 
     @classmethod
@@ -89,6 +263,7 @@ class ProjectService:
         redis: RedisDependency,
     ) -> ProjectDTO:
         project = await ProjectRepository.delete(id=project_id, session=session)
-        await redis.delete("users:all")
-        await redis.delete(f"user:{project.person_in_charge}")
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(cls.COUNT_CACHE_KEY)
+        await user_cache.delete(f"user:{project.person_in_charge}", redis=redis)
         return ProjectDTO.model_validate(project)
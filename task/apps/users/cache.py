@@ -0,0 +1,40 @@
+import hashlib
+
+from redis.asyncio import Redis
+
+from task.apps.users.schemas import UserParams
+from task.settings.settings import settings
+from task.utils.two_tier_cache import TwoTierCache
+
+user_cache = TwoTierCache(
+    maxsize=settings.CACHE_LOCAL_SIZE,
+    ttl=settings.CACHE_LOCAL_TTL,
+    family="user",
+)
+users_page_cache = TwoTierCache(
+    maxsize=settings.CACHE_LOCAL_SIZE,
+    ttl=settings.CACHE_LOCAL_TTL,
+    family="users_page",
+)
+
+
+class UsersPageCache:
+    """
+    Listing pages are cached under a key that embeds the current generation
+    number. Writes bump the generation instead of deleting keys, so every
+    page goes stale at once and old entries simply expire.
+    """
+
+    GENERATION_KEY = "users:gen"
+
+    @classmethod
+    async def key(cls, params: UserParams, redis: Redis) -> str:
+        generation = int(await redis.get(cls.GENERATION_KEY) or 0)
+        params_hash = hashlib.md5(
+            params.model_dump_json().encode(), usedforsecurity=False
+        ).hexdigest()
+        return f"users:page:{generation}:{params_hash}"
+
+    @classmethod
+    async def invalidate(cls, redis: Redis) -> None:
+        await redis.incr(cls.GENERATION_KEY)
@@ -1,26 +1,137 @@
-from sqlalchemy import delete, insert, select, update
+import hashlib
+import json
+
+from asyncpg import InterfaceError, PostgresError
+from sqlalchemy import Select, delete, insert, select, text, update
 from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import SQLAlchemyError
+from task.apps.project.repository import ProjectRepository
 from task.apps.users.models import User
-from task.apps.users.schemas import UserAddDTO, UserUpdateDTO
+from task.apps.users.schemas import UserAddDTO, UserParams, UserUpdateDTO
+from task.utils.bulk_copy import BulkCopy
 from task.utils.dependencies import SessionDependency
-from task.utils.exceptions import DatabaseException, ItemNotFoundException
+from task.utils.exceptions import (
+    DatabaseException,
+    InvalidCursorException,
+    ItemNotFoundException,
+)
+from task.utils.pagination import CursorUtils, PaginationMode
 
 
 class UserRepository:
+    STAGING_COLUMNS = {
+        "username": "varchar",
+        "email": "varchar",
+        "hashed_password": "varchar",
+    }
+
     @classmethod
-    async def get_all(cls, session: SessionDependency) -> list[User]:
+    async def get_rows(
+        cls, session: SessionDependency, ids: list[int] | None = None
+    ) -> list[dict]:
         """
-        SELECT * FROM users
-        SELECT projects.* FROM projects WHERE projects.user_id IN (...)
+        SELECT id, username, email FROM users
+        [WHERE id IN (:ids)]
+        SELECT id, name, status, ... FROM projects
+        [WHERE person_in_charge IN (:ids)]
+
+        Read-only projection of users with their projects as plain dicts,
+        ready for batch validation; no ORM objects are built.
+        """
+        query = select(User.id, User.username, User.email).order_by(User.id)
+        if ids is not None:
+            query = query.where(User.id.in_(ids))
+        users = await cls._fetch_rows(query, session)
+        return await cls._attach_projects(users, ids=ids, session=session)
+
+    @classmethod
+    async def get_rows_with_params(
+        cls, params: UserParams, session: SessionDependency
+    ) -> dict:
         """
-        query = select(User).options(selectinload(User.projects))
+        SELECT id, username, email FROM users
+        WHERE username LIKE :escaped_username || '%' ESCAPE '/'
+        AND email = :email
+        [AND id > :cursor_id]
+        ORDER BY id
+        LIMIT :page_size + 1 [OFFSET (:page - 1) * :page_size]
+        SELECT id, name, status, ... FROM projects
+        WHERE person_in_charge IN (:page_user_ids)
+        """
+        query = select(User.id, User.username, User.email)
+        if params.username:
+            query = query.where(
+                User.username.startswith(params.username, autoescape=True)
+            )
+        if params.email:
+            query = query.where(User.email == params.email)
+        query = query.order_by(User.id)
+        if params.pagination == PaginationMode.CURSOR:
+            if params.cursor:
+                query = query.where(User.id > cls._decode_cursor(params))
+        else:
+            query = query.offset((params.page - 1) * params.page_size)
+        query = query.limit(params.page_size + 1)
+
+        users = await cls._fetch_rows(query, session)
+        has_next = len(users) > params.page_size
+        users = users[: params.page_size]
+        users = await cls._attach_projects(
+            users, ids=[user["id"] for user in users], session=session
+        )
+        result = {"users": users, "has_next": has_next}
+        if params.pagination == PaginationMode.CURSOR:
+            result["has_prev"] = params.cursor is not None
+            result["next_cursor"] = (
+                cls._encode_cursor(params, users[-1]["id"]) if has_next else None
+            )
+        else:
+            result["has_prev"] = params.page > 1
+        return result
+
+    @classmethod
+    async def _fetch_rows(cls, query: Select, session: SessionDependency) -> list[dict]:
         try:
             result = await session.execute(query)
-            users = result.scalars().all()
+            return [dict(row, projects=[]) for row in result.mappings()]
         except SQLAlchemyError:
             raise DatabaseException
-        return list(users)
+
+    @classmethod
+    async def _attach_projects(
+        cls, users: list[dict], ids: list[int] | None, session: SessionDependency
+    ) -> list[dict]:
+        if not users:
+            return users
+        projects = await ProjectRepository.get_rows_by_person_in_charge(
+            person_in_charge_ids=ids, session=session
+        )
+        users_by_id = {user["id"]: user for user in users}
+        for project in projects:
+            user = users_by_id.get(project["person_in_charge"])
+            if user is not None:
+                user["projects"].append(project)
+        return users
+
+    @classmethod
+    def _filters_digest(cls, params: UserParams) -> str:
+        filters = json.dumps([params.username, params.email]).encode()
+        return hashlib.sha256(filters).hexdigest()[:16]
+
+    @classmethod
+    def _encode_cursor(cls, params: UserParams, user_id: int) -> str:
+        return CursorUtils.encode(
+            {"filters": cls._filters_digest(params), "id": user_id}
+        )
+
+    @classmethod
+    def _decode_cursor(cls, params: UserParams) -> int:
+        data = CursorUtils.decode(params.cursor)
+        if data.get("filters") != cls._filters_digest(params) or not isinstance(
+            data.get("id"), int
+        ):
+            raise InvalidCursorException
+        return data["id"]
 
     @classmethod
     async def get_by_id(cls, id: int, session: SessionDependency) -> User:
@@ -39,23 +150,6 @@ class UserRepository:
             raise DatabaseException
         return user
 
-    @classmethod
-    async def get_by_ids(cls, ids: list[int], session: SessionDependency) -> list[User]:
-        """
-        SELECT * FROM users
-        WHERE id IN :ids
-        SELECT projects.* FROM projects WHERE projects.user_id IN (:ids)
-        """
-        query = (
-            select(User).options(selectinload(User.projects)).where(User.id.in_(ids))
-        )
-        try:
-            result = await session.execute(query)
-            users = result.scalars().all()
-        except SQLAlchemyError:
-            raise DatabaseException
-        return list(users)
-
     @classmethod
     async def create(cls, user: UserAddDTO, session: SessionDependency) -> User:
         """
@@ -92,6 +186,42 @@ class UserRepository:
             raise DatabaseException
         return list(user_res)
 
+    @classmethod
+    async def copy_many(
+        cls, users: list[UserAddDTO], session: SessionDependency
+    ) -> list[str]:
+        """
+        COPY users_staging (username, email, hashed_password) FROM STDIN
+
+        INSERT INTO users (username, email, hashed_password)
+        SELECT username, email, hashed_password FROM users_staging
+        ON CONFLICT DO NOTHING
+        RETURNING username
+        """
+        records = [(user.username, user.email, user.hashed_password) for user in users]
+        stmt = text(
+            """
+            INSERT INTO users (username, email, hashed_password)
+            SELECT username, email, hashed_password FROM users_staging
+            ON CONFLICT DO NOTHING
+            RETURNING username
+            """
+        )
+        try:
+            await BulkCopy.copy_to_staging(
+                session=session,
+                staging_table="users_staging",
+                columns=cls.STAGING_COLUMNS,
+                records=records,
+            )
+            result = await session.execute(stmt)
+            usernames = result.scalars().all()
+            await session.commit()
+        except (SQLAlchemyError, PostgresError, InterfaceError):
+            await session.rollback()
+            raise DatabaseException
+        return list(usernames)
+
     @classmethod
     async def update(
         cls, user_id: int, new_user: UserUpdateDTO, session: SessionDependency
@@ -149,6 +279,18 @@ class UserRepository:
             raise DatabaseException
         return user_res
 
+    @classmethod
+    async def get_username(cls, user_id: int, session: SessionDependency) -> str | None:
+        """
+        SELECT username FROM users WHERE id = :user_id
+        """
+        stmt = select(User.username).where(User.id == user_id)
+        try:
+            result = await session.execute(stmt)
+        except SQLAlchemyError:
+            raise DatabaseException
+        return result.scalar_one_or_none()
+
     @classmethod
     async def get_by_email(cls, email: str, session: SessionDependency) -> User | None:
         """
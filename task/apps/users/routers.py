@@ -1,10 +1,23 @@
 from typing import Annotated
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from task.apps.users.services import UserService
 from task.apps.auth.dependencies import get_current_by_session, get_current_user
-from task.apps.users.schemas import UserAddDTO, UserDTO, UserRelDto, UserUpdateDTO
-from task.utils.dependencies import RedisDependency, SessionDependency
+from task.apps.users.schemas import (
+    UserAddDTO,
+    UserDTO,
+    UserParams,
+    UserRelDto,
+    UserUpdateDTO,
+    UsersWithParamsDTO,
+)
+from task.utils.bulk_copy import BulkLoadResultDTO
+from task.utils.dependencies import (
+    BinaryRedisDependency,
+    RedisDependency,
+    SessionDependency,
+)
+from task.utils.ndjson import ImportResultDTO
 
 user_router = APIRouter(
     prefix="/users",
@@ -12,33 +25,40 @@ user_router = APIRouter(
 )
 
 
-@user_router.get("/all")
+@user_router.get("/all", response_model=UsersWithParamsDTO)
 async def read_all(
     session: SessionDependency,
-    redis: RedisDependency,
-) -> list[UserRelDto]:
-    return await UserService.get_all(session=session, redis=redis)
+    redis: BinaryRedisDependency,
+    params: UserParams = Depends(),
+) -> Response:
+    body = await UserService.get_with_params(
+        params=params, session=session, redis=redis
+    )
+    return Response(content=body, media_type="application/json")
 
 
-@user_router.get("/by_ids")
+@user_router.get("/by_ids", response_model=list[UserRelDto])
 async def read_by_ids(
     session: SessionDependency,
+    redis: BinaryRedisDependency,
     list_ids: list[int] = Query(),
-) -> list[UserRelDto]:
-    return await UserService.get_by_ids(user_ids=list_ids, session=session)
+) -> Response:
+    body = await UserService.get_by_ids(user_ids=list_ids, session=session, redis=redis)
+    return Response(content=body, media_type="application/json")
 
 
-@user_router.get("/by_id/{user_id}")
+@user_router.get("/by_id/{user_id}", response_model=UserRelDto)
 async def read_by_id(
     user_id: int,
     session: SessionDependency,
-    redis: RedisDependency,
-) -> UserRelDto:
-    return await UserService.get_by_id(
+    redis: BinaryRedisDependency,
+) -> Response:
+    body = await UserService.get_by_id(
         user_id=user_id,
         session=session,
         redis=redis,
     )
+    return Response(content=body, media_type="application/json")
 
 
 @user_router.post("/create_one")
@@ -73,6 +93,36 @@ async def create_users(
     return created
 
 
+@user_router.post("/bulk_load")
+async def bulk_load_users(
+    users: list[UserAddDTO],
+    session: SessionDependency,
+    redis: RedisDependency,
+    session_header: Annotated[str, Depends(get_current_by_session)],
+    token: Annotated[str, Depends(get_current_user)],
+) -> BulkLoadResultDTO:
+    return await UserService.bulk_load(
+        users_data=users,
+        session=session,
+        redis=redis,
+    )
+
+
+@user_router.post("/import")
+async def import_users(
+    request: Request,
+    session: SessionDependency,
+    redis: RedisDependency,
+    session_header: Annotated[str, Depends(get_current_by_session)],
+    token: Annotated[str, Depends(get_current_user)],
+) -> ImportResultDTO:
+    return await UserService.import_ndjson(
+        stream=request.stream(),
+        session=session,
+        redis=redis,
+    )
+
+
 @user_router.patch("/{user_id}")
 async def update_user(
     user_id: int,
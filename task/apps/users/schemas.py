@@ -1,7 +1,8 @@
 from typing import List, Optional
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter
 
 from task.apps.project.schemas import ProjectRelDto
+from task.utils.pagination import PaginationMode
 
 
 class UserUpdateDTO(BaseModel):
@@ -29,3 +30,22 @@ class UserDTO(BaseModel):
 
 class UserRelDto(UserDTO):
     projects: List["ProjectRelDto"] = []
+
+
+class UserParams(BaseModel):
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=10, ge=1, le=100)
+    username: Optional[str] = None
+    email: Optional[str] = None
+    pagination: PaginationMode = PaginationMode.PAGE
+    cursor: Optional[str] = None
+
+
+class UsersWithParamsDTO(BaseModel):
+    users: list[UserRelDto]
+    has_prev: bool
+    has_next: bool
+    next_cursor: Optional[str] = None
+
+
+UserRelListAdapter = TypeAdapter(list[UserRelDto])
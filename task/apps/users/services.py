@@ -1,33 +1,62 @@
-import json
-from fastapi import HTTPException, status
+from typing import AsyncIterator
 from redis import Redis
+from redis.exceptions import RedisError
+from task.apps.auth.cache import PrincipalCache, TokenVersions
 from task.apps.auth.services import AuthService
+from task.apps.project.services import ProjectService
+from task.apps.users.cache import UsersPageCache, user_cache, users_page_cache
 from task.apps.users.repository import UserRepository
-from task.apps.users.schemas import UserAddDTO, UserDTO, UserUpdateDTO, UserRelDto
+from task.apps.users.schemas import (
+    UserAddDTO,
+    UserDTO,
+    UserParams,
+    UserRelDto,
+    UserUpdateDTO,
+    UsersWithParamsDTO,
+)
+from task.settings.settings import settings
+from task.utils.bulk_copy import BulkLoadResultDTO
+from task.utils.cache_codec import cache_codec
 from task.utils.dependencies import SessionDependency
+from task.utils.exceptions import BatchTooLargeException
+from task.utils.ndjson import ImportResultDTO, NDJSONImporter
 
 
 class UserService:
     @classmethod
-    async def get_all(
+    async def get_with_params(
         cls,
+        params: UserParams,
         session: SessionDependency,
         redis: Redis,
         ttl_cache=300,
-    ) -> list[UserRelDto]:
-        cache_key = "users:all"
-        cached_data = await redis.get(cache_key)
-        if cached_data:
-            users = json.loads(cached_data)
-            return [UserRelDto.model_validate_json(user) for user in users]
-        users = await UserRepository.get_all(session=session)
-        users_dto = [UserRelDto.model_validate(user) for user in users]
-        await redis.set(
-            cache_key,
-            json.dumps([user.model_dump_json() for user in users_dto]),
-            ex=ttl_cache,
+    ) -> bytes:
+        """
+        Returns the page as a serialized UsersWithParamsDTO body; cached
+        bodies are returned as is, without a pydantic round-trip. Without
+        Redis the page is read from the database.
+        """
+
+        async def load() -> bytes:
+            users_data = await UserRepository.get_rows_with_params(
+                params=params, session=session
+            )
+            users = UsersWithParamsDTO.model_validate(users_data)
+            return cache_codec.pack(users.model_dump_json().encode())
+
+        try:
+            cache_key = await UsersPageCache.key(params=params, redis=redis)
+        except RedisError:
+            return cache_codec.unpack(await load())
+        payload = await users_page_cache.get_or_load(
+            cache_key, load, redis=redis, ttl=ttl_cache
         )
-        return users_dto
+        try:
+            return cache_codec.unpack(payload)
+        except ValueError:
+            payload = await load()
+            await users_page_cache.set(cache_key, payload, redis=redis, ttl=ttl_cache)
+            return cache_codec.unpack(payload)
 
     @classmethod
     async def get_by_id(
@@ -36,38 +65,74 @@ class UserService:
         session: SessionDependency,
         redis: Redis,
         ttl_cache=300,
-    ) -> UserRelDto:
+    ) -> bytes:
+        """
+        Returns the user as a serialized UserRelDto body; cached bodies are
+        returned as is, without a pydantic round-trip.
+        """
         cache_key = f"user:{user_id}"
+
+        async def load() -> bytes:
+            user = await UserRepository.get_by_id(id=user_id, session=session)
+            body = UserRelDto.model_validate(user).model_dump_json().encode()
+            return cache_codec.pack(body)
+
+        payload = await user_cache.get_or_load(
+            cache_key, load, redis=redis, ttl=ttl_cache
+        )
         try:
-            cached_data = await redis.get(cache_key)
-            await redis.incr(f"stats:hits:user:{user_id}")
-            if cached_data:
-                return UserRelDto.model_validate_json(cached_data)
-        except Exception:
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Redis error"
-            )
-        user = await UserRepository.get_by_id(id=user_id, session=session)
-        user = UserRelDto.model_validate(user)
-        if cached_data is None:
-            try:
-                await redis.set(cache_key, user.model_dump_json(), ex=ttl_cache)
-                await redis.incr(f"stats:miss:user:{user_id}")
-            except Exception:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Redis error",
-                )
-        return user
+            return cache_codec.unpack(payload)
+        except ValueError:
+            payload = await load()
+            await user_cache.set(cache_key, payload, redis=redis, ttl=ttl_cache)
+            return cache_codec.unpack(payload)
 
     @classmethod
     async def get_by_ids(
         cls,
         user_ids: list[int],
         session: SessionDependency,
-    ) -> list[UserRelDto]:
-        users = await UserRepository.get_by_ids(ids=user_ids, session=session)
-        return [UserRelDto.model_validate(user) for user in users]
+        redis: Redis,
+        ttl_cache: int = 300,
+    ) -> bytes:
+        """
+        Returns the JSON array body of the requested users, in request order
+        and repeated for duplicate ids; unknown ids are skipped. Cached
+        `user:{id}` bodies are read with one MGET, the missing ids are
+        loaded with one IN query and written back in one pipeline.
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        cached = await user_cache.get_many(
+            [f"user:{user_id}" for user_id in unique_ids], redis=redis
+        )
+
+        bodies: dict[int, bytes] = {}
+        for user_id, payload in zip(unique_ids, cached):
+            if payload is None:
+                continue
+            try:
+                bodies[user_id] = cache_codec.unpack(payload)
+            except ValueError:
+                pass
+
+        missing_ids = [user_id for user_id in unique_ids if user_id not in bodies]
+        if missing_ids:
+            rows = await UserRepository.get_rows(ids=missing_ids, session=session)
+            loaded = {
+                row["id"]: UserRelDto.model_validate(row).model_dump_json().encode()
+                for row in rows
+            }
+            bodies.update(loaded)
+            if loaded:
+                await user_cache.set_many(
+                    {
+                        f"user:{user_id}": cache_codec.pack(body)
+                        for user_id, body in loaded.items()
+                    },
+                    redis=redis,
+                    ttl=ttl_cache,
+                )
+        return b"[" + b",".join(bodies[i] for i in user_ids if i in bodies) + b"]"
 
     @classmethod
     async def create_user(
@@ -76,10 +141,10 @@ class UserService:
         session: SessionDependency,
         redis: Redis,
     ) -> UserDTO:
-        hashed = AuthService.hash_password(user_data.hashed_password)
+        hashed = await AuthService.hash_password(user_data.hashed_password)
         user_data.hashed_password = hashed
         user = await UserRepository.create(user=user_data, session=session)
-        await redis.delete("users:all")
+        await UsersPageCache.invalidate(redis=redis)
         return UserDTO.model_validate(user)
 
     @classmethod
@@ -89,12 +154,70 @@ class UserService:
         session: SessionDependency,
         redis: Redis,
     ) -> list[UserDTO]:
-        for user in users_data:
-            user.hashed_password = AuthService.hash_password(user.hashed_password)
+        if len(users_data) > settings.USERS_CREATE_MANY_MAX_BATCH:
+            raise BatchTooLargeException(settings.USERS_CREATE_MANY_MAX_BATCH)
+        hashed_passwords = await AuthService.hash_passwords(
+            [user.hashed_password for user in users_data]
+        )
+        for user, hashed in zip(users_data, hashed_passwords):
+            user.hashed_password = hashed
         users = await UserRepository.create_many(users=users_data, session=session)
-        await redis.delete("users:all")
+        await UsersPageCache.invalidate(redis=redis)
         return [UserDTO.model_validate(user) for user in users]
 
+    @classmethod
+    async def bulk_load(
+        cls,
+        users_data: list[UserAddDTO],
+        session: SessionDependency,
+        redis: Redis,
+    ) -> BulkLoadResultDTO:
+        if len(users_data) > settings.USERS_BULK_LOAD_MAX_BATCH:
+            raise BatchTooLargeException(settings.USERS_BULK_LOAD_MAX_BATCH)
+        hashed_passwords = await AuthService.hash_passwords(
+            [user.hashed_password for user in users_data]
+        )
+        for user, hashed in zip(users_data, hashed_passwords):
+            user.hashed_password = hashed
+        usernames = await UserRepository.copy_many(users=users_data, session=session)
+        inserted = set(usernames)
+        await UsersPageCache.invalidate(redis=redis)
+        return BulkLoadResultDTO(
+            inserted=len(usernames),
+            skipped=[
+                user.username for user in users_data if user.username not in inserted
+            ],
+        )
+
+    @classmethod
+    async def import_ndjson(
+        cls,
+        stream: AsyncIterator[bytes],
+        session: SessionDependency,
+        redis: Redis,
+    ) -> ImportResultDTO:
+        async def hash_passwords(users: list[UserAddDTO]) -> None:
+            hashed_passwords = await AuthService.hash_passwords(
+                [user.hashed_password for user in users]
+            )
+            for user, hashed in zip(users, hashed_passwords):
+                user.hashed_password = hashed
+
+        async def insert(users: list[UserAddDTO]) -> list[str]:
+            return await UserRepository.copy_many(users=users, session=session)
+
+        result = await NDJSONImporter.run(
+            stream,
+            model=UserAddDTO,
+            insert=insert,
+            key=lambda user: user.username,
+            conflict_error="Username or email already exists",
+            prepare=hash_passwords,
+        )
+        if result.inserted:
+            await UsersPageCache.invalidate(redis=redis)
+        return result
+
     @classmethod
     async def update(
         cls,
@@ -103,12 +226,22 @@ class UserService:
         session: SessionDependency,
         redis: Redis,
     ) -> UserDTO:
+        previous_username = None
+        if user_data.username is not None:
+            previous_username = await UserRepository.get_username(
+                user_id=id, session=session
+            )
         user = await UserRepository.update(
             user_id=id, new_user=user_data, session=session
         )
-        await redis.delete(f"user:{id}")
-        await redis.delete("users:all")
-        return UserDTO.model_validate(user)
+        updated = UserDTO.model_validate(user)
+        await PrincipalCache.invalidate(username=updated.username, redis=redis)
+        if previous_username and previous_username != updated.username:
+            await PrincipalCache.invalidate(username=previous_username, redis=redis)
+        await TokenVersions.bump(user_id=id, redis=redis)
+        await user_cache.delete(f"user:{id}", redis=redis)
+        await UsersPageCache.invalidate(redis=redis)
+        return updated
 
     @classmethod
     async def delete(
@@ -118,6 +251,10 @@ class UserService:
         redis: Redis,
     ) -> UserDTO:
         user = await UserRepository.delete(user_id=id, session=session)
-        await redis.delete(f"user:{id}")
-        await redis.delete("users:all")
-        return UserDTO.model_validate(user)
+        deleted = UserDTO.model_validate(user)
+        await PrincipalCache.invalidate(username=deleted.username, redis=redis)
+        await TokenVersions.bump(user_id=id, redis=redis)
+        await user_cache.delete(f"user:{id}", redis=redis)
+        await UsersPageCache.invalidate(redis=redis)
+        await redis.delete(ProjectService.COUNT_CACHE_KEY)
+        return deleted
@@ -1,17 +1,41 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import Body, FastAPI
 from pydantic import EmailStr
-from task.apps.auth.middleware import auth_middleware
+from task.apps.auth.middleware import AuthMiddleware, include_paths
 from task.celery.tasks.tasks import send_email as send
 from task.celery.celery_utils import celery_app
 from task.routers.api_router import api_router
-
-
-from task.utils.rate_limiter import rate_limiter_middleware
-
-
-app = FastAPI()
-app.middleware("http")(auth_middleware)
-app.middleware("http")(rate_limiter_middleware)
+from task.settings.settings import settings
+from task.utils.cache_stats import cache_stats
+from task.utils.dependencies import redis_binary_client, redis_pubsub_client
+from task.utils.http_client import create_http_client
+from task.utils.two_tier_cache import TwoTierCache
+
+
+from task.utils.rate_limiter import RateLimitMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    invalidation_listener = asyncio.create_task(
+        TwoTierCache.listen(redis_pubsub_client)
+    )
+    stats_flusher = asyncio.create_task(
+        cache_stats.run(redis_binary_client, settings.CACHE_STATS_FLUSH_INTERVAL)
+    )
+    app.state.http_client = create_http_client(settings)
+    yield
+    await app.state.http_client.aclose()
+    invalidation_listener.cancel()
+    stats_flusher.cancel()
+    await asyncio.gather(stats_flusher, return_exceptions=True)
+
+
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(AuthMiddleware, include_paths=include_paths)
+app.add_middleware(RateLimitMiddleware)
 app.include_router(api_router)
 
 
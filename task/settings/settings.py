@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import EmailStr, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -8,6 +9,13 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = Field(default="alchemytask_db")
     POSTGRES_HOST: str = Field(default="postgres")
     POSTGRES_PORT: int = Field(default=5432)
+    DB_ECHO: bool = Field(default=False)
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_POOL_TIMEOUT: float = Field(default=10)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=False)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=100)
 
     REDIS_HOST: str = Field(default="localhost")
     REDIS_PORT: int = Field(default=6379)
@@ -16,6 +24,16 @@ class Settings(BaseSettings):
     REDIS_CACHE_DB: int = Field(default=2)
 
     REDIS_PASSWORD: str = Field(default="")
+    REDIS_MAX_CONNECTIONS: int = Field(default=50)
+    REDIS_POOL_TIMEOUT: float = Field(default=1)
+    REDIS_SOCKET_TIMEOUT: float = Field(default=0.5)
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = Field(default=0.5)
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(default=30)
+    REDIS_RETRY_ATTEMPTS: int = Field(default=2)
+    REDIS_RETRY_BACKOFF_BASE: float = Field(default=0.01)
+    REDIS_RETRY_BACKOFF_CAP: float = Field(default=0.1)
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = Field(default=5)
+    REDIS_BREAKER_RESET_TIMEOUT: float = Field(default=10)
 
     SMTP_HOST: str
     SMTP_PORT: int
@@ -26,8 +44,67 @@ class Settings(BaseSettings):
 
     TESTING: bool = False
 
+    PROJECTS_COUNT_STRATEGY: Literal["exact", "cached", "estimate"] = Field(
+        default="exact"
+    )
+    PROJECTS_COUNT_CACHE_TTL: int = Field(default=60)
+
+    AUTH_USER_CACHE_TTL: int = Field(default=60)
+    AUTH_USER_LOCAL_CACHE_TTL: float = Field(default=5)
+    AUTH_USER_LOCAL_CACHE_SIZE: int = Field(default=1024)
+    AUTH_TRUST_TOKEN_CLAIMS: bool = Field(default=False)
+
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = Field(default="thread")
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = Field(default=4)
+    PASSWORD_HASH_BULK_WORKERS: int = Field(default=0)
+    USERS_CREATE_MANY_MAX_BATCH: int = Field(default=1000)
+    USERS_BULK_LOAD_MAX_BATCH: int = Field(default=10000)
+
+    IMPORT_CHUNK_SIZE: int = Field(default=500)
+    IMPORT_MAX_ERRORS: int = Field(default=100)
+    IMPORT_MAX_LINE_BYTES: int = Field(default=64 * 1024)
+    EXPORT_BATCH_SIZE: int = Field(default=1000)
+
+    CACHE_SERIALIZER: Literal["orjson", "msgpack"] = Field(default="orjson")
+    CACHE_COMPRESSION: Literal["none", "zlib", "zstd", "lz4"] = Field(default="none")
+    CACHE_COMPRESSION_THRESHOLD: int = Field(default=1024)
+    CACHE_LOCAL_SIZE: int = Field(default=1024)
+    CACHE_LOCAL_TTL: float = Field(default=30)
+    CACHE_STALE_TTL: int = Field(default=60)
+    CACHE_LOCK_TIMEOUT: float = Field(default=5)
+    CACHE_LOCK_POLL_INTERVAL: float = Field(default=0.05)
+    CACHE_STATS_BUCKET: int = Field(default=60)
+    CACHE_STATS_RETENTION: int = Field(default=24 * 60 * 60)
+    CACHE_STATS_FLUSH_INTERVAL: float = Field(default=10)
+
+    RATE_LIMIT_ALGORITHM: Literal["token_bucket", "sliding_window"] = Field(
+        default="sliding_window"
+    )
+    RATE_LIMIT_DEFAULT: str = Field(default="10/60")
+    RATE_LIMIT_ROUTES: dict[str, str] = Field(default={})
+    RATE_LIMIT_USERS: dict[str, str] = Field(default={})
+    RATE_LIMIT_MODE: Literal["exact", "approximate"] = Field(default="exact")
+    RATE_LIMIT_LOCAL_MAX_ERROR: float = Field(default=0.1)
+    RATE_LIMIT_LOCAL_WORKERS: int = Field(default=4)
+    RATE_LIMIT_LOCAL_SYNC_INTERVAL: float = Field(default=1)
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = Field(default=10000)
+
+    POSTS_API_URL: str = Field(default="https://jsonplaceholder.typicode.com/posts")
+    HTTP_CLIENT_HTTP2: bool = Field(default=True)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = Field(default=100)
+    HTTP_CLIENT_MAX_KEEPALIVE: int = Field(default=20)
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = Field(default=30)
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = Field(default=2)
+    HTTP_CLIENT_READ_TIMEOUT: float = Field(default=5)
+    HTTP_CLIENT_POOL_TIMEOUT: float = Field(default=2)
+    HTTP_CLIENT_RETRIES: int = Field(default=2)
+
     SECRET_KEY: str = Field(default="")
     ALG: str = "HS256"
+    JWT_BACKEND: Literal["jose", "pyjwt"] = Field(default="jose")
+    JWT_CACHE_SIZE: int = Field(default=4096)
+    JWT_CACHE_TTL: float = Field(default=300)
 
     model_config = SettingsConfigDict(env_file="task/.env")
 
@@ -35,6 +112,26 @@ class Settings(BaseSettings):
     def db_url(self) -> str:
         return f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def db_engine_options(self) -> dict:
+        """
+        Keyword arguments for create_async_engine. Set DB_STATEMENT_CACHE_SIZE
+        to 0 behind a transaction-mode PgBouncer, which breaks prepared
+        statements.
+        """
+        return {
+            "echo": self.DB_ECHO,
+            "pool_size": self.DB_POOL_SIZE,
+            "max_overflow": self.DB_MAX_OVERFLOW,
+            "pool_timeout": self.DB_POOL_TIMEOUT,
+            "pool_recycle": self.DB_POOL_RECYCLE,
+            "pool_pre_ping": self.DB_POOL_PRE_PING,
+            "connect_args": {
+                "statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+                "prepared_statement_cache_size": self.DB_STATEMENT_CACHE_SIZE,
+            },
+        }
+
     @property
     def redis_cache_url(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_CACHE_DB}"
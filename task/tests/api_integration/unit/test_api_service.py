@@ -1,11 +1,15 @@
 from unittest.mock import AsyncMock, Mock
+import httpx
 import pytest
 
 from task.apps.api_integration.service import APIService
+from task.tests.stubs.jsonplaceholder import POSTS, JSONPlaceholderStub
+from task.utils.cache_codec import cache_codec
+from task.utils.exceptions import ApiIntegrationException
 
 
 @pytest.mark.service
-async def test_get_posts(mocker):
+async def test_get_posts(mocker, memory_redis):
     fake_json = [{"id": 1, "titel": "test"}]
 
     fake_response = Mock()
@@ -15,12 +19,46 @@ async def test_get_posts(mocker):
     fake_client = AsyncMock()
     fake_client.get = AsyncMock(return_value=fake_response)
 
-    fake_redis = AsyncMock()
-    fake_redis.get = AsyncMock(return_value=None)
-    fake_redis.set = AsyncMock()
-
-    result = await APIService.get_posts(client=fake_client, redis=fake_redis)
+    result = await APIService.get_posts(client=fake_client, redis=memory_redis)
     assert result == fake_json
     fake_client.get.assert_awaited_once_with(
         "https://jsonplaceholder.typicode.com/posts"
     )
+    assert await memory_redis.get("posts") == cache_codec.dumps(fake_json)
+
+
+@pytest.mark.service
+async def test_get_posts_cached(memory_redis):
+    fake_json = [{"id": 1, "titel": "test"}]
+    fake_client = AsyncMock()
+    await memory_redis.set("posts", cache_codec.dumps(fake_json), ex=300)
+
+    result = await APIService.get_posts(client=fake_client, redis=memory_redis)
+    assert result == fake_json
+    fake_client.get.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_get_posts_from_stub(mocker, memory_redis):
+    stub = JSONPlaceholderStub()
+    mocker.patch(
+        "task.apps.api_integration.service.settings.POSTS_API_URL",
+        "http://jsonplaceholder.test/posts",
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)) as client:
+        assert await APIService.get_posts(client=client, redis=memory_redis) == POSTS
+        assert await APIService.get_posts(client=client, redis=memory_redis) == POSTS
+    assert stub.requests == 1
+
+
+@pytest.mark.service
+async def test_get_posts_error_status(mocker, memory_redis):
+    stub = JSONPlaceholderStub()
+    mocker.patch(
+        "task.apps.api_integration.service.settings.POSTS_API_URL",
+        "http://jsonplaceholder.test/missing",
+    )
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=stub)) as client:
+        with pytest.raises(ApiIntegrationException):
+            await APIService.get_posts(client=client, redis=memory_redis)
+    assert await memory_redis.get("posts") is None
@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from task.apps.auth.middleware import AuthMiddleware
+from task.apps.users.schemas import UserDTO
+from task.utils.token_utils import TokenUtils
+
+
+async def echo_user_app(scope, receive, send):
+    user = scope.get("state", {}).get("user")
+    body = user.username.encode() if user else b"anonymous"
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+@pytest.fixture
+def client(mocker):
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "secret")
+
+    @asynccontextmanager
+    async def fake_session():
+        yield AsyncMock()
+
+    mocker.patch("task.apps.auth.middleware.local_session", fake_session)
+    app = AuthMiddleware(echo_user_app, include_paths=["/api/private"])
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+@pytest.mark.service
+async def test_other_paths_pass_through(client):
+    async with client:
+        response = await client.get("/api/public")
+    assert response.text == "anonymous"
+
+
+@pytest.mark.service
+async def test_missing_token_rejected(client):
+    async with client:
+        response = await client.get("/api/private/data")
+        assert response.status_code == 401
+        response = await client.get(
+            "/api/private/data", headers={"Authorization": "Bearer broken"}
+        )
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Invalid token"}
+
+
+@pytest.mark.service
+async def test_valid_token_sets_user(client, mocker):
+    principal = UserDTO(id=1, username="alice", email="alice@example.com")
+    mocker.patch(
+        "task.apps.auth.middleware.AuthRepository.get_principal",
+        AsyncMock(return_value=principal),
+    )
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    async with client:
+        response = await client.get(
+            "/api/private/data", headers={"Authorization": f"Bearer {token}"}
+        )
+    assert response.status_code == 200
+    assert response.text == "alice"
@@ -0,0 +1,126 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from task.apps.auth.cache import PrincipalCache
+from task.apps.auth.dependencies import PrincipalResolver, get_current_user
+from task.apps.auth.services import AuthService
+from task.apps.users.models import User
+from task.apps.users.schemas import UserAddDTO, UserDTO, UserUpdateDTO
+from task.apps.users.services import UserService
+from task.utils.exceptions import InvalidTokenException
+
+USER = User(id=7, username="alice", email="alice@example.com", hashed_password="x")
+PRINCIPAL = UserDTO.model_validate(USER)
+
+
+@pytest.fixture(autouse=True)
+def claims_mode(mocker):
+    mocker.patch("task.settings.settings.settings.AUTH_TRUST_TOKEN_CLAIMS", True)
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "secret")
+    PrincipalCache.cache.local.clear()
+    yield
+    PrincipalCache.cache.local.clear()
+
+
+@pytest.fixture
+def get_principal(mocker):
+    return mocker.patch(
+        "task.apps.auth.dependencies.AuthRepository.get_principal",
+        AsyncMock(return_value=PRINCIPAL),
+    )
+
+
+async def login(mocker, redis) -> str:
+    mocker.patch(
+        "task.apps.auth.services.AuthRepository.get_by_username",
+        AsyncMock(return_value=UserAddDTO.model_validate(USER)),
+    )
+    mocker.patch(
+        "task.apps.auth.services.PasswordUtils.verify_password_async",
+        AsyncMock(return_value=True),
+    )
+    tokens = await AuthService.login("alice", "password", AsyncMock(), redis)
+    return tokens["access_token"]
+
+
+@pytest.mark.service
+async def test_principal_comes_from_claims(mocker, memory_redis, get_principal):
+    token = await login(mocker, memory_redis)
+    get_principal.reset_mock()
+    resolver = PrincipalResolver(session=AsyncMock(), redis=memory_redis)
+
+    principal = await get_current_user(resolver=resolver, x_jwt_token=token)
+
+    assert principal == PRINCIPAL
+    get_principal.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_update_and_delete_revoke_tokens(mocker, memory_redis, get_principal):
+    mocker.patch(
+        "task.apps.users.services.UserRepository.update",
+        AsyncMock(return_value=USER),
+    )
+    mocker.patch(
+        "task.apps.users.services.UserRepository.delete",
+        AsyncMock(return_value=USER),
+    )
+    resolver = PrincipalResolver(session=AsyncMock(), redis=memory_redis)
+
+    token = await login(mocker, memory_redis)
+    await UserService.update(7, UserUpdateDTO(), AsyncMock(), memory_redis)
+    with pytest.raises(InvalidTokenException):
+        await get_current_user(resolver=resolver, x_jwt_token=token)
+
+    token = await login(mocker, memory_redis)
+    assert await get_current_user(resolver=resolver, x_jwt_token=token)
+    await UserService.delete(7, AsyncMock(), memory_redis)
+    with pytest.raises(InvalidTokenException):
+        await get_current_user(resolver=resolver, x_jwt_token=token)
+
+
+@pytest.mark.service
+async def test_falls_back_to_lookup_without_redis(mocker, memory_redis, get_principal):
+    token = await login(mocker, memory_redis)
+    get_principal.reset_mock()
+    broken_redis = AsyncMock()
+    broken_redis.get = AsyncMock(side_effect=RedisError)
+    resolver = PrincipalResolver(session=AsyncMock(), redis=broken_redis)
+
+    assert await get_current_user(resolver=resolver, x_jwt_token=token)
+    get_principal.assert_awaited_once()
+
+
+@pytest.mark.service
+async def test_disabled_mode_ignores_claims(mocker, memory_redis, get_principal):
+    token = await login(mocker, memory_redis)
+    get_principal.reset_mock()
+    mocker.patch("task.settings.settings.settings.AUTH_TRUST_TOKEN_CLAIMS", False)
+    resolver = PrincipalResolver(session=AsyncMock(), redis=memory_redis)
+
+    assert await get_current_user(resolver=resolver, x_jwt_token=token)
+    get_principal.assert_awaited_once()
+
+
+@pytest.mark.service
+async def test_lost_versions_fail_closed(mocker, memory_redis, get_principal):
+    mocker.patch(
+        "task.apps.users.services.UserRepository.update",
+        AsyncMock(return_value=USER),
+    )
+    resolver = PrincipalResolver(session=AsyncMock(), redis=memory_redis)
+    revoked = await login(mocker, memory_redis)
+    await UserService.update(7, UserUpdateDTO(), AsyncMock(), memory_redis)
+    valid = await login(mocker, memory_redis)
+
+    memory_redis.data.clear()
+    for token in (revoked, valid):
+        with pytest.raises(InvalidTokenException):
+            await get_current_user(resolver=resolver, x_jwt_token=token)
+
+    token = await login(mocker, memory_redis)
+    assert await get_current_user(resolver=resolver, x_jwt_token=token)
+    with pytest.raises(InvalidTokenException):
+        await get_current_user(resolver=resolver, x_jwt_token=revoked)
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from task.apps.auth.cache import PrincipalCache
+from task.apps.auth.dependencies import PrincipalResolver, get_current_user
+from task.apps.users.schemas import UserDTO
+from task.utils.exceptions import InvalidTokenException, ItemNotFoundException
+from task.utils.two_tier_cache import TwoTierCache
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    PrincipalCache.cache.local.clear()
+    yield
+    PrincipalCache.cache.local.clear()
+
+
+@pytest.mark.service
+async def test_resolve_once_per_request(mocker):
+    principal = UserDTO(id=1, username="testuser", email="test@example.com")
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    fake_redis.mget = AsyncMock(return_value=[None])
+    mock_get_principal = mocker.patch(
+        "task.apps.auth.dependencies.AuthRepository.get_principal",
+        AsyncMock(return_value=principal),
+    )
+    resolver = PrincipalResolver(session=session, redis=fake_redis)
+    assert await resolver.resolve("testuser") == principal
+    assert await resolver.resolve("testuser") == principal
+    mock_get_principal.assert_awaited_once_with(username="testuser", session=session)
+    fake_redis.mget.assert_awaited_once_with(["auth:user:testuser"])
+    fake_redis.set.assert_awaited_once()
+
+
+@pytest.mark.service
+async def test_resolve_from_shared_cache(mocker):
+    principal = UserDTO(id=1, username="testuser", email="test@example.com")
+    fake_redis = AsyncMock()
+    fake_redis.mget = AsyncMock(return_value=[principal.model_dump_json()])
+    mock_get_principal = mocker.patch(
+        "task.apps.auth.dependencies.AuthRepository.get_principal",
+        AsyncMock(),
+    )
+    resolver = PrincipalResolver(session=AsyncMock(), redis=fake_redis)
+    assert await resolver.resolve("testuser") == principal
+    mock_get_principal.assert_not_awaited()
+
+    another_request = PrincipalResolver(session=AsyncMock(), redis=fake_redis)
+    assert await another_request.resolve("testuser") == principal
+    fake_redis.mget.assert_awaited_once()
+
+
+@pytest.mark.service
+async def test_resolve_missing_user(mocker):
+    fake_redis = AsyncMock()
+    fake_redis.mget = AsyncMock(return_value=[None])
+    mock_get_principal = mocker.patch(
+        "task.apps.auth.dependencies.AuthRepository.get_principal",
+        AsyncMock(return_value=None),
+    )
+    resolver = PrincipalResolver(session=AsyncMock(), redis=fake_redis)
+    with pytest.raises(ItemNotFoundException):
+        await resolver.resolve("ghost")
+    with pytest.raises(ItemNotFoundException):
+        await resolver.resolve("ghost")
+    mock_get_principal.assert_awaited_once()
+    fake_redis.set.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_invalidation_reaches_other_workers(memory_redis):
+    principal = UserDTO(id=1, username="testuser", email="test@example.com")
+    other_worker = TwoTierCache(maxsize=10, ttl=60, family="principal")
+    other_worker.local.set(PrincipalCache.key("testuser"), principal.model_dump_json())
+    await PrincipalCache.set(principal, redis=memory_redis)
+
+    await PrincipalCache.invalidate("testuser", redis=memory_redis)
+    ((channel, message),) = memory_redis.published
+    assert channel == TwoTierCache.CHANNEL
+    TwoTierCache.invalidate_local(orjson.loads(message))
+
+    assert other_worker.local.get(PrincipalCache.key("testuser")) is None
+    assert await PrincipalCache.get("testuser", redis=memory_redis) is None
+
+
+@pytest.mark.service
+async def test_current_user_rejects_invalid_token():
+    resolver = PrincipalResolver(session=AsyncMock(), redis=AsyncMock())
+    with pytest.raises(InvalidTokenException):
+        await get_current_user(resolver=resolver, x_jwt_token="not-a-jwt")
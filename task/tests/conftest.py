@@ -1,3 +1,4 @@
+import time
 from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 import pytest
@@ -8,7 +9,134 @@ from task.apps.auth.dependencies import get_current_user
 from task.settings.settings import settings
 from task.utils.database import Base, get_session
 from task.main import app
-from task.utils.dependencies import get_redis, httpx_client
+from task.utils.dependencies import get_binary_redis, get_redis, httpx_client
+from task.utils.token_utils import TokenUtils
+from task.utils.two_tier_cache import TwoTierCache
+
+
+class InMemoryRedis:
+    """
+    Minimal stand-in for the binary asyncio Redis client, covering the
+    commands used by the cache layer.
+    """
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.expires: dict[str, float] = {}
+        self.published: list[tuple[str, bytes]] = []
+
+    def _alive(self, key: str) -> bool:
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    async def get(self, key: str) -> bytes | None:
+        return self.data[key] if self._alive(key) else None
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [await self.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, px=None, nx=False):
+        if nx and self._alive(key):
+            return None
+        if isinstance(value, (str, int)):
+            value = str(value).encode()
+        self.data[key] = value
+        self.expires.pop(key, None)
+        if ex is not None:
+            self.expires[key] = time.monotonic() + ex
+        if px is not None:
+            self.expires[key] = time.monotonic() + px / 1000
+        return True
+
+    async def delete(self, *keys: str) -> int:
+        deleted = [key for key in keys if self._alive(key)]
+        for key in deleted:
+            self.data.pop(key)
+            self.expires.pop(key, None)
+        return len(deleted)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self.data[key] = str(value).encode()
+        return value
+
+    async def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        fields = self.data.setdefault(key, {}) if self._alive(key) else {}
+        self.data[key] = fields
+        field = field.encode()
+        fields[field] = str(int(fields.get(field, 0)) + amount).encode()
+        return int(fields[field])
+
+    async def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.data[key]) if self._alive(key) else {}
+
+    async def expire(self, key: str, seconds: int) -> bool:
+        if not self._alive(key):
+            return False
+        self.expires[key] = time.monotonic() + seconds
+        return True
+
+    async def pttl(self, key: str) -> int:
+        if not self._alive(key):
+            return -2
+        if key not in self.expires:
+            return -1
+        return int((self.expires[key] - time.monotonic()) * 1000)
+
+    async def publish(self, channel: str, message: bytes) -> int:
+        self.published.append((channel, message))
+        return 0
+
+    async def eval(self, script: str, numkeys: int, key: str, token: str) -> int:
+        if await self.get(key) == token.encode():
+            return await self.delete(key)
+        return 0
+
+    def pipeline(self, transaction: bool = True):
+        return InMemoryPipeline(self)
+
+
+class InMemoryPipeline:
+    def __init__(self, redis: InMemoryRedis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        def command(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return command
+
+    async def execute(self) -> list:
+        results = []
+        for name, args, kwargs in self.commands:
+            results.append(await getattr(self.redis, name)(*args, **kwargs))
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def memory_redis():
+    return InMemoryRedis()
+
+
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    TwoTierCache.clear_local()
+    TokenUtils.clear_cache()
+    yield
+    TwoTierCache.clear_local()
+    TokenUtils.clear_cache()
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -70,6 +198,7 @@ def client(fake_current_user, fake_session):
     app.dependency_overrides[get_session] = override_session
     app.dependency_overrides[httpx_client] = override_httpx_client
     app.dependency_overrides[get_redis] = override_redis
+    app.dependency_overrides[get_binary_redis] = override_redis
 
     client = TestClient(app)
     yield client
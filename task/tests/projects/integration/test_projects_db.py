@@ -2,9 +2,15 @@ import pytest
 from sqlalchemy import select
 from task.apps.project.models import Project, ProjectStatus
 from task.apps.project.repository import ProjectRepository
-from task.apps.project.schemas import ProjectAddDTO, ProjectParams, ProjectUpdateDTO
+from task.apps.project.schemas import (
+    ProjectAddDTO,
+    ProjectParams,
+    ProjectSortField,
+    ProjectUpdateDTO,
+)
 from task.apps.users.repository import UserRepository
 from task.apps.users.schemas import UserAddDTO
+from task.utils.pagination import PaginationMode
 
 
 test_user = UserAddDTO(
@@ -50,6 +56,60 @@ async def test_get_with_params(setup_db):
     assert projects["projects"][0].name == project_dto.name
 
 
+@pytest.mark.db
+async def test_get_with_params_cursor(setup_db):
+    user = await UserRepository.create(test_user, setup_db)
+    assert user is not None
+    projects_dto = [
+        ProjectAddDTO(
+            name=f"test_project{i}",
+            status=ProjectStatus.NEW,
+            description="",
+            person_in_charge=user.id,
+        )
+        for i in range(5)
+    ]
+    await ProjectRepository.create_many(projects_dto, setup_db)
+    params = ProjectParams(
+        page_size=2,
+        sort_field=ProjectSortField.CREATE_TIME,
+        pagination=PaginationMode.CURSOR,
+    )
+    names = []
+    while True:
+        page = await ProjectRepository.get_with_params(params, setup_db)
+        names.extend(project.name for project in page["projects"])
+        if not page["has_next"]:
+            break
+        assert page["next_cursor"] is not None
+        params = params.model_copy(update={"cursor": page["next_cursor"]})
+    assert sorted(names) == sorted(project.name for project in projects_dto)
+    assert len(names) == len(set(names))
+
+
+@pytest.mark.db
+async def test_stream_rows(setup_db):
+    user = await UserRepository.create(test_user, setup_db)
+    projects_dto = [
+        ProjectAddDTO(
+            name=f"test_project{i}",
+            status=ProjectStatus.NEW if i % 2 else ProjectStatus.COMPLETED,
+            description="",
+            person_in_charge=user.id,
+        )
+        for i in range(5)
+    ]
+    await ProjectRepository.create_many(projects_dto, setup_db)
+    params = ProjectParams(status=ProjectStatus.NEW)
+    rows = [
+        row
+        async for partition in ProjectRepository.stream_rows(params, setup_db)
+        for row in partition
+    ]
+    assert [row.name for row in rows] == ["test_project1", "test_project3"]
+    assert rows[0].status == "NEW"
+
+
 @pytest.mark.db
 async def test_create(setup_db):
     user = await UserRepository.create(test_user, setup_db)
@@ -103,6 +163,34 @@ async def test_create_many(setup_db):
     assert projects_from_db[1].name == projects_dto[1].name
 
 
+@pytest.mark.db
+async def test_copy_many(setup_db):
+    user = await UserRepository.create(test_user, setup_db)
+    existing = ProjectAddDTO(
+        name="test_project1",
+        status=ProjectStatus.NEW,
+        description="",
+        person_in_charge=user.id,
+    )
+    await ProjectRepository.create(existing, setup_db)
+    projects_dto = [
+        existing,
+        ProjectAddDTO(
+            name="test_project2",
+            status=ProjectStatus.COMPLETED,
+            description="",
+            person_in_charge=user.id,
+        ),
+    ]
+    names = await ProjectRepository.copy_many(projects_dto, setup_db)
+    assert names == ["test_project2"]
+
+    query = select(Project).where(Project.name == "test_project2")
+    result = await setup_db.execute(query)
+    project_from_db = result.scalar_one()
+    assert project_from_db.status == ProjectStatus.COMPLETED
+
+
 @pytest.mark.db
 async def test_update(setup_db):
     user = await UserRepository.create(test_user, setup_db)
@@ -1,3 +1,4 @@
+from collections import namedtuple
 from datetime import datetime, timezone
 from types import SimpleNamespace
 from unittest.mock import AsyncMock
@@ -5,6 +6,8 @@ import pytest
 
 from task.apps.project.models import ProjectStatus
 from task.apps.project.schemas import (
+    CountStrategy,
+    ExportFormat,
     ProjectAddDTO,
     ProjectDTO,
     ProjectParams,
@@ -13,6 +16,8 @@ from task.apps.project.schemas import (
     ProjectsWithParamsDTO,
 )
 from task.apps.project.services import ProjectService
+from task.apps.users.cache import UsersPageCache
+from task.settings.settings import settings
 
 
 @pytest.mark.service
@@ -76,6 +81,70 @@ async def test_get_with_params(mocker):
     mock_get_with_params.assert_awaited_once_with(params=params, session=session)
 
 
+@pytest.mark.service
+async def test_get_with_params_cached_count(mocker):
+    params = ProjectParams(status=ProjectStatus.NEW)
+    expected_obj = {
+        "projects": [],
+        "total_count": 7,
+        "has_prev": False,
+        "has_next": False,
+    }
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    fake_redis.hget = AsyncMock(return_value=None)
+    mocker.patch.object(settings, "PROJECTS_COUNT_STRATEGY", "cached")
+    mock_count = mocker.patch(
+        "task.apps.project.services.ProjectRepository.count",
+        AsyncMock(return_value=7),
+    )
+    mock_get_with_params = mocker.patch(
+        "task.apps.project.services.ProjectRepository.get_with_params",
+        AsyncMock(return_value=expected_obj),
+    )
+    result = await ProjectService.get_with_params(
+        params=params, session=session, redis=fake_redis
+    )
+    assert result.total_count == 7
+    assert result.count_strategy == CountStrategy.CACHED
+    mock_count.assert_awaited_once_with(params=params, session=session)
+    fake_redis.hset.assert_awaited_once_with(ProjectService.COUNT_CACHE_KEY, "NEW:*", 7)
+    mock_get_with_params.assert_awaited_once_with(
+        params=params, session=session, total_count=7
+    )
+
+    fake_redis.hget = AsyncMock(return_value="7")
+    mock_count.reset_mock()
+    await ProjectService.get_with_params(
+        params=params, session=session, redis=fake_redis
+    )
+    mock_count.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_get_with_params_estimated_count(mocker):
+    params = ProjectParams()
+    expected_obj = {
+        "projects": [],
+        "total_count": 1000,
+        "has_prev": False,
+        "has_next": True,
+    }
+    session = AsyncMock()
+    mocker.patch.object(settings, "PROJECTS_COUNT_STRATEGY", "estimate")
+    mocker.patch(
+        "task.apps.project.services.ProjectRepository.estimate_count",
+        AsyncMock(return_value=1000),
+    )
+    mocker.patch(
+        "task.apps.project.services.ProjectRepository.get_with_params",
+        AsyncMock(return_value=expected_obj),
+    )
+    result = await ProjectService.get_with_params(params=params, session=session)
+    assert result.total_count == 1000
+    assert result.count_strategy == CountStrategy.ESTIMATE
+
+
 @pytest.mark.service
 async def test_create(mocker):
     project_data = ProjectAddDTO(
@@ -236,3 +305,94 @@ async def test_delete(mocker):
     assert result.id == 1
     assert result.name == "test"
     mock_delete.assert_awaited_once_with(id=1, session=session)
+
+
+@pytest.mark.service
+async def test_import_ndjson(mocker):
+    async def stream():
+        yield (
+            b'{"name": "test", "status": "NEW", "description": "", '
+            b'"start_time": "2025-01-01T00:00:00Z", "person_in_charge": 1}\n'
+        )
+        yield b'{"name": "broken"}\n'
+
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    mock_copy_many = mocker.patch(
+        "task.apps.project.services.ProjectRepository.copy_many",
+        AsyncMock(return_value=["test"]),
+    )
+    result = await ProjectService.import_ndjson(
+        stream=stream(), session=session, redis=fake_redis
+    )
+    assert result.inserted == 1
+    assert result.failed == 1
+    assert result.errors[0].line == 2
+    mock_copy_many.assert_awaited_once()
+    fake_redis.delete.assert_any_await("user:1")
+    fake_redis.delete.assert_any_await(ProjectService.COUNT_CACHE_KEY)
+
+
+@pytest.mark.service
+async def test_bulk_load(mocker):
+    projects_data = [
+        ProjectAddDTO(
+            name=f"test{i}",
+            status=ProjectStatus.NEW,
+            description="",
+            person_in_charge=1,
+        )
+        for i in range(3)
+    ]
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    mock_copy_many = mocker.patch(
+        "task.apps.project.services.ProjectRepository.copy_many",
+        AsyncMock(return_value=["test0", "test2"]),
+    )
+    result = await ProjectService.bulk_load(
+        projects_data=projects_data, session=session, redis=fake_redis
+    )
+    assert result.inserted == 2
+    assert result.skipped == ["test1"]
+    mock_copy_many.assert_awaited_once_with(projects=projects_data, session=session)
+    fake_redis.incr.assert_awaited_once_with(UsersPageCache.GENERATION_KEY)
+    fake_redis.delete.assert_any_await(ProjectService.COUNT_CACHE_KEY)
+
+
+@pytest.mark.service
+@pytest.mark.parametrize(
+    "export_format, expected",
+    [
+        (
+            ExportFormat.NDJSON,
+            b'{"id":1,"name":"test","status":"NEW","start_time":"2025-01-01T00:00:00+00:00"}\n'
+            b'{"id":2,"name":"test2","status":"COMPLETED","start_time":"2025-01-01T00:00:00+00:00"}\n',
+        ),
+        (
+            ExportFormat.CSV,
+            b"id,name,status,start_time\r\n"
+            b"1,test,NEW,2025-01-01T00:00:00+00:00\r\n"
+            b"2,test2,COMPLETED,2025-01-01T00:00:00+00:00\r\n",
+        ),
+    ],
+)
+async def test_export(mocker, export_format, expected):
+    ExportRow = namedtuple("ExportRow", ["id", "name", "status", "start_time"])
+    start_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+    async def stream_rows(params, session):
+        yield [ExportRow(1, "test", "NEW", start_time)]
+        yield [ExportRow(2, "test2", "COMPLETED", start_time)]
+
+    mocker.patch(
+        "task.apps.project.services.ProjectRepository.stream_rows", stream_rows
+    )
+    chunks = [
+        chunk
+        async for chunk in ProjectService.export(
+            params=ProjectParams(), export_format=export_format, session=AsyncMock()
+        )
+    ]
+    assert len(chunks) == 2
+    assert b"".join(chunks) == expected
@@ -0,0 +1,62 @@
+"""
+Minimal ASGI stand-in for https://jsonplaceholder.typicode.com used by tests
+(through httpx.ASGITransport) and benchmarks (served with uvicorn):
+
+    uvicorn task.tests.stubs.jsonplaceholder:app --port 8081
+
+Only GET /posts is implemented. STUB_LATENCY_MS adds a fixed delay per
+request to mimic a remote API.
+"""
+
+import asyncio
+import os
+
+import orjson
+
+POSTS = [
+    {
+        "userId": post_id // 10 + 1,
+        "id": post_id,
+        "title": f"post {post_id}",
+        "body": f"body of post {post_id}",
+    }
+    for post_id in range(1, 101)
+]
+POSTS_BODY = orjson.dumps(POSTS)
+
+
+class JSONPlaceholderStub:
+    def __init__(self, latency_ms: float = 0):
+        self.latency_ms = latency_ms
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        self.requests += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        if scope["method"] == "GET" and scope["path"] == "/posts":
+            status, body = 200, POSTS_BODY
+        else:
+            status, body = 404, b'{"detail": "Not Found"}'
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+app = JSONPlaceholderStub(latency_ms=float(os.getenv("STUB_LATENCY_MS", "0")))
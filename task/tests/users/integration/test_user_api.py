@@ -1,7 +1,12 @@
 from unittest.mock import AsyncMock
 import pytest
 
-from task.apps.users.schemas import UserDTO, UserRelDto
+from task.apps.users.schemas import (
+    UserDTO,
+    UserRelDto,
+    UserRelListAdapter,
+    UsersWithParamsDTO,
+)
 
 
 @pytest.mark.api
@@ -12,14 +17,15 @@ async def test_get_all(client, mocker):
         email="test@test.com",
         projects=[],
     )
+    expected = UsersWithParamsDTO(users=[expected_user], has_prev=False, has_next=False)
     mock_service = mocker.patch(
-        "task.apps.users.routers.UserService.get_all",
-        AsyncMock(return_value=[expected_user]),
+        "task.apps.users.routers.UserService.get_with_params",
+        AsyncMock(return_value=expected.model_dump_json()),
     )
-    response = client.get("/api/users/all")
+    response = client.get("/api/users/all", params={"page_size": 5})
     assert response.status_code == 200
-    assert response.json() == [expected_user.model_dump()]
-    mock_service.assert_awaited_once()
+    assert response.json() == expected.model_dump()
+    assert mock_service.await_args.kwargs["params"].page_size == 5
 
 
 @pytest.mark.api
@@ -40,7 +46,7 @@ async def test_get_by_ids(client, mocker):
     ]
     mock_service = mocker.patch(
         "task.apps.users.routers.UserService.get_by_ids",
-        AsyncMock(return_value=expected_users),
+        AsyncMock(return_value=UserRelListAdapter.dump_json(expected_users)),
     )
     response = client.get("/api/users/by_ids?list_ids=1&list_ids=2")
     assert response.status_code == 200
@@ -58,7 +64,7 @@ async def test_get_by_id(client, mocker):
     )
     mock_service = mocker.patch(
         "task.apps.users.routers.UserService.get_by_id",
-        AsyncMock(return_value=expected_user),
+        AsyncMock(return_value=expected_user.model_dump_json()),
     )
     response = client.get("/api/users/by_id/1")
     assert response.status_code == 200
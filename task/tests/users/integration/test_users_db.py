@@ -1,12 +1,16 @@
 import pytest
 from sqlalchemy import select
+from task.apps.project.models import ProjectStatus
+from task.apps.project.repository import ProjectRepository
+from task.apps.project.schemas import ProjectAddDTO
 from task.apps.users.models import User
 from task.apps.users.repository import UserRepository
-from task.apps.users.schemas import UserAddDTO, UserUpdateDTO
+from task.apps.users.schemas import UserAddDTO, UserParams, UserUpdateDTO
+from task.utils.pagination import PaginationMode
 
 
 @pytest.mark.db
-async def test_get_all(setup_db):
+async def test_get_rows_all(setup_db):
     users_dto = [
         UserAddDTO(
             username="test_user1",
@@ -21,13 +25,80 @@ async def test_get_all(setup_db):
     ]
 
     await UserRepository.create_many(users_dto, setup_db)
-    users = await UserRepository.get_all(setup_db)
+    users = await UserRepository.get_rows(setup_db)
 
     assert len(users) == 2
-    assert all(isinstance(user, User) for user in users)
+    assert users[0]["username"] == users_dto[0].username
+    assert users[1]["username"] == users_dto[1].username
+
+
+@pytest.mark.db
+async def test_get_rows(setup_db):
+    users = await UserRepository.create_many(
+        [
+            UserAddDTO(
+                username=f"test_user{i}",
+                email=f"test_user{i}@mail.ru",
+                hashed_password="test_password",
+            )
+            for i in range(2)
+        ],
+        setup_db,
+    )
+    await ProjectRepository.create(
+        ProjectAddDTO(
+            name="test_project",
+            status=ProjectStatus.NEW,
+            description="",
+            person_in_charge=users[1].id,
+        ),
+        setup_db,
+    )
+
+    rows = await UserRepository.get_rows(setup_db)
+    assert [row["username"] for row in rows] == ["test_user0", "test_user1"]
+    assert rows[0]["projects"] == []
+    assert rows[1]["projects"][0]["name"] == "test_project"
+
+    rows = await UserRepository.get_rows(setup_db, ids=[users[0].id])
+    assert [row["id"] for row in rows] == [users[0].id]
+    assert rows[0]["projects"] == []
+
 
-    assert users[0].username == users_dto[0].username
-    assert users[1].username == users_dto[1].username
+@pytest.mark.db
+async def test_get_rows_with_params(setup_db):
+    await UserRepository.create_many(
+        [
+            UserAddDTO(
+                username=f"test_user{i}",
+                email=f"test_user{i}@mail.ru",
+                hashed_password="test_password",
+            )
+            for i in range(5)
+        ],
+        setup_db,
+    )
+
+    params = UserParams(page=2, page_size=2)
+    page = await UserRepository.get_rows_with_params(params, setup_db)
+    assert [row["username"] for row in page["users"]] == ["test_user2", "test_user3"]
+    assert page["has_prev"] and page["has_next"]
+
+    params = UserParams(page_size=3, pagination=PaginationMode.CURSOR)
+    page = await UserRepository.get_rows_with_params(params, setup_db)
+    assert len(page["users"]) == 3
+    params.cursor = page["next_cursor"]
+    page = await UserRepository.get_rows_with_params(params, setup_db)
+    assert [row["username"] for row in page["users"]] == ["test_user3", "test_user4"]
+    assert not page["has_next"]
+
+    params = UserParams(username="test_user4")
+    page = await UserRepository.get_rows_with_params(params, setup_db)
+    assert [row["username"] for row in page["users"]] == ["test_user4"]
+
+    params = UserParams(username="_")
+    page = await UserRepository.get_rows_with_params(params, setup_db)
+    assert page["users"] == []
 
 
 @pytest.mark.db
@@ -45,7 +116,7 @@ async def test_get_by_id(setup_db):
 
 
 @pytest.mark.db
-async def test_get_by_ids(setup_db):
+async def test_get_rows_by_ids(setup_db):
     users_dto = [
         UserAddDTO(
             username="test_user1",
@@ -61,10 +132,10 @@ async def test_get_by_ids(setup_db):
     users = await UserRepository.create_many(users_dto, setup_db)
     assert users is not None
     user_ids = [user.id for user in users]
-    users_from_db = await UserRepository.get_by_ids(user_ids, setup_db)
+    users_from_db = await UserRepository.get_rows(setup_db, ids=user_ids)
     assert len(users_from_db) == len(users_dto)
-    assert users_from_db[0].username == users_dto[0].username
-    assert users_from_db[1].username == users_dto[1].username
+    assert users_from_db[0]["username"] == users_dto[0].username
+    assert users_from_db[1]["username"] == users_dto[1].username
 
 
 @pytest.mark.db
@@ -119,6 +190,37 @@ async def test_create_many(setup_db):
     assert users_in_db[1].username == users_dto[1].username
 
 
+@pytest.mark.db
+async def test_copy_many(setup_db):
+    await UserRepository.create(
+        UserAddDTO(
+            username="test_user1",
+            email="test_user1@mail.ru",
+            hashed_password="test_password1",
+        ),
+        setup_db,
+    )
+    users_dto = [
+        UserAddDTO(
+            username="test_user1",
+            email="other@mail.ru",
+            hashed_password="test_password1",
+        ),
+        UserAddDTO(
+            username="test_user2",
+            email="test_user2@mail.ru",
+            hashed_password="test_password2",
+        ),
+    ]
+
+    usernames = await UserRepository.copy_many(users_dto, setup_db)
+
+    assert usernames == ["test_user2"]
+    query = select(User).where(User.username == "test_user2")
+    result = await setup_db.execute(query)
+    assert result.scalar_one().email == "test_user2@mail.ru"
+
+
 @pytest.mark.db
 async def test_update(setup_db):
     user_dto = UserAddDTO(
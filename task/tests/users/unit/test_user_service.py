@@ -1,43 +1,96 @@
-from unittest.mock import AsyncMock, Mock, call
+from unittest.mock import AsyncMock, Mock
 import pytest
+from redis.exceptions import ConnectionError
+from task.apps.users.cache import UsersPageCache
 from task.apps.users.models import User
-from task.apps.users.schemas import UserAddDTO, UserDTO, UserRelDto, UserUpdateDTO
+from task.apps.users.repository import UserRepository
+from task.apps.users.schemas import (
+    UserAddDTO,
+    UserDTO,
+    UserParams,
+    UserRelDto,
+    UserRelListAdapter,
+    UserUpdateDTO,
+    UsersWithParamsDTO,
+)
 from task.apps.users.services import UserService
+from task.settings.settings import settings
+from task.utils.cache_codec import cache_codec
+from task.utils.exceptions import BatchTooLargeException, InvalidCursorException
+from task.utils.pagination import PaginationMode
 
 
 @pytest.mark.service
-async def test_get_all(mocker):
-    expected_obj = [
-        User(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            hashed_password="hashed_password",
-        ),
-        User(
-            id=2,
-            username="testuser2",
-            email="test2@example.com",
-            hashed_password="hashed_password2",
-        ),
-    ]
+async def test_get_with_params(mocker, memory_redis):
+    expected_obj = {
+        "users": [
+            {
+                "id": 1,
+                "username": "testuser",
+                "email": "test@example.com",
+                "projects": [],
+            },
+            {
+                "id": 2,
+                "username": "testuser2",
+                "email": "test2@example.com",
+                "projects": [],
+            },
+        ],
+        "has_prev": False,
+        "has_next": True,
+    }
+    params = UserParams(page_size=2)
     session = AsyncMock()
-    fake_redis = AsyncMock()
-    fake_redis.get = AsyncMock(return_value=None)
-    fake_redis.set = AsyncMock()
-    mock_get_all = mocker.patch(
-        "task.apps.users.services.UserRepository.get_all",
+    mock_get_rows = mocker.patch(
+        "task.apps.users.services.UserRepository.get_rows_with_params",
         AsyncMock(return_value=expected_obj),
     )
-    result = await UserService.get_all(session, redis=fake_redis)
-    assert all(isinstance(user, UserRelDto) for user in result)
-    assert result[0].username == "testuser"
-    assert result[1].username == "testuser2"
-    mock_get_all.assert_awaited_once_with(session=session)
+    body = await UserService.get_with_params(params, session, redis=memory_redis)
+    result = UsersWithParamsDTO.model_validate_json(body)
+    assert [user.username for user in result.users] == ["testuser", "testuser2"]
+    assert result.has_next
+    mock_get_rows.assert_awaited_once_with(params=params, session=session)
+    (cache_key,) = [key for key in memory_redis.data if key.startswith("users:page:")]
+    assert cache_key.startswith("users:page:0:")
+    assert cache_codec.unpack(memory_redis.data[cache_key]) == body
 
 
 @pytest.mark.service
-async def test_get_by_id(mocker):
+async def test_get_with_params_cached(mocker, memory_redis):
+    cached = UsersWithParamsDTO(users=[], has_prev=False, has_next=False)
+    body = cached.model_dump_json().encode()
+    cache_key = await UsersPageCache.key(UserParams(), redis=memory_redis)
+    await memory_redis.set(cache_key, cache_codec.pack(body), ex=300)
+    mock_validate = mocker.patch.object(UsersWithParamsDTO, "model_validate_json")
+    mock_get_rows = mocker.patch(
+        "task.apps.users.services.UserRepository.get_rows_with_params", AsyncMock()
+    )
+    result = await UserService.get_with_params(UserParams(), AsyncMock(), memory_redis)
+    assert result == body
+    mock_get_rows.assert_not_awaited()
+    mock_validate.assert_not_called()
+
+
+@pytest.mark.service
+async def test_get_with_params_generation(mocker, memory_redis):
+    fake_redis = memory_redis
+    mock_get_rows = mocker.patch(
+        "task.apps.users.services.UserRepository.get_rows_with_params",
+        AsyncMock(return_value={"users": [], "has_prev": False, "has_next": False}),
+    )
+    params = UserParams()
+    await UserService.get_with_params(params, AsyncMock(), redis=fake_redis)
+    await UserService.get_with_params(params, AsyncMock(), redis=fake_redis)
+    assert mock_get_rows.await_count == 1
+
+    await UsersPageCache.invalidate(redis=fake_redis)
+    await UserService.get_with_params(params, AsyncMock(), redis=fake_redis)
+    assert mock_get_rows.await_count == 2
+
+
+@pytest.mark.service
+async def test_get_by_id(mocker, memory_redis):
     expected_obj = User(
         id=1,
         username="testuser",
@@ -45,47 +98,90 @@ async def test_get_by_id(mocker):
         hashed_password="hashed_password",
     )
     session = AsyncMock()
-    fake_redis = AsyncMock()
-    fake_redis.get = AsyncMock(return_value=None)
-    fake_redis.set = AsyncMock()
     mock_get_by_id = mocker.patch(
         "task.apps.users.services.UserRepository.get_by_id",
         AsyncMock(return_value=expected_obj),
     )
-    result = await UserService.get_by_id(1, session, redis=fake_redis)
-    assert isinstance(result, UserRelDto)
-    assert result.username == "testuser"
+    body = await UserService.get_by_id(1, session, redis=memory_redis)
+    assert UserRelDto.model_validate_json(body).username == "testuser"
+    assert await memory_redis.get("user:1") == cache_codec.pack(body)
+    assert await memory_redis.get("lock:user:1") is None
     mock_get_by_id.assert_awaited_once_with(id=1, session=session)
 
+    assert await UserService.get_by_id(1, session, redis=memory_redis) == body
+    mock_get_by_id.assert_awaited_once()
+
 
 @pytest.mark.service
-async def test_get_by_ids(mocker):
+async def test_get_by_id_without_redis(mocker):
+    expected_obj = User(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        hashed_password="hashed_password",
+    )
+    fake_redis = AsyncMock()
+    fake_redis.pipeline = Mock(side_effect=ConnectionError)
+    fake_redis.set = AsyncMock(side_effect=ConnectionError)
+    mocker.patch(
+        "task.apps.users.services.UserRepository.get_by_id",
+        AsyncMock(return_value=expected_obj),
+    )
+    body = await UserService.get_by_id(1, AsyncMock(), redis=fake_redis)
+    assert UserRelDto.model_validate_json(body).username == "testuser"
+
+
+@pytest.mark.service
+async def test_get_by_ids(mocker, memory_redis):
     ids = [1, 2]
     expected_obj = [
-        User(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            hashed_password="hashed_password",
-        ),
-        User(
-            id=2,
-            username="testuser2",
-            email="test2@example.com",
-            hashed_password="hashed_password2",
-        ),
+        {"id": 1, "username": "testuser", "email": "test@example.com", "projects": []},
+        {
+            "id": 2,
+            "username": "testuser2",
+            "email": "test2@example.com",
+            "projects": [],
+        },
     ]
     session = AsyncMock()
     mock_get_by_ids = mocker.patch(
-        "task.apps.users.services.UserRepository.get_by_ids",
+        "task.apps.users.services.UserRepository.get_rows",
         AsyncMock(return_value=expected_obj),
     )
-    result = await UserService.get_by_ids(ids, session)
-    assert all(isinstance(user, UserRelDto) for user in result)
+    body = await UserService.get_by_ids(ids, session, redis=memory_redis)
+    result = UserRelListAdapter.validate_json(body)
     assert len(result) == 2
     assert result[0].username == "testuser"
     assert result[1].username == "testuser2"
     mock_get_by_ids.assert_awaited_once_with(ids=ids, session=session)
+    assert cache_codec.unpack(await memory_redis.get("user:2")) == (
+        result[1].model_dump_json().encode()
+    )
+
+
+@pytest.mark.service
+async def test_get_by_ids_cached_order_and_duplicates(mocker, memory_redis):
+    cached = UserRelDto(id=2, username="cached", email="cached@example.com")
+    await memory_redis.set(
+        "user:2", cache_codec.pack(cached.model_dump_json().encode()), ex=300
+    )
+    session = AsyncMock()
+    mock_get_rows = mocker.patch(
+        "task.apps.users.services.UserRepository.get_rows",
+        AsyncMock(
+            return_value=[
+                {"id": 3, "username": "three", "email": "3@example.com", "projects": []}
+            ]
+        ),
+    )
+    body = await UserService.get_by_ids([3, 2, 404, 3], session, redis=memory_redis)
+    result = UserRelListAdapter.validate_json(body)
+    assert [user.username for user in result] == ["three", "cached", "three"]
+    mock_get_rows.assert_awaited_once_with(ids=[3, 404], session=session)
+
+    body = await UserService.get_by_ids([2, 3], session, redis=memory_redis)
+    assert [user.id for user in UserRelListAdapter.validate_json(body)] == [2, 3]
+    mock_get_rows.assert_awaited_once()
 
 
 @pytest.mark.service
@@ -105,7 +201,7 @@ async def test_create_user(mocker):
     )
     mock_hash_password = mocker.patch(
         "task.apps.users.services.AuthService.hash_password",
-        Mock(return_value="hashed_password"),
+        AsyncMock(return_value="hashed_password"),
     )
     mock_create_user = mocker.patch(
         "task.apps.users.services.UserRepository.create",
@@ -128,7 +224,7 @@ async def test_create_user_invalid(mocker):
     fake_redis = AsyncMock()
     mock_hash_password = mocker.patch(
         "task.apps.users.services.AuthService.hash_password",
-        Mock(return_value="hashed_password"),
+        AsyncMock(return_value="hashed_password"),
     )
     mock_create_user = mocker.patch(
         "task.apps.users.services.UserRepository.create",
@@ -170,9 +266,9 @@ async def test_create_many(mocker):
         ),
     ]
     fake_redis = AsyncMock()
-    mock_hash_password = mocker.patch(
-        "task.apps.users.services.AuthService.hash_password",
-        Mock(side_effect=["hashed_password1", "hashed_password2"]),
+    mock_hash_passwords = mocker.patch(
+        "task.apps.users.services.AuthService.hash_passwords",
+        AsyncMock(return_value=["hashed_password1", "hashed_password2"]),
     )
     mock_create_many = mocker.patch(
         "task.apps.users.services.UserRepository.create_many",
@@ -180,10 +276,66 @@ async def test_create_many(mocker):
     )
     result = await UserService.create_many(users_data, session, fake_redis)
     assert all(isinstance(user, UserDTO) for user in result)
-    mock_hash_password.assert_has_calls([call("testpassword1"), call("testpassword2")])
+    mock_hash_passwords.assert_awaited_once_with(["testpassword1", "testpassword2"])
+    assert [user.hashed_password for user in users_data] == [
+        "hashed_password1",
+        "hashed_password2",
+    ]
     mock_create_many.assert_called_once_with(users=users_data, session=session)
 
 
+@pytest.mark.service
+async def test_create_many_batch_too_large(mocker):
+    users_data = [
+        UserAddDTO(
+            username=f"testuser{i}",
+            hashed_password="testpassword",
+            email=f"test{i}@example.com",
+        )
+        for i in range(3)
+    ]
+    mocker.patch.object(settings, "USERS_CREATE_MANY_MAX_BATCH", 2)
+    mock_hash_passwords = mocker.patch(
+        "task.apps.users.services.AuthService.hash_passwords", AsyncMock()
+    )
+    with pytest.raises(BatchTooLargeException):
+        await UserService.create_many(users_data, AsyncMock(), AsyncMock())
+    mock_hash_passwords.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_username_prefix_is_escaped(mocker):
+    fetch_rows = mocker.patch.object(
+        UserRepository, "_fetch_rows", AsyncMock(return_value=[])
+    )
+    await UserRepository.get_rows_with_params(UserParams(username="a_%"), AsyncMock())
+    query = fetch_rows.await_args.args[0]
+    compiled = query.compile(compile_kwargs={"literal_binds": True})
+    assert "LIKE 'a/_/%' || '%' ESCAPE '/'" in str(compiled)
+
+
+@pytest.mark.service
+async def test_cursor_rejected_for_other_filters(mocker):
+    mocker.patch.object(
+        UserRepository,
+        "_fetch_rows",
+        AsyncMock(return_value=[{"id": i, "projects": []} for i in (1, 2)]),
+    )
+    mocker.patch.object(
+        UserRepository,
+        "_attach_projects",
+        AsyncMock(side_effect=lambda users, **_: users),
+    )
+    params = UserParams(username="ali", page_size=1, pagination=PaginationMode.CURSOR)
+    page = await UserRepository.get_rows_with_params(params, AsyncMock())
+
+    params.cursor = page["next_cursor"]
+    await UserRepository.get_rows_with_params(params, AsyncMock())
+    params.username = "bob"
+    with pytest.raises(InvalidCursorException):
+        await UserRepository.get_rows_with_params(params, AsyncMock())
+
+
 @pytest.mark.service
 async def test_update(mocker):
     user_id = 1
@@ -196,6 +348,10 @@ async def test_update(mocker):
         hashed_password="hashed_password",
     )
     fake_redis = AsyncMock()
+    mocker.patch(
+        "task.apps.users.services.UserRepository.get_username",
+        AsyncMock(return_value="newname"),
+    )
     mocked_update = mocker.patch(
         "task.apps.users.services.UserRepository.update",
         AsyncMock(return_value=expected_obj),
@@ -211,6 +367,32 @@ async def test_update(mocker):
     )
 
 
+@pytest.mark.service
+async def test_update_rename_invalidates_previous_principal(mocker):
+    renamed = User(
+        id=1, username="newname", email="new@mail.com", hashed_password="hashed"
+    )
+    mocker.patch(
+        "task.apps.users.services.UserRepository.get_username",
+        AsyncMock(return_value="oldname"),
+    )
+    mocker.patch(
+        "task.apps.users.services.UserRepository.update",
+        AsyncMock(return_value=renamed),
+    )
+    invalidate = mocker.patch(
+        "task.apps.users.services.PrincipalCache.invalidate", AsyncMock()
+    )
+    fake_redis = AsyncMock()
+    await UserService.update(
+        1, UserUpdateDTO(username="newname"), AsyncMock(), fake_redis
+    )
+    assert {call.kwargs["username"] for call in invalidate.await_args_list} == {
+        "newname",
+        "oldname",
+    }
+
+
 @pytest.mark.service
 async def test_delete(mocker):
     user_id = 1
@@ -245,3 +427,83 @@ async def test_delete_not_found(mocker):
     with pytest.raises(ValueError):
         await UserService.delete(user_id, session, fake_redis)
     mocked_delete.assert_awaited_once_with(user_id=user_id, session=session)
+
+
+@pytest.mark.service
+async def test_import_ndjson(mocker):
+    async def stream():
+        yield b'{"username": "testuser1", "hashed_password": "testpassword1", '
+        yield b'"email": "test1@example.com"}\n{"username": "testuser2", '
+        yield b'"hashed_password": "testpassword2", "email": "test2@example.com"}\n'
+
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    mocker.patch(
+        "task.apps.users.services.AuthService.hash_passwords",
+        AsyncMock(return_value=["hashed_password1", "hashed_password2"]),
+    )
+    mock_copy_many = mocker.patch(
+        "task.apps.users.services.UserRepository.copy_many",
+        AsyncMock(return_value=["testuser1"]),
+    )
+    result = await UserService.import_ndjson(stream(), session, fake_redis)
+    assert result.inserted == 1
+    assert result.failed == 1
+    assert result.errors[0].line == 2
+    users = mock_copy_many.await_args.kwargs["users"]
+    assert [user.hashed_password for user in users] == [
+        "hashed_password1",
+        "hashed_password2",
+    ]
+    fake_redis.incr.assert_awaited_once_with(UsersPageCache.GENERATION_KEY)
+
+
+@pytest.mark.service
+async def test_bulk_load_batch_too_large(mocker):
+    users_data = [
+        UserAddDTO(
+            username=f"testuser{i}",
+            hashed_password="testpassword",
+            email=f"test{i}@example.com",
+        )
+        for i in range(3)
+    ]
+    mocker.patch.object(settings, "USERS_BULK_LOAD_MAX_BATCH", 2)
+    mock_hash_passwords = mocker.patch(
+        "task.apps.users.services.AuthService.hash_passwords", AsyncMock()
+    )
+    mock_copy_many = mocker.patch(
+        "task.apps.users.services.UserRepository.copy_many", AsyncMock()
+    )
+    with pytest.raises(BatchTooLargeException):
+        await UserService.bulk_load(users_data, AsyncMock(), AsyncMock())
+    mock_hash_passwords.assert_not_awaited()
+    mock_copy_many.assert_not_awaited()
+
+
+@pytest.mark.service
+async def test_bulk_load(mocker):
+    users_data = [
+        UserAddDTO(
+            username=f"testuser{i}",
+            hashed_password=f"testpassword{i}",
+            email=f"test{i}@example.com",
+        )
+        for i in range(2)
+    ]
+    session = AsyncMock()
+    fake_redis = AsyncMock()
+    mocker.patch(
+        "task.apps.users.services.AuthService.hash_passwords",
+        AsyncMock(return_value=["hashed_password0", "hashed_password1"]),
+    )
+    mock_copy_many = mocker.patch(
+        "task.apps.users.services.UserRepository.copy_many",
+        AsyncMock(return_value=["testuser1"]),
+    )
+    result = await UserService.bulk_load(users_data, session, fake_redis)
+    assert result.inserted == 1
+    assert result.skipped == ["testuser0"]
+    assert users_data[0].hashed_password == "hashed_password0"
+    mock_copy_many.assert_awaited_once_with(users=users_data, session=session)
+    fake_redis.incr.assert_awaited_once_with(UsersPageCache.GENERATION_KEY)
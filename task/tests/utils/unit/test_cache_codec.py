@@ -0,0 +1,49 @@
+import pytest
+
+from task.utils.cache_codec import CacheCodec
+
+
+def test_roundtrip_orjson():
+    codec = CacheCodec()
+    value = [{"id": 1, "title": "test"}]
+    payload = codec.dumps(value)
+    assert payload[:3] == bytes([CacheCodec.VERSION, 1, 0])
+    assert codec.loads(payload) == value
+
+
+def test_compression_above_threshold():
+    codec = CacheCodec(compression="zlib", threshold=64)
+    small = codec.pack(b"x" * 10)
+    large = codec.pack(b"x" * 1000)
+    assert small[2] == 0
+    assert large[2] == CacheCodec.COMPRESSIONS["zlib"]
+    assert len(large) < 1000
+    assert codec.unpack(large) == b"x" * 1000
+
+
+def test_decode_uses_header():
+    payload = CacheCodec(compression="zlib", threshold=0).dumps({"id": 1})
+    assert CacheCodec().loads(payload) == {"id": 1}
+
+
+def test_unknown_version():
+    payload = bytes([CacheCodec.VERSION + 1, 1, 0]) + b"{}"
+    with pytest.raises(ValueError):
+        CacheCodec().loads(payload)
+
+
+def test_raw_and_serialized_payloads_differ():
+    codec = CacheCodec()
+    with pytest.raises(ValueError):
+        codec.unpack(codec.dumps({"id": 1}))
+    with pytest.raises(ValueError):
+        codec.loads(b"not a payload")
+
+
+def test_missing_optional_dependency(mocker):
+    mocker.patch("task.utils.cache_codec.msgpack", None)
+    mocker.patch("task.utils.cache_codec.zstandard", None)
+    with pytest.raises(RuntimeError):
+        CacheCodec(serializer="msgpack")
+    with pytest.raises(RuntimeError):
+        CacheCodec(compression="zstd")
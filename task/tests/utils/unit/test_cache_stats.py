@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from redis.exceptions import RedisError
+
+from task.utils.cache_stats import CacheStats
+from task.utils.two_tier_cache import TwoTierCache
+
+
+async def test_flush_writes_one_hash_per_bucket(memory_redis):
+    stats = CacheStats(bucket=60, retention=3600)
+    for _ in range(3):
+        stats.record("user", "remote_hit")
+    stats.record("user", "miss")
+    stats.record("users_page", "local_hit")
+
+    await stats.flush(memory_redis)
+    (key,) = memory_redis.data
+    assert key.startswith("stats:cache:")
+    assert int(key.rsplit(":", 1)[1]) % 60 == 0
+    assert await memory_redis.hgetall(key) == {
+        b"user:remote_hit": b"3",
+        b"user:miss": b"1",
+        b"users_page:local_hit": b"1",
+    }
+    assert 0 < await memory_redis.pttl(key) <= 3600 * 1000
+
+
+async def test_flush_keeps_counters_on_redis_error():
+    stats = CacheStats(bucket=60, retention=3600)
+    stats.record("user", "miss")
+    fake_redis = AsyncMock()
+    fake_redis.pipeline = Mock(side_effect=RedisError)
+
+    with pytest.raises(RedisError):
+        await stats.flush(fake_redis)
+    assert stats._pending == {"user:miss": 1}
+
+
+async def test_report_hit_ratio_per_family(memory_redis):
+    stats = CacheStats(bucket=60, retention=3600)
+    for event in ("local_hit", "remote_hit", "stale_hit", "miss"):
+        stats.record("user", event)
+    await stats.flush(memory_redis)
+    stats.record("posts", "miss")
+
+    report = await stats.report(memory_redis, window=600)
+    assert report["user"]["hit_ratio"] == 0.75
+    assert report["user"]["miss"] == 1
+    assert report["posts"] == {
+        "local_hit": 0,
+        "remote_hit": 0,
+        "stale_hit": 0,
+        "miss": 1,
+        "hit_ratio": 0.0,
+    }
+
+
+async def test_two_tier_cache_records_family(mocker, memory_redis):
+    record = mocker.patch("task.utils.two_tier_cache.cache_stats.record")
+    cache = TwoTierCache(maxsize=10, ttl=60, family="user")
+    loader = AsyncMock(return_value=b"value")
+
+    await cache.get_or_load("user:1", loader, redis=memory_redis, ttl=300)
+    await cache.get_or_load("user:1", loader, redis=memory_redis, ttl=300)
+    assert [call.args for call in record.call_args_list] == [
+        ("user", "miss"),
+        ("user", "local_hit"),
+    ]
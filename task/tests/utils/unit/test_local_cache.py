@@ -0,0 +1,24 @@
+from task.utils.local_cache import LocalTTLCache
+
+
+def test_lru_eviction():
+    cache = LocalTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(mocker):
+    now = mocker.patch("task.utils.local_cache.time.monotonic", return_value=100.0)
+    cache = LocalTTLCache(maxsize=10, ttl=5)
+    cache.set("a", 1)
+    now.return_value = 104.9
+    assert cache.get("a") == 1
+    now.return_value = 105.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
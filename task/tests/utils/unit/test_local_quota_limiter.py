@@ -0,0 +1,172 @@
+import bisect
+import math
+import random
+from unittest.mock import AsyncMock
+
+import pytest
+
+from task.utils.rate_limiter import LocalQuotaLimiter, RateLimiter, RateLimitRule
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimulatedRedis:
+    """
+    Shared Redis stand-in running the rate limit scripts in Python against a
+    fake clock, so several limiters can play the role of separate workers.
+    """
+
+    def __init__(self, clock: FakeClock):
+        self.clock = clock
+        self.calls = 0
+        self.logs: dict[str, dict[str, float]] = {}
+        self.buckets: dict[str, tuple[float, float]] = {}
+
+    def register_script(self, source: str):
+        if source is RateLimiter.SLIDING_WINDOW_SCRIPT:
+            return self.sliding_window
+        return self.token_bucket
+
+    async def sliding_window(self, keys, args):
+        self.calls += 1
+        limit, window, cost, request_id, release_id, release, offset = args
+        now, window_ms = self.clock.now * 1000, window * 1000
+        log = self.logs.setdefault(keys[0], {})
+        for i in range(offset, offset + release):
+            log.pop(f"{release_id}:{i}", None)
+        for member, score in list(log.items()):
+            if score <= now - window_ms:
+                del log[member]
+        granted = max(0, min(cost, limit - len(log)))
+        for i in range(1, granted + 1):
+            log[f"{request_id}:{i}"] = now
+        reset = min(log.values()) + window_ms - now if log else 0
+        return [granted, limit - len(log), 0 if granted else reset, reset]
+
+    async def token_bucket(self, keys, args):
+        self.calls += 1
+        capacity, window, cost, _, _, release, _ = args
+        now, rate = self.clock.now * 1000, capacity / (window * 1000)
+        tokens, ts = self.buckets.get(keys[0], (capacity, now))
+        tokens = min(capacity, tokens + max(0, now - ts) * rate + release)
+        granted = min(cost, math.floor(tokens))
+        retry_after = 0
+        if granted > 0:
+            tokens -= granted
+        else:
+            retry_after = math.ceil((1 - tokens) / rate)
+        self.buckets[keys[0]] = (tokens, now)
+        return [granted, math.floor(tokens), retry_after, 0]
+
+
+def make_limiter(redis, algorithm, limit, window) -> RateLimiter:
+    return RateLimiter(
+        redis=redis,
+        algorithm=algorithm,
+        default_rule=RateLimitRule(limit=limit, window=window),
+    )
+
+
+def admitted_in_window(admitted: list[float], t: float, window: float) -> int:
+    return bisect.bisect_right(admitted, t) - bisect.bisect_right(admitted, t - window)
+
+
+@pytest.mark.parametrize("algorithm", ["sliding_window", "token_bucket"])
+async def test_error_bound_under_multi_worker_load(algorithm):
+    limit, window, workers, max_error = 100, 10, 4, 0.2
+    bound = max_error * limit
+    clock = FakeClock()
+    shared = SimulatedRedis(clock)
+    local_workers = [
+        LocalQuotaLimiter(
+            make_limiter(shared, algorithm, limit, window),
+            max_error=max_error,
+            workers=workers,
+            sync_interval=0.5,
+            max_keys=100,
+            clock=clock,
+        )
+        for _ in range(workers)
+    ]
+    exact = make_limiter(SimulatedRedis(clock), algorithm, limit, window)
+
+    rng = random.Random(42)
+    arrivals = sorted(rng.uniform(0, 120) for _ in range(3000))
+    approximate_admitted, exact_admitted = [], []
+    for t in arrivals:
+        clock.now = t
+        worker = rng.choice(local_workers)
+        if (await worker.hit("/api/users", "ip:1.2.3.4")).allowed:
+            approximate_admitted.append(t)
+        if (await exact.hit("/api/users", "ip:1.2.3.4")).allowed:
+            exact_admitted.append(t)
+
+    # A full bucket plus one window of refill is what even the exact token
+    # bucket admits within one window.
+    capacity = limit if algorithm == "sliding_window" else 2 * limit
+    for t in approximate_admitted:
+        assert admitted_in_window(approximate_admitted, t, window) <= capacity + bound
+    windows = math.ceil(120 / window)
+    assert len(approximate_admitted) >= len(exact_admitted) - bound * windows
+    assert len(approximate_admitted) <= len(exact_admitted) + bound * windows
+
+
+async def test_common_path_makes_no_network_call():
+    clock = FakeClock()
+    shared = SimulatedRedis(clock)
+    local_workers = [
+        LocalQuotaLimiter(
+            make_limiter(shared, "sliding_window", 1000, 10),
+            max_error=0.2,
+            workers=4,
+            sync_interval=5,
+            max_keys=100,
+            clock=clock,
+        )
+        for _ in range(4)
+    ]
+    rng = random.Random(7)
+    arrivals = sorted(rng.uniform(0, 60) for _ in range(3000))
+    for t in arrivals:
+        clock.now = t
+        assert (await rng.choice(local_workers).hit("/", "ip:1.2.3.4")).allowed
+    assert shared.calls < len(arrivals) / 10
+
+
+async def test_renewal_releases_unused_units():
+    clock = FakeClock()
+    limiter = make_limiter(SimulatedRedis(clock), "sliding_window", 100, 10)
+    limiter.script = AsyncMock(side_effect=limiter.script)
+    local = LocalQuotaLimiter(
+        limiter, max_error=0.2, workers=4, sync_interval=1, max_keys=10, clock=clock
+    )
+
+    for _ in range(2):
+        assert (await local.hit("/", "ip:1.2.3.4")).allowed
+    first_id = limiter.script.await_args.kwargs["args"][3]
+    clock.now = 2
+    assert (await local.hit("/", "ip:1.2.3.4")).allowed
+
+    args = limiter.script.await_args.kwargs["args"]
+    assert args[2] == 5
+    assert args[4:] == [first_id, 3, 3]
+    assert limiter.script.await_count == 2
+
+
+async def test_small_limits_use_exact_mode():
+    clock = FakeClock()
+    limiter = make_limiter(SimulatedRedis(clock), "token_bucket", 10, 60)
+    limiter.script = AsyncMock(side_effect=limiter.script)
+    local = LocalQuotaLimiter(
+        limiter, max_error=0.1, workers=4, sync_interval=1, max_keys=10, clock=clock
+    )
+
+    results = [await local.hit("/", "ip:1.2.3.4") for _ in range(11)]
+    assert [result.allowed for result in results] == [True] * 10 + [False]
+    assert limiter.script.await_count == 11
@@ -0,0 +1,103 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from pydantic import BaseModel
+
+from task.settings.settings import settings
+from task.utils.exceptions import DatabaseException, LineTooLongException
+from task.utils.ndjson import NDJSONImporter, NDJSONReader
+
+
+class Item(BaseModel):
+    name: str
+    value: int
+
+
+async def stream_of(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def test_lines_split_across_chunks():
+    stream = stream_of(b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}')
+    lines = [line async for line in NDJSONReader.lines(stream, max_line_bytes=64)]
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
+
+
+async def test_lines_too_long():
+    stream = stream_of(b'{"a": 1}\n', b"x" * 65)
+    with pytest.raises(LineTooLongException):
+        [line async for line in NDJSONReader.lines(stream, max_line_bytes=64)]
+
+
+async def test_chunks_collect_errors():
+    stream = stream_of(
+        b'{"name": "a", "value": 1}\n'
+        b'{"name": "b", "value": "x"}\n'
+        b"not json\n"
+        b'{"name": "c", "value": 3}\n'
+        b'{"name": "d", "value": 4}\n'
+    )
+    chunks = [
+        chunk
+        async for chunk in NDJSONReader.chunks(
+            stream, model=Item, chunk_size=2, max_line_bytes=1024
+        )
+    ]
+    assert [[line for line, _ in rows] for rows, _ in chunks] == [[1, 4], [5]]
+    errors = chunks[0][1]
+    assert [error.line for error in errors] == [2, 3]
+    assert errors[0].error.startswith("value:")
+
+
+async def test_importer_reports_conflicts_and_db_errors(mocker):
+    mocker.patch.object(settings, "IMPORT_CHUNK_SIZE", 10)
+    stream = stream_of(
+        b'{"name": "a", "value": 1}\n'
+        b'{"name": "a", "value": 2}\n'
+        b'{"name": "b", "value": 3}\n'
+        b'{"name": "c", "value": 4}\n'
+    )
+
+    existing = {"b"}
+
+    async def insert(items):
+        if len(items) > 1 or items[0].name == "c":
+            raise DatabaseException
+        if items[0].name in existing:
+            return []
+        existing.add(items[0].name)
+        return [items[0].name]
+
+    on_inserted = AsyncMock()
+    result = await NDJSONImporter.run(
+        stream,
+        model=Item,
+        insert=insert,
+        key=lambda item: item.name,
+        conflict_error="exists",
+        on_inserted=on_inserted,
+    )
+    assert result.inserted == 1
+    assert result.failed == 3
+    assert [(error.line, error.error) for error in result.errors] == [
+        (4, "Database error"),
+        (2, "exists"),
+        (3, "exists"),
+    ]
+    on_inserted.assert_awaited_once()
+
+
+async def test_importer_truncates_errors(mocker):
+    mocker.patch.object(settings, "IMPORT_MAX_ERRORS", 2)
+    stream = stream_of(b"bad\n" * 5)
+    result = await NDJSONImporter.run(
+        stream,
+        model=Item,
+        insert=AsyncMock(),
+        key=lambda item: item.name,
+        conflict_error="exists",
+    )
+    assert result.failed == 5
+    assert len(result.errors) == 2
+    assert result.errors_truncated
@@ -0,0 +1,17 @@
+import pytest
+
+from task.utils.exceptions import InvalidCursorException
+from task.utils.pagination import CursorUtils
+
+
+def test_cursor_roundtrip():
+    data = {"sort_field": "create_time", "sort_desc": True, "value": None, "id": 42}
+    cursor = CursorUtils.encode(data)
+    assert "=" not in cursor
+    assert CursorUtils.decode(cursor) == data
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor!", "W10", "bm90IGpzb24"])
+def test_cursor_invalid(cursor):
+    with pytest.raises(InvalidCursorException):
+        CursorUtils.decode(cursor)
@@ -0,0 +1,40 @@
+import asyncio
+import time
+
+from task.utils.password_utils import PasswordHasherPool, PasswordUtils
+
+
+async def test_hash_and_verify_async():
+    hashed = await PasswordUtils.hash_password_async("secret")
+    assert hashed != "secret"
+    assert await PasswordUtils.verify_password_async("secret", hashed)
+    assert not await PasswordUtils.verify_password_async("wrong", hashed)
+
+
+async def test_pool_concurrency_cap():
+    pool = PasswordHasherPool(executor="thread", max_workers=4, max_concurrency=2)
+    peak = 0
+
+    def work(value):
+        nonlocal peak
+        peak = max(peak, pool.running)
+        time.sleep(0.02)
+        return value
+
+    try:
+        results = await asyncio.gather(*(pool.run(work, i) for i in range(6)))
+    finally:
+        pool.shutdown()
+    assert results == list(range(6))
+    assert peak <= 2
+    assert pool.max_waiting == 4
+    assert pool.stats()["completed"] == 6
+    assert pool.stats()["waiting"] == 0
+
+
+async def test_hash_passwords_async_keeps_order():
+    passwords = [f"secret{i}" for i in range(5)]
+    hashed = await PasswordUtils.hash_passwords_async(passwords)
+    assert len(hashed) == len(passwords)
+    for password, hashed_password in zip(passwords, hashed):
+        assert PasswordUtils.verify_password(password, hashed_password)
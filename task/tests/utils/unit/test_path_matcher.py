@@ -0,0 +1,20 @@
+from task.utils.path_matcher import PrefixMatcher
+
+
+def test_longest_prefix_wins():
+    matcher = PrefixMatcher(["/api/auth", "/api/auth/login", "/api/users"])
+    assert matcher.match("/api/auth/login/extra") == "/api/auth/login"
+    assert matcher.match("/api/auth/register") == "/api/auth"
+    assert matcher.match("/api/users/all") == "/api/users"
+    assert matcher.match("/api/projects") is None
+    assert matcher.match("/prefix/api/users") is None
+
+
+def test_prefixes_are_literal():
+    matcher = PrefixMatcher(["/api/v1.0"])
+    assert matcher.match("/api/v1.0/items") == "/api/v1.0"
+    assert matcher.match("/api/v1x0/items") is None
+
+
+def test_empty_matcher():
+    assert PrefixMatcher([]).match("/api/users") is None
@@ -0,0 +1,161 @@
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+from redis.exceptions import ConnectionError
+
+from task.utils.rate_limiter import (
+    RateLimiter,
+    RateLimitResult,
+    RateLimitMiddleware,
+    RateLimitRule,
+    client_identity,
+)
+from task.utils.token_utils import TokenUtils
+
+
+def make_limiter(algorithm="sliding_window", script_result=(1, 9, 0, 60000)):
+    script = AsyncMock(return_value=list(script_result))
+    fake_redis = Mock()
+    fake_redis.register_script = Mock(return_value=script)
+    limiter = RateLimiter(
+        redis=fake_redis,
+        algorithm=algorithm,
+        default_rule=RateLimitRule.parse("10/60"),
+        route_rules={
+            "/api/auth": RateLimitRule.parse("5/60"),
+            "/api/auth/login": RateLimitRule.parse("3/60"),
+        },
+        user_rules={"admin": RateLimitRule.parse("1000/60")},
+    )
+    return limiter, fake_redis, script
+
+
+def test_resolve_rules():
+    limiter, _, _ = make_limiter()
+    assert limiter.resolve("/api/users/all", None) == (
+        "*",
+        RateLimitRule.parse("10/60"),
+    )
+    assert limiter.resolve("/api/auth/login", None) == (
+        "/api/auth/login",
+        RateLimitRule.parse("3/60"),
+    )
+    assert limiter.resolve("/api/auth/register", None)[1].limit == 5
+    assert limiter.resolve("/api/auth/login", "admin") == (
+        "/api/auth/login",
+        RateLimitRule.parse("1000/60"),
+    )
+
+
+async def test_hit_runs_one_script_call():
+    limiter, fake_redis, script = make_limiter(script_result=(0, 0, 1500, 1500))
+    assert fake_redis.register_script.call_args.args[0] == (
+        RateLimiter.SLIDING_WINDOW_SCRIPT
+    )
+
+    result = await limiter.hit("/api/auth/login", "ip:1.2.3.4")
+    script.assert_awaited_once()
+    assert script.await_args.kwargs["keys"] == [
+        "rate_limit:sliding_window:/api/auth/login:ip:1.2.3.4"
+    ]
+    assert script.await_args.kwargs["args"][:3] == [3, 60, 1]
+    assert not result.allowed
+    assert result.retry_after == 2
+    assert result.headers() == {
+        "RateLimit-Limit": "3",
+        "RateLimit-Remaining": "0",
+        "RateLimit-Reset": "2",
+        "RateLimit-Policy": "3;w=60",
+        "Retry-After": "2",
+    }
+
+
+def test_token_bucket_script_selected():
+    _, fake_redis, _ = make_limiter(algorithm="token_bucket")
+    assert fake_redis.register_script.call_args.args[0] == (
+        RateLimiter.TOKEN_BUCKET_SCRIPT
+    )
+
+
+def test_client_identity(mocker):
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "secret")
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    assert client_identity(token, None, "1.2.3.4") == ("user:alice", "alice")
+    assert client_identity(None, f"Bearer {token}", "1.2.3.4") == (
+        "user:alice",
+        "alice",
+    )
+    assert client_identity("broken", None, "1.2.3.4") == ("ip:1.2.3.4", None)
+    assert client_identity(None, "Bearer broken", "1.2.3.4") == ("ip:1.2.3.4", None)
+    assert client_identity(None, None, "1.2.3.4") == ("ip:1.2.3.4", None)
+
+
+async def ok_app(scope, receive, send):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain")],
+        }
+    )
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def make_client(limiter) -> httpx.AsyncClient:
+    app = RateLimitMiddleware(ok_app, limiter=limiter)
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+async def test_middleware_adds_headers():
+    result = RateLimitResult(
+        allowed=True, limit=10, remaining=9, reset=60, retry_after=0, policy="10;w=60"
+    )
+    limiter = Mock(hit=AsyncMock(return_value=result))
+
+    async with make_client(limiter) as client:
+        response = await client.get("/api/users/all")
+    assert response.text == "ok"
+    assert response.headers["RateLimit-Remaining"] == "9"
+    assert response.headers["RateLimit-Policy"] == "10;w=60"
+    assert "Retry-After" not in response.headers
+    limiter.hit.assert_awaited_once_with(
+        "/api/users/all", "ip:127.0.0.1", username=None
+    )
+
+
+async def test_middleware_limits_per_user_from_jwt_header(mocker):
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "secret")
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    result = RateLimitResult(
+        allowed=True, limit=10, remaining=9, reset=60, retry_after=0, policy="10;w=60"
+    )
+    limiter = Mock(hit=AsyncMock(return_value=result))
+
+    async with make_client(limiter) as client:
+        await client.get("/api/users/all", headers={"X-JWT-Token": token})
+    limiter.hit.assert_awaited_once_with(
+        "/api/users/all", "user:alice", username="alice"
+    )
+
+
+async def test_middleware_rejects_over_limit():
+    result = RateLimitResult(
+        allowed=False, limit=10, remaining=0, reset=30, retry_after=30, policy="10;w=60"
+    )
+    limiter = Mock(hit=AsyncMock(return_value=result))
+
+    async with make_client(limiter) as client:
+        response = await client.get("/api/users/all")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+async def test_rate_limiter_fails_open():
+    limiter = Mock(hit=AsyncMock(side_effect=ConnectionError))
+
+    async with make_client(limiter) as client:
+        response = await client.get("/api/users/all")
+    assert response.status_code == 200
+    assert "RateLimit-Limit" not in response.headers
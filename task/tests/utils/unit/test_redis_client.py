@@ -0,0 +1,105 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+from redis.asyncio import Redis
+from redis.exceptions import ConnectionError, NoScriptError
+
+from task.settings.settings import settings
+from task.utils.redis_client import (
+    CircuitBreaker,
+    CircuitOpenError,
+    create_pubsub_client,
+    create_redis_client,
+)
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.check()
+        breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+
+def test_breaker_probe_after_reset_timeout(mocker):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now = time.monotonic()
+    mocker.patch("task.utils.redis_client.time.monotonic", return_value=now + 11)
+
+    breaker.check()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    mocker.patch("task.utils.redis_client.time.monotonic", return_value=now + 22)
+    breaker.check()
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.check()
+
+
+async def test_client_trips_breaker_on_connection_errors():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    unreachable = settings.model_copy(
+        update={"REDIS_HOST": "127.0.0.1", "REDIS_PORT": 1, "REDIS_RETRY_ATTEMPTS": 0}
+    )
+    redis = create_redis_client(unreachable, decode_responses=False, breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await redis.get("key")
+    with pytest.raises(CircuitOpenError):
+        await redis.get("key")
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.get("key")
+        with pytest.raises(CircuitOpenError):
+            await pipe.execute()
+    await redis.aclose()
+
+
+async def test_probe_outcomes_never_leave_breaker_stuck(mocker):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    redis = create_redis_client(settings, decode_responses=False, breaker=breaker)
+    command = mocker.patch.object(Redis, "execute_command", AsyncMock())
+    now = time.monotonic()
+    clock = mocker.patch("task.utils.redis_client.time.monotonic", return_value=now)
+
+    command.side_effect = ConnectionError
+    with pytest.raises(ConnectionError):
+        await redis.get("key")
+    assert breaker.is_open
+
+    clock.return_value = now + 11
+    command.side_effect = asyncio.CancelledError
+    with pytest.raises(asyncio.CancelledError):
+        await redis.get("key")
+    assert breaker.is_open
+
+    command.side_effect = NoScriptError
+    with pytest.raises(NoScriptError):
+        await redis.evalsha("sha", 0)
+    assert not breaker.is_open
+
+    command.side_effect = None
+    command.return_value = b"value"
+    assert await redis.get("key") == b"value"
+    await redis.aclose()
+
+
+async def test_pubsub_client_blocks_without_timeout_or_retries():
+    redis = create_pubsub_client(settings)
+    options = redis.connection_pool.connection_kwargs
+
+    assert options["socket_timeout"] is None
+    assert options["socket_keepalive"]
+    assert options["retry"].get_retries() == 0
+    await redis.aclose()
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from task.utils.exceptions import InvalidTokenException
+from task.utils.token_utils import JoseBackend, TokenUtils
+
+
+@pytest.fixture(autouse=True)
+def secret(mocker):
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "secret")
+
+
+def test_repeated_token_is_verified_once(mocker):
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    decode = mocker.spy(JoseBackend, "decode")
+
+    assert TokenUtils.decode_token(token)["sub"] == "alice"
+    assert TokenUtils.decode_token(token)["sub"] == "alice"
+    assert decode.call_count == 1
+
+
+def test_cached_payload_is_not_shared():
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    TokenUtils.decode_token(token)["sub"] = "mallory"
+
+    assert TokenUtils.decode_token(token)["sub"] == "alice"
+
+
+def test_cache_entry_does_not_outlive_exp():
+    exp = int(time.time()) + 2
+    token = JoseBackend.encode({"sub": "alice", "exp": exp}, "secret", "HS256")
+    TokenUtils.decode_token(token)
+
+    ((expires_at, _),) = TokenUtils._verified._data.values()
+    assert expires_at - time.monotonic() <= 2
+
+
+def test_expired_and_forged_tokens_are_rejected_and_not_cached():
+    expired = JoseBackend.encode(
+        {"sub": "alice", "exp": int(time.time()) - 1}, "secret", "HS256"
+    )
+    forged = JoseBackend.encode({"sub": "alice"}, "other", "HS256")
+
+    for token in (expired, forged, "not-a-jwt"):
+        with pytest.raises(InvalidTokenException):
+            TokenUtils.decode_token(token)
+    assert len(TokenUtils._verified) == 0
+
+
+def test_rotated_secret_does_not_hit_cache(mocker):
+    token = TokenUtils.create_access_token({"sub": "alice"})
+    TokenUtils.decode_token(token)
+
+    mocker.patch("task.utils.token_utils.settings.SECRET_KEY", "rotated")
+    with pytest.raises(InvalidTokenException):
+        TokenUtils.decode_token(token)
+
+
+def test_pyjwt_backend_reads_jose_tokens(mocker):
+    pytest.importorskip("jwt")
+    from task.utils.token_utils import PyJWTBackend
+
+    mocker.patch.object(TokenUtils, "backend", PyJWTBackend)
+    token = JoseBackend.encode({"sub": "alice"}, "secret", "HS256")
+
+    assert TokenUtils.decode_token(token)["sub"] == "alice"
+    assert (
+        JoseBackend.decode(
+            TokenUtils.create_access_token({"sub": "bob"}), "secret", "HS256"
+        )["sub"]
+        == "bob"
+    )
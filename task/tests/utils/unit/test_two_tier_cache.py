@@ -0,0 +1,209 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import orjson
+import pytest
+
+from task.utils.two_tier_cache import TwoTierCache
+
+
+async def test_local_hit_skips_redis(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60)
+    loader = AsyncMock(return_value=b"value")
+    await memory_redis.set("key", b"value", ex=300)
+
+    assert (
+        await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"value"
+    )
+    memory_redis.data.clear()
+    assert (
+        await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"value"
+    )
+    loader.assert_not_awaited()
+    assert cache.stats()["local_hits"] == 1
+    assert cache.stats()["remote_hits"] == 1
+
+
+async def test_miss_loads_and_sets_with_stale_window(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60, stale_ttl=30)
+    loader = AsyncMock(return_value=b"value")
+
+    assert (
+        await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"value"
+    )
+    loader.assert_awaited_once()
+    assert 300_000 < await memory_redis.pttl("key") <= 330_000
+    assert await memory_redis.get("lock:key") is None
+    assert cache.stats()["misses"] == 1
+
+
+async def test_concurrent_misses_share_one_load(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return b"value"
+
+    results = await asyncio.gather(
+        *(
+            cache.get_or_load("key", loader, redis=memory_redis, ttl=300)
+            for _ in range(20)
+        )
+    )
+    assert results == [b"value"] * 20
+    assert calls == 1
+
+
+async def test_cancelled_owner_does_not_fail_other_callers(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60)
+    owner_started = asyncio.Event()
+    owner_cancelled = False
+
+    async def owner_loader():
+        nonlocal owner_cancelled
+        owner_started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            owner_cancelled = True
+            raise
+
+    async def waiter_loader():
+        return b"value"
+
+    owner = asyncio.create_task(
+        cache.get_or_load("key", owner_loader, redis=memory_redis, ttl=300)
+    )
+    await owner_started.wait()
+    waiter = asyncio.create_task(
+        cache.get_or_load("key", waiter_loader, redis=memory_redis, ttl=300)
+    )
+    await asyncio.sleep(0)
+    owner.cancel()
+
+    assert await waiter == b"value"
+    assert owner_cancelled
+    with pytest.raises(asyncio.CancelledError):
+        await owner
+    assert await memory_redis.get("lock:key") is None
+
+
+async def test_stale_value_served_while_other_worker_rebuilds(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60, stale_ttl=30)
+    loader = AsyncMock(return_value=b"new")
+    await memory_redis.set("key", b"old", ex=10)
+    await memory_redis.set("lock:key", "other-worker", px=5000)
+
+    assert await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"old"
+    loader.assert_not_awaited()
+    assert cache.stats()["stale_hits"] == 1
+
+
+async def test_stale_value_rebuilt_by_lock_holder(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60, stale_ttl=30)
+    loader = AsyncMock(return_value=b"new")
+    await memory_redis.set("key", b"old", ex=10)
+
+    assert await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"new"
+    assert await memory_redis.get("key") == b"new"
+    assert await memory_redis.get("lock:key") is None
+
+
+async def test_miss_waits_for_other_worker(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60, lock_poll_interval=0.001)
+    loader = AsyncMock(return_value=b"mine")
+    await memory_redis.set("lock:key", "other-worker", px=5000)
+
+    async def other_worker_fills():
+        await asyncio.sleep(0.01)
+        await memory_redis.set("key", b"theirs", ex=300)
+
+    filler = asyncio.create_task(other_worker_fills())
+    assert (
+        await cache.get_or_load("key", loader, redis=memory_redis, ttl=300) == b"theirs"
+    )
+    await filler
+    loader.assert_not_awaited()
+
+
+async def test_set_keeps_stale_window():
+    cache = TwoTierCache(maxsize=10, ttl=60, stale_ttl=30)
+    fake_redis = AsyncMock()
+
+    await cache.set("key", b"value", redis=fake_redis, ttl=300)
+    fake_redis.set.assert_awaited_once_with("key", b"value", ex=330)
+    assert cache.local.get("key") == b"value"
+
+
+async def test_get_many_and_set_many(memory_redis):
+    cache = TwoTierCache(maxsize=10, ttl=60, stale_ttl=30)
+    cache.local.set("a", b"local")
+    await memory_redis.set("b", b"remote", ex=300)
+
+    assert await cache.get_many(["a", "b", "c"], redis=memory_redis) == [
+        b"local",
+        b"remote",
+        None,
+    ]
+    assert cache.stats()["misses"] == 1
+
+    await cache.set_many({"c": b"loaded"}, redis=memory_redis, ttl=300)
+    assert 300_000 < await memory_redis.pttl("c") <= 330_000
+    assert cache.local.get("c") == b"loaded"
+
+
+async def test_delete_publishes_invalidation():
+    cache = TwoTierCache(maxsize=10, ttl=60)
+    other_worker = TwoTierCache(maxsize=10, ttl=60)
+    fake_redis = AsyncMock()
+    await cache.set("user:1", b"value", redis=fake_redis, ttl=300)
+    other_worker.local.set("user:1", b"value")
+
+    await cache.delete("user:1", redis=fake_redis)
+    assert cache.local.get("user:1") is None
+    fake_redis.delete.assert_awaited_once_with("user:1")
+    channel, message = fake_redis.publish.await_args.args
+    assert channel == TwoTierCache.CHANNEL
+
+    TwoTierCache.invalidate_local(orjson.loads(message))
+    assert other_worker.local.get("user:1") is None
+
+
+class FakePubSub:
+    def __init__(self):
+        self.messages = asyncio.Queue()
+        self.subscribe = AsyncMock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def listen(self):
+        while True:
+            yield await self.messages.get()
+
+
+async def test_listen_applies_invalidations():
+    cache = TwoTierCache(maxsize=10, ttl=60)
+    pubsub = FakePubSub()
+    fake_redis = AsyncMock()
+    fake_redis.pubsub = lambda: pubsub
+
+    listener = asyncio.create_task(TwoTierCache.listen(fake_redis))
+    await asyncio.sleep(0)
+    pubsub.subscribe.assert_awaited_once_with(TwoTierCache.CHANNEL)
+    cache.local.set("user:1", b"value")
+    cache.local.set("user:2", b"value")
+    await pubsub.messages.put({"type": "message", "data": orjson.dumps(["user:2"])})
+    await asyncio.sleep(0)
+    listener.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await listener
+
+    assert cache.local.get("user:1") == b"value"
+    assert cache.local.get("user:2") is None
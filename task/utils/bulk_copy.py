@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class BulkLoadResultDTO(BaseModel):
+    inserted: int
+    skipped: list[str]
+
+
+class BulkCopy:
+    @staticmethod
+    async def copy_to_staging(
+        session: AsyncSession,
+        staging_table: str,
+        columns: dict[str, str],
+        records: list[tuple],
+    ) -> None:
+        """
+        CREATE TEMP TABLE <staging_table> (<columns>) ON COMMIT DROP
+        COPY <staging_table> (<columns>) FROM STDIN (FORMAT binary)
+
+        Runs on the session's connection, so the staging table lives exactly
+        as long as the current transaction.
+        """
+        definition = ", ".join(f"{name} {type_}" for name, type_ in columns.items())
+        await session.execute(
+            text(f"CREATE TEMP TABLE {staging_table} ({definition}) ON COMMIT DROP")
+        )
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_table, records=records, columns=list(columns)
+        )
@@ -0,0 +1,126 @@
+import struct
+import zlib
+from typing import Any
+
+import orjson
+
+from task.settings.settings import settings
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+class CacheCodec:
+    """
+    Serializes cache values to bytes prefixed with a 3-byte header: format
+    version, serializer id and compression id. Decoding relies on the header
+    only, so payloads written under another codec configuration stay
+    readable; payloads with an unknown version raise ValueError and should
+    be treated as a cache miss.
+
+    `pack`/`unpack` store already serialized bodies (e.g. JSON responses)
+    untouched apart from compression.
+    """
+
+    VERSION = 1
+    HEADER = struct.Struct("BBB")
+
+    RAW = 0
+    SERIALIZERS = {"orjson": 1, "msgpack": 2}
+    COMPRESSIONS = {"none": 0, "zlib": 1, "zstd": 2, "lz4": 3}
+
+    def __init__(
+        self,
+        serializer: str = "orjson",
+        compression: str = "none",
+        threshold: int = 1024,
+    ):
+        if serializer == "msgpack" and msgpack is None:
+            raise RuntimeError("msgpack cache serializer requires `msgpack`")
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd cache compression requires `zstandard`")
+        if compression == "lz4" and lz4_frame is None:
+            raise RuntimeError("lz4 cache compression requires `lz4`")
+        self.serializer = self.SERIALIZERS[serializer]
+        self.compression = self.COMPRESSIONS[compression]
+        self.threshold = threshold
+
+    @classmethod
+    def from_settings(cls) -> "CacheCodec":
+        return cls(
+            serializer=settings.CACHE_SERIALIZER,
+            compression=settings.CACHE_COMPRESSION,
+            threshold=settings.CACHE_COMPRESSION_THRESHOLD,
+        )
+
+    def dumps(self, value: Any) -> bytes:
+        if self.serializer == self.SERIALIZERS["msgpack"]:
+            body = msgpack.packb(value, default=str)
+        else:
+            body = orjson.dumps(value)
+        return self._encode(self.serializer, body)
+
+    def loads(self, payload: bytes) -> Any:
+        serializer, body = self._decode(payload)
+        try:
+            if serializer == self.SERIALIZERS["orjson"]:
+                return orjson.loads(body)
+            if serializer == self.SERIALIZERS["msgpack"] and msgpack is not None:
+                return msgpack.unpackb(body)
+        except Exception as e:
+            raise ValueError("Unreadable cache payload") from e
+        raise ValueError(f"Unsupported cache serializer {serializer}")
+
+    def pack(self, body: bytes) -> bytes:
+        return self._encode(self.RAW, body)
+
+    def unpack(self, payload: bytes) -> bytes:
+        serializer, body = self._decode(payload)
+        if serializer != self.RAW:
+            raise ValueError("Cache payload is not a raw body")
+        return body
+
+    def _encode(self, serializer: int, body: bytes) -> bytes:
+        compression = self.compression if len(body) >= self.threshold else 0
+        if compression == self.COMPRESSIONS["zlib"]:
+            body = zlib.compress(body)
+        elif compression == self.COMPRESSIONS["zstd"]:
+            body = zstandard.compress(body)
+        elif compression == self.COMPRESSIONS["lz4"]:
+            body = lz4_frame.compress(body)
+        return self.HEADER.pack(self.VERSION, serializer, compression) + body
+
+    def _decode(self, payload: bytes) -> tuple[int, bytes]:
+        if len(payload) < self.HEADER.size:
+            raise ValueError("Cache payload is too short")
+        version, serializer, compression = self.HEADER.unpack_from(payload)
+        if version != self.VERSION:
+            raise ValueError(f"Unsupported cache format version {version}")
+        body = payload[self.HEADER.size :]
+        try:
+            if compression == self.COMPRESSIONS["zlib"]:
+                return serializer, zlib.decompress(body)
+            if compression == self.COMPRESSIONS["zstd"] and zstandard is not None:
+                return serializer, zstandard.decompress(body)
+            if compression == self.COMPRESSIONS["lz4"] and lz4_frame is not None:
+                return serializer, lz4_frame.decompress(body)
+        except Exception as e:
+            raise ValueError("Unreadable cache payload") from e
+        if compression != self.COMPRESSIONS["none"]:
+            raise ValueError(f"Unsupported cache compression {compression}")
+        return serializer, bytes(body)
+
+
+cache_codec = CacheCodec.from_settings()
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from task.settings.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats:
+    """
+    In-process cache counters per key family ("user", "users_page", ...).
+    `record` only bumps a local Counter; `flush` ships everything collected
+    since the previous flush in one pipeline of HINCRBY calls into a hash
+    per time bucket (`stats:cache:<bucket start>`), so the request path
+    never waits on Redis for bookkeeping and the number of stats keys is
+    bounded by the retention window, not by the number of cached ids.
+    """
+
+    KEY_PREFIX = "stats:cache"
+    EVENTS = ("local_hit", "remote_hit", "stale_hit", "miss")
+
+    def __init__(self, bucket: int, retention: int):
+        self.bucket = bucket
+        self.retention = retention
+        self._pending: Counter[str] = Counter()
+
+    def key(self, timestamp: float) -> str:
+        start = int(timestamp) // self.bucket * self.bucket
+        return f"{self.KEY_PREFIX}:{start}"
+
+    def record(self, family: str, event: str) -> None:
+        self._pending[f"{family}:{event}"] += 1
+
+    async def flush(self, redis: Redis) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, Counter()
+        key = self.key(time.time())
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for field, count in pending.items():
+                    pipe.hincrby(key, field, count)
+                pipe.expire(key, self.retention)
+                await pipe.execute()
+        except RedisError:
+            self._pending.update(pending)
+            raise
+
+    async def report(self, redis: Redis, window: int) -> dict[str, dict]:
+        """
+        Sums the buckets covering the last `window` seconds plus the
+        counters not flushed yet by this worker, and returns hits, misses
+        and hit ratio per key family.
+        """
+        now = time.time()
+        buckets = max(1, min(window, self.retention) // self.bucket)
+        async with redis.pipeline(transaction=False) as pipe:
+            for n in range(buckets):
+                pipe.hgetall(self.key(now - n * self.bucket))
+            hashes = await pipe.execute()
+
+        totals: Counter[str] = Counter(self._pending)
+        for fields in hashes:
+            for field, count in fields.items():
+                if isinstance(field, bytes):
+                    field = field.decode()
+                totals[field] += int(count)
+
+        families: dict[str, dict] = {}
+        for field, count in totals.items():
+            family, _, event = field.rpartition(":")
+            families.setdefault(family, dict.fromkeys(self.EVENTS, 0))[event] = count
+        for counters in families.values():
+            hits = (
+                counters["local_hit"] + counters["remote_hit"] + counters["stale_hit"]
+            )
+            total = hits + counters["miss"]
+            counters["hit_ratio"] = round(hits / total, 4) if total else None
+        return families
+
+    async def run(self, redis: Redis, interval: float) -> None:
+        """
+        Flushes every `interval` seconds. Meant to run as a background task
+        for the lifetime of the app; on cancellation the remaining counters
+        are flushed once more.
+        """
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.flush(redis)
+                except RedisError:
+                    logger.warning("Cache stats flush failed")
+        except asyncio.CancelledError:
+            try:
+                await self.flush(redis)
+            except RedisError:
+                logger.warning("Cache stats flush failed")
+            raise
+
+
+cache_stats = CacheStats(
+    bucket=settings.CACHE_STATS_BUCKET,
+    retention=settings.CACHE_STATS_RETENTION,
+)
@@ -4,7 +4,7 @@ from sqlalchemy.orm import DeclarativeBase
 
 from task.settings.settings import settings
 
-engine = create_async_engine(url=settings.db_url, echo=True)
+engine = create_async_engine(url=settings.db_url, **settings.db_engine_options)
 
 local_session = async_sessionmaker(bind=engine, expire_on_commit=False)
 
@@ -1,21 +1,32 @@
 from typing import Annotated
-from fastapi import Depends
+from fastapi import Depends, Request
 from redis.asyncio import Redis
 import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 from task.settings.settings import settings
 from task.utils.database import get_session
+from task.utils.redis_client import (
+    CircuitBreaker,
+    create_pubsub_client,
+    create_redis_client,
+)
 
 
-redis_client: Redis = Redis.from_url(
-    url=settings.redis_cache_url,
-    decode_responses=True,
+redis_breaker = CircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.REDIS_BREAKER_RESET_TIMEOUT,
+)
+redis_client: Redis = create_redis_client(
+    settings, decode_responses=True, breaker=redis_breaker
 )
+redis_binary_client: Redis = create_redis_client(
+    settings, decode_responses=False, breaker=redis_breaker
+)
+redis_pubsub_client: Redis = create_pubsub_client(settings)
 
 
-async def httpx_client():
-    async with httpx.AsyncClient() as client:
-        yield client
+async def httpx_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
 
 
 async def get_redis():
@@ -25,6 +36,14 @@ async def get_redis():
         pass
 
 
+async def get_binary_redis():
+    try:
+        yield redis_binary_client
+    finally:
+        pass
+
+
 SessionDependency = Annotated[AsyncSession, Depends(get_session)]
 RedisDependency = Annotated[Redis, Depends(get_redis)]
+BinaryRedisDependency = Annotated[Redis, Depends(get_binary_redis)]
 HttpClientDependency = Annotated[httpx.AsyncClient, Depends(httpx_client)]
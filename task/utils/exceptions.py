@@ -25,6 +25,29 @@ class DatabaseException(BaseException):
         )
 
 
+class BatchTooLargeException(BaseException):
+    def __init__(self, max_size: int):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Batch is too large, max size is {max_size}",
+        )
+
+
+class LineTooLongException(BaseException):
+    def __init__(self, line: int):
+        super().__init__(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Line {line} is too long",
+        )
+
+
+class InvalidCursorException(BaseException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
 class AuthException(BaseException):
     pass
 
@@ -1,7 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from sqlalchemy import text
 
-from task.utils.dependencies import SessionDependency
+from task.settings.settings import settings
+from task.utils.cache_stats import cache_stats
+from task.utils.dependencies import BinaryRedisDependency, SessionDependency
+from task.utils.password_utils import PasswordUtils
+from task.utils.two_tier_cache import TwoTierCache
 
 
 healthcheck_router = APIRouter(prefix="/healthcheck", tags=["healthcheck"])
@@ -20,3 +24,21 @@ async def healthcheck_db(session: SessionDependency):
             "status": "error",
             "message": str(e),
         }
+
+
+@healthcheck_router.get("/password-hasher", tags=["healthcheck"])
+async def password_hasher_stats():
+    return PasswordUtils.pool.stats()
+
+
+@healthcheck_router.get("/local-cache", tags=["healthcheck"])
+async def local_cache_stats():
+    return [cache.stats() for cache in TwoTierCache.instances]
+
+
+@healthcheck_router.get("/cache-stats", tags=["healthcheck"])
+async def cache_hit_ratio(
+    redis: BinaryRedisDependency,
+    window: int = Query(default=3600, ge=1, le=settings.CACHE_STATS_RETENTION),
+):
+    return await cache_stats.report(redis, window=window)
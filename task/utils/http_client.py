@@ -0,0 +1,36 @@
+import importlib.util
+import logging
+
+import httpx
+
+from task.settings.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+def create_http_client(settings: Settings) -> httpx.AsyncClient:
+    """
+    Builds the client shared by all outbound calls for the lifetime of the
+    app, so keep-alive connections are reused instead of paying a TCP and
+    TLS handshake per request. Connect failures are retried
+    HTTP_CLIENT_RETRIES times by the transport. HTTP/2 needs the optional
+    `h2` package and is silently downgraded to HTTP/1.1 without it.
+    """
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("h2 is not installed, outbound calls use HTTP/1.1")
+        http2 = False
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_CLIENT_READ_TIMEOUT,
+        connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+        pool=settings.HTTP_CLIENT_POOL_TIMEOUT,
+    )
+    transport = httpx.AsyncHTTPTransport(
+        limits=limits, http2=http2, retries=settings.HTTP_CLIENT_RETRIES
+    )
+    return httpx.AsyncClient(transport=transport, timeout=timeout)
@@ -0,0 +1,154 @@
+from collections import Counter
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from task.settings.settings import settings
+from task.utils.exceptions import DatabaseException, LineTooLongException
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class ImportRowErrorDTO(BaseModel):
+    line: int
+    error: str
+
+
+class ImportResultDTO(BaseModel):
+    inserted: int = 0
+    failed: int = 0
+    errors: list[ImportRowErrorDTO] = []
+    errors_truncated: bool = False
+
+    def add_error(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.IMPORT_MAX_ERRORS:
+            self.errors.append(ImportRowErrorDTO(line=line, error=error))
+        else:
+            self.errors_truncated = True
+
+
+class NDJSONReader:
+    @staticmethod
+    async def lines(
+        stream: AsyncIterator[bytes], max_line_bytes: int
+    ) -> AsyncIterator[tuple[int, bytes]]:
+        buffer = b""
+        line_number = 0
+        async for chunk in stream:
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                line_number += 1
+                if line.strip():
+                    yield line_number, line
+            if len(buffer) > max_line_bytes:
+                raise LineTooLongException(line_number + 1)
+        if buffer.strip():
+            yield line_number + 1, buffer
+
+    @classmethod
+    async def chunks(
+        cls,
+        stream: AsyncIterator[bytes],
+        model: type[ModelT],
+        chunk_size: int,
+        max_line_bytes: int,
+    ) -> AsyncIterator[tuple[list[tuple[int, ModelT]], list[ImportRowErrorDTO]]]:
+        """
+        Validates NDJSON lines against `model` and yields them in chunks of
+        at most `chunk_size` valid rows, together with the errors of the
+        invalid lines met since the previous chunk.
+        """
+        rows: list[tuple[int, ModelT]] = []
+        errors: list[ImportRowErrorDTO] = []
+        async for line_number, line in cls.lines(stream, max_line_bytes):
+            try:
+                rows.append((line_number, model.model_validate_json(line)))
+            except ValidationError as e:
+                error = e.errors()[0]
+                location = ".".join(str(part) for part in error["loc"])
+                message = f"{location}: {error['msg']}" if location else error["msg"]
+                errors.append(ImportRowErrorDTO(line=line_number, error=message))
+            if len(rows) >= chunk_size:
+                yield rows, errors
+                rows, errors = [], []
+        if rows or errors:
+            yield rows, errors
+
+
+class NDJSONImporter:
+    @classmethod
+    async def run(
+        cls,
+        stream: AsyncIterator[bytes],
+        model: type[ModelT],
+        insert: Callable[[list[ModelT]], Awaitable[list[str]]],
+        key: Callable[[ModelT], str],
+        conflict_error: str,
+        prepare: Callable[[list[ModelT]], Awaitable[None]] | None = None,
+        on_inserted: Callable[[list[ModelT]], Awaitable[None]] | None = None,
+    ) -> ImportResultDTO:
+        """
+        Streams `model` rows from an NDJSON body into the database chunk by
+        chunk. `insert` must skip conflicting rows and return the keys of the
+        inserted ones; rows whose key is not returned are reported as
+        `conflict_error`. Only one chunk is held in memory at a time.
+        """
+        result = ImportResultDTO()
+        async for rows, errors in NDJSONReader.chunks(
+            stream,
+            model=model,
+            chunk_size=settings.IMPORT_CHUNK_SIZE,
+            max_line_bytes=settings.IMPORT_MAX_LINE_BYTES,
+        ):
+            for error in errors:
+                result.add_error(error.line, error.error)
+            if not rows:
+                continue
+            if prepare:
+                await prepare([item for _, item in rows])
+            inserted = await cls._insert_chunk(
+                rows,
+                insert=insert,
+                key=key,
+                conflict_error=conflict_error,
+                result=result,
+            )
+            result.inserted += len(inserted)
+            if inserted and on_inserted:
+                await on_inserted(inserted)
+        return result
+
+    @classmethod
+    async def _insert_chunk(
+        cls,
+        rows: list[tuple[int, ModelT]],
+        insert: Callable[[list[ModelT]], Awaitable[list[str]]],
+        key: Callable[[ModelT], str],
+        conflict_error: str,
+        result: ImportResultDTO,
+    ) -> list[ModelT]:
+        failed_lines = set()
+        try:
+            keys = await insert([item for _, item in rows])
+        except DatabaseException:
+            keys = []
+            for line, item in rows:
+                try:
+                    keys += await insert([item])
+                except DatabaseException:
+                    failed_lines.add(line)
+                    result.add_error(line, "Database error")
+
+        remaining = Counter(keys)
+        inserted = []
+        for line, item in rows:
+            if line in failed_lines:
+                continue
+            if remaining[key(item)]:
+                remaining[key(item)] -= 1
+                inserted.append(item)
+            else:
+                result.add_error(line, conflict_error)
+        return inserted
@@ -0,0 +1,29 @@
+import base64
+import binascii
+import json
+from enum import Enum
+
+from task.utils.exceptions import InvalidCursorException
+
+
+class PaginationMode(Enum):
+    PAGE = "page"
+    CURSOR = "cursor"
+
+
+class CursorUtils:
+    @staticmethod
+    def encode(data: dict) -> str:
+        raw = json.dumps(data, separators=(",", ":"), default=str).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> dict:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursorException
+        if not isinstance(data, dict):
+            raise InvalidCursorException
+        return data
@@ -1,13 +1,138 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
 from passlib.context import CryptContext
 
+from task.settings.settings import settings
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_password(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHasherPool:
+    """
+    Runs bcrypt off the event loop on a thread or process pool. At most
+    `max_concurrency` calls are handed to the pool at once, the rest wait on
+    a semaphore and are reported as `waiting`.
+    """
+
+    def __init__(self, executor: str, max_workers: int, max_concurrency: int):
+        self.executor_type = executor
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.completed = 0
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, func, *args
+            )
+        finally:
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "completed": self.completed,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
 class PasswordUtils:
+    pool = PasswordHasherPool(
+        executor=settings.PASSWORD_HASH_EXECUTOR,
+        max_workers=settings.PASSWORD_HASH_WORKERS,
+        max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+    )
+    bulk_pool = PasswordHasherPool(
+        executor="process",
+        max_workers=settings.PASSWORD_HASH_BULK_WORKERS or os.cpu_count() or 1,
+        max_concurrency=settings.PASSWORD_HASH_BULK_WORKERS or os.cpu_count() or 1,
+    )
+
     @staticmethod
     def hash_password(password: str) -> str:
-        return pwd_context.hash(password)
+        return _hash_password(password)
 
     @staticmethod
     def verify_password(password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(password, hashed_password)
+        return _verify_password(password, hashed_password)
+
+    @classmethod
+    async def hash_password_async(cls, password: str) -> str:
+        return await cls.pool.run(_hash_password, password)
+
+    @classmethod
+    async def verify_password_async(cls, password: str, hashed_password: str) -> bool:
+        return await cls.pool.run(_verify_password, password, hashed_password)
+
+    @classmethod
+    async def hash_passwords_async(cls, passwords: list[str]) -> list[str]:
+        chunk_size = max(1, -(-len(passwords) // (cls.bulk_pool.max_workers * 4)))
+        chunks = [
+            passwords[i : i + chunk_size] for i in range(0, len(passwords), chunk_size)
+        ]
+        hashed_chunks = await asyncio.gather(
+            *(cls.bulk_pool.run(_hash_passwords, chunk) for chunk in chunks)
+        )
+        return [hashed for chunk in hashed_chunks for hashed in chunk]
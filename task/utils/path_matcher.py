@@ -0,0 +1,23 @@
+import re
+
+
+class PrefixMatcher:
+    """
+    Matches a path against a set of prefixes with one precompiled regex
+    instead of a startswith scan per prefix. Alternatives are ordered
+    longest first, so the longest matching prefix is returned.
+    """
+
+    def __init__(self, prefixes: list[str]):
+        self.prefixes = sorted(set(prefixes), key=len, reverse=True)
+        self._pattern = (
+            re.compile("|".join(re.escape(prefix) for prefix in self.prefixes))
+            if self.prefixes
+            else None
+        )
+
+    def match(self, path: str) -> str | None:
+        if self._pattern is None:
+            return None
+        match = self._pattern.match(path)
+        return match.group() if match else None
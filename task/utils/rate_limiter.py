@@ -1,23 +1,448 @@
-from fastapi import Request
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Literal
+from uuid import uuid4
+
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from task.settings.settings import Settings, settings
 from task.utils.dependencies import redis_client
+from task.utils.exceptions import InvalidTokenException
+from task.utils.local_cache import LocalTTLCache
+from task.utils.path_matcher import PrefixMatcher
+from task.utils.redis_client import CircuitOpenError
+from task.utils.token_utils import TokenUtils
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitRule(BaseModel):
+    limit: int
+    window: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimitRule":
+        """Parses "<requests>/<seconds>", e.g. "10/60"."""
+        limit, window = value.split("/")
+        return cls(limit=int(limit), window=int(window))
+
+    @property
+    def policy(self) -> str:
+        return f"{self.limit};w={self.window}"
+
+
+class RateLimitResult(BaseModel):
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+    policy: str
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "RateLimit-Limit": str(self.limit),
+            "RateLimit-Remaining": str(self.remaining),
+            "RateLimit-Reset": str(self.reset),
+            "RateLimit-Policy": self.policy,
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class RateLimiter:
+    """
+    Redis-backed rate limiter. Every check is one EVALSHA of a Lua script
+    that reads the clock with TIME, updates the state and sets its TTL
+    atomically, so concurrent workers agree and no key is left without an
+    expiry.
+
+    Both scripts take (limit, window, cost, request id, release id, release
+    count, release offset), grant up to `cost` units and return {granted,
+    remaining, retry_after_ms, reset_ms}. Units reserved earlier under the
+    release id and left unused are given back first, in the same call;
+    LocalQuotaLimiter relies on that.
+
+    token_bucket   - `limit` tokens refilled evenly over `window` seconds;
+                     allows bursts up to `limit`. One hash per client.
+    sliding_window - a sorted set log of the request times of the last
+                     `window` seconds; exact, but memory grows with `limit`.
+
+    The rule for a request is, in order: the caller's entry in
+    RATE_LIMIT_USERS, the longest RATE_LIMIT_ROUTES prefix of the path,
+    RATE_LIMIT_DEFAULT. Each route prefix has its own counters.
+    """
+
+    KEY_PREFIX = "rate_limit"
+    TOKEN_BUCKET_SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local window_ms = tonumber(ARGV[2]) * 1000
+    local cost = tonumber(ARGV[3])
+    local release = tonumber(ARGV[6])
+    local time = redis.call("TIME")
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    local rate = capacity / window_ms
+
+    local state = redis.call("HMGET", KEYS[1], "tokens", "ts")
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + release)
+
+    local granted = math.min(cost, math.floor(tokens))
+    local retry_after = 0
+    if granted > 0 then
+        tokens = tokens - granted
+    else
+        granted = 0
+        retry_after = math.ceil((1 - tokens) / rate)
+    end
+    redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+    redis.call("PEXPIRE", KEYS[1], window_ms)
+    return {granted, math.floor(tokens), retry_after, math.ceil((capacity - tokens) / rate)}
+    """
+    SLIDING_WINDOW_SCRIPT = """
+    local limit = tonumber(ARGV[1])
+    local window_ms = tonumber(ARGV[2]) * 1000
+    local cost = tonumber(ARGV[3])
+    local release = tonumber(ARGV[6])
+    local time = redis.call("TIME")
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+
+    for i = tonumber(ARGV[7]), tonumber(ARGV[7]) + release - 1 do
+        redis.call("ZREM", KEYS[1], ARGV[5] .. ":" .. i)
+    end
+    redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now - window_ms)
+    local count = redis.call("ZCARD", KEYS[1])
+    local granted = math.max(0, math.min(cost, limit - count))
+    for i = 1, granted do
+        redis.call("ZADD", KEYS[1], now, ARGV[4] .. ":" .. i)
+    end
+    count = count + granted
+    redis.call("PEXPIRE", KEYS[1], window_ms)
+
+    local reset = 0
+    local oldest = redis.call("ZRANGE", KEYS[1], 0, 0, "WITHSCORES")
+    if oldest[2] then
+        reset = tonumber(oldest[2]) + window_ms - now
+    end
+    local retry_after = 0
+    if granted == 0 then
+        retry_after = reset
+    end
+    return {granted, limit - count, retry_after, reset}
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        algorithm: Literal["token_bucket", "sliding_window"],
+        default_rule: RateLimitRule,
+        route_rules: dict[str, RateLimitRule] | None = None,
+        user_rules: dict[str, RateLimitRule] | None = None,
+    ):
+        self.algorithm = algorithm
+        self.default_rule = default_rule
+        self.route_rules = route_rules or {}
+        self.route_matcher = PrefixMatcher(list(self.route_rules))
+        self.user_rules = user_rules or {}
+        self.script = redis.register_script(
+            self.TOKEN_BUCKET_SCRIPT
+            if algorithm == "token_bucket"
+            else self.SLIDING_WINDOW_SCRIPT
+        )
+
+    @classmethod
+    def from_settings(cls, redis: Redis, settings: Settings) -> "RateLimiter":
+        return cls(
+            redis=redis,
+            algorithm=settings.RATE_LIMIT_ALGORITHM,
+            default_rule=RateLimitRule.parse(settings.RATE_LIMIT_DEFAULT),
+            route_rules={
+                prefix: RateLimitRule.parse(rule)
+                for prefix, rule in settings.RATE_LIMIT_ROUTES.items()
+            },
+            user_rules={
+                username: RateLimitRule.parse(rule)
+                for username, rule in settings.RATE_LIMIT_USERS.items()
+            },
+        )
+
+    def resolve(self, path: str, username: str | None) -> tuple[str, RateLimitRule]:
+        """Returns the counter scope and the rule that apply to a request."""
+        prefix = self.route_matcher.match(path)
+        if prefix is None:
+            scope, rule = "*", self.default_rule
+        else:
+            scope, rule = prefix, self.route_rules[prefix]
+        if username is not None and username in self.user_rules:
+            rule = self.user_rules[username]
+        return scope, rule
+
+    def key(self, scope: str, identity: str) -> str:
+        return f"{self.KEY_PREFIX}:{self.algorithm}:{scope}:{identity}"
+
+    async def acquire(
+        self,
+        key: str,
+        rule: RateLimitRule,
+        cost: int = 1,
+        request_id: str | None = None,
+        release: tuple[str, int, int] | None = None,
+    ) -> tuple[int, RateLimitResult]:
+        """
+        Reserves up to `cost` units under `key` and returns how many were
+        granted. `release` is (request id, count, offset) of units reserved
+        by an earlier call that were not used.
+        """
+        release_id, release_count, release_offset = release or ("", 0, 1)
+        granted, remaining, retry_after_ms, reset_ms = await self.script(
+            keys=[key],
+            args=[
+                rule.limit,
+                rule.window,
+                cost,
+                request_id or uuid4().hex,
+                release_id,
+                release_count,
+                release_offset,
+            ],
+        )
+        return granted, RateLimitResult(
+            allowed=granted > 0,
+            limit=rule.limit,
+            remaining=max(0, remaining),
+            reset=math.ceil(reset_ms / 1000),
+            retry_after=math.ceil(retry_after_ms / 1000),
+            policy=rule.policy,
+        )
+
+    async def hit(
+        self, path: str, identity: str, username: str | None = None
+    ) -> RateLimitResult:
+        scope, rule = self.resolve(path, username)
+        _, result = await self.acquire(self.key(scope, identity), rule)
+        return result
+
+
+class QuotaLease:
+    """Units reserved from Redis by one worker for one rate limit key."""
+
+    __slots__ = ("id", "granted", "used", "expires_at", "blocked_until", "result")
+
+    def __init__(
+        self,
+        id: str,
+        granted: int,
+        expires_at: float,
+        blocked_until: float,
+        result: RateLimitResult,
+    ):
+        self.id = id
+        self.granted = granted
+        self.used = 0
+        self.expires_at = expires_at
+        self.blocked_until = blocked_until
+        self.result = result
+
+    @property
+    def unused(self) -> int:
+        return self.granted - self.used
+
+    def take(self) -> RateLimitResult:
+        self.used += 1
+        return self.result.model_copy(
+            update={"remaining": self.result.remaining + self.unused}
+        )
+
+
+class LocalQuotaLimiter:
+    """
+    Approximate mode of RateLimiter. Each worker reserves a batch of units
+    from Redis and admits requests from it in memory, so most requests make
+    no network call. A lease is renewed when it is used up or
+    `sync_interval` seconds old, whichever comes first; the renewal returns
+    the unused units of the old lease in the same script call. A denied
+    worker refuses locally until retry_after, at most `sync_interval`.
+
+    The batch is max_error * limit / workers units, so the units held by
+    all workers at any moment, and with them the over- or under-admission
+    versus the exact mode within one window, stay under max_error * limit.
+    `workers` is the number of processes sharing the limit. A batch of 1
+    falls back to the exact mode.
+    """
+
+    def __init__(
+        self,
+        limiter: RateLimiter,
+        max_error: float,
+        workers: int,
+        sync_interval: float,
+        max_keys: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limiter = limiter
+        self.max_error = max_error
+        self.workers = workers
+        self.sync_interval = sync_interval
+        self.clock = clock
+        # Expired leases are kept for a whole window so that their unused
+        # units can still be released on the next renewal.
+        windows = [rule.window for rule in limiter.route_rules.values()]
+        windows += [rule.window for rule in limiter.user_rules.values()]
+        self.leases = LocalTTLCache(
+            maxsize=max_keys, ttl=max([limiter.default_rule.window, *windows])
+        )
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def batch_size(self, rule: RateLimitRule) -> int:
+        return max(1, int(rule.limit * self.max_error / self.workers))
+
+    async def hit(
+        self, path: str, identity: str, username: str | None = None
+    ) -> RateLimitResult:
+        scope, rule = self.limiter.resolve(path, username)
+        batch = self.batch_size(rule)
+        if batch == 1:
+            return await self.limiter.hit(path, identity, username=username)
+        key = self.limiter.key(scope, identity)
+        lease = self.leases.get(key)
+        for _ in range(2):
+            now = self.clock()
+            if lease is not None and now < lease.expires_at:
+                if lease.unused > 0:
+                    return lease.take()
+                if now < lease.blocked_until:
+                    return lease.result
+            future = self._inflight.get(key)
+            if future is None:
+                future = asyncio.ensure_future(self._renew(key, rule, batch, lease))
+                self._inflight[key] = future
+                future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            lease = await asyncio.shield(future)
+            if lease.unused > 0:
+                return lease.take()
+            if not lease.granted:
+                return lease.result
+        # Concurrent requests drained the fresh leases first.
+        return await self.limiter.hit(path, identity, username=username)
+
+    async def _renew(
+        self, key: str, rule: RateLimitRule, batch: int, lease: QuotaLease | None
+    ) -> QuotaLease:
+        release = None
+        if lease is not None and lease.unused > 0:
+            release = (lease.id, lease.unused, lease.used + 1)
+        request_id = uuid4().hex
+        granted, result = await self.limiter.acquire(
+            key, rule, cost=batch, request_id=request_id, release=release
+        )
+        now = self.clock()
+        blocked_until = now
+        if not granted:
+            blocked_until = now + min(result.retry_after, self.sync_interval)
+        lease = QuotaLease(
+            id=request_id,
+            granted=granted,
+            expires_at=now + self.sync_interval,
+            blocked_until=blocked_until,
+            result=result,
+        )
+        self.leases.set(key, lease)
+        return lease
+
+
+def client_identity(
+    jwt_token: str | None, authorization: str | None, client_host: str
+) -> tuple[str, str | None]:
+    """
+    Requests with a valid token, sent as X-JWT-Token (what `get_current_user`
+    reads) or as a bearer Authorization header, are limited per user, the
+    others per client address.
+    """
+    if not jwt_token and authorization and authorization.startswith("Bearer "):
+        jwt_token = authorization[7:]
+    if jwt_token:
+        try:
+            username = TokenUtils.decode_token(jwt_token).get("sub")
+        except InvalidTokenException:
+            username = None
+        if username:
+            return f"user:{username}", username
+    return f"ip:{client_host}", None
+
+
+rate_limiter = RateLimiter.from_settings(redis_client, settings)
+if settings.RATE_LIMIT_MODE == "approximate":
+    rate_limiter = LocalQuotaLimiter(
+        rate_limiter,
+        max_error=settings.RATE_LIMIT_LOCAL_MAX_ERROR,
+        workers=settings.RATE_LIMIT_LOCAL_WORKERS,
+        sync_interval=settings.RATE_LIMIT_LOCAL_SYNC_INTERVAL,
+        max_keys=settings.RATE_LIMIT_LOCAL_MAX_KEYS,
+    )
+
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware applying `limiter` to every HTTP request. The
+    RateLimit-* headers are added to the response start message, so
+    response bodies, streamed ones included, pass through untouched.
+    Without Redis requests are let through.
+    """
+
+    def __init__(
+        self, app: ASGIApp, limiter: RateLimiter | LocalQuotaLimiter | None = None
+    ):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        jwt_token = headers.get(b"x-jwt-token")
+        authorization = headers.get(b"authorization")
+        client = scope.get("client")
+        identity, username = client_identity(
+            jwt_token.decode() if jwt_token else None,
+            authorization.decode() if authorization else None,
+            client[0] if client else "unknown",
+        )
+        limiter = self.limiter or rate_limiter
+        try:
+            result = await limiter.hit(scope["path"], identity, username=username)
+        except RedisError as e:
+            if not isinstance(e, CircuitOpenError):
+                logger.warning("Rate limiter disabled, Redis error: %r", e)
+            await self.app(scope, receive, send)
+            return
+
+        if not result.allowed:
+            response = JSONResponse(
+                status_code=429,
+                content={"detail": "Too many requests"},
+                headers=result.headers(),
+            )
+            await response(scope, receive, send)
+            return
+
+        headers = [
+            (name.lower().encode(), value.encode())
+            for name, value in result.headers().items()
+        ]
 
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
 
-async def rate_limiter_middleware(
-    request: Request,
-    call_next,
-):
-    redis = redis_client
-    max_requests = 10
-    time_window = 60
-    client_ip = request.client.host
-    key = f"rate_limit:{client_ip}"
-    current = await redis.incr(key)
-    if current == 1:
-        await redis.expire(key, time_window)
-
-    if current > max_requests:
-        return JSONResponse(status_code=429, content={"detail": "Too many requests"})
-
-    response = await call_next(request)
-    return response
+        await self.app(scope, receive, send_with_headers)
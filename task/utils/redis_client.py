@@ -0,0 +1,170 @@
+import logging
+import time
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialWithJitterBackoff, NoBackoff
+from redis.exceptions import ConnectionError, RedisError, TimeoutError
+
+from task.settings.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling Redis while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive connection errors or
+    timeouts and then fails every call immediately for `reset_timeout`
+    seconds. After that a single probe call is let through: its success
+    closes the breaker, its failure opens it again. Any other Redis error
+    (NOSCRIPT, WRONGTYPE, ...) proves the server is reachable and counts
+    as a success; a probe that ends without an outcome (cancellation)
+    just lets the next call probe again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def check(self) -> bool:
+        """Raises while open; returns True when the caller is the probe."""
+        if self.opened_at is None:
+            return False
+        if self._probing or time.monotonic() - self.opened_at < self.reset_timeout:
+            raise CircuitOpenError("Redis circuit breaker is open")
+        self._probing = True
+        return True
+
+    def end_probe(self) -> None:
+        self._probing = False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Redis circuit breaker closed")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Redis circuit breaker opened")
+            self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class BreakerPipeline(Pipeline):
+    def __init__(self, breaker: CircuitBreaker, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    async def execute(self, raise_on_error: bool = True):
+        probe = self.breaker.check()
+        try:
+            result = await super().execute(raise_on_error=raise_on_error)
+        except (ConnectionError, TimeoutError):
+            self.breaker.record_failure()
+            raise
+        except RedisError:
+            self.breaker.record_success()
+            raise
+        finally:
+            if probe:
+                self.breaker.end_probe()
+        self.breaker.record_success()
+        return result
+
+
+class BreakerRedis(Redis):
+    """Redis client whose commands and pipelines go through a CircuitBreaker."""
+
+    def __init__(self, *args, breaker: CircuitBreaker, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    async def execute_command(self, *args, **options):
+        probe = self.breaker.check()
+        try:
+            result = await super().execute_command(*args, **options)
+        except (ConnectionError, TimeoutError):
+            self.breaker.record_failure()
+            raise
+        except RedisError:
+            self.breaker.record_success()
+            raise
+        finally:
+            if probe:
+                self.breaker.end_probe()
+        self.breaker.record_success()
+        return result
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None):
+        return BreakerPipeline(
+            self.breaker,
+            self.connection_pool,
+            self.response_callbacks,
+            transaction,
+            shard_hint,
+        )
+
+
+def create_redis_client(
+    settings: Settings, decode_responses: bool, breaker: CircuitBreaker
+) -> BreakerRedis:
+    """
+    Builds a client on a bounded blocking pool: at most REDIS_MAX_CONNECTIONS
+    connections, waiting up to REDIS_POOL_TIMEOUT for a free one. Socket
+    timeouts keep a stalled server from holding requests, and connection
+    errors are retried REDIS_RETRY_ATTEMPTS times with jittered exponential
+    backoff before they count against the breaker.
+    """
+    pool = BlockingConnectionPool.from_url(
+        settings.redis_cache_url,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        retry=Retry(
+            ExponentialWithJitterBackoff(
+                cap=settings.REDIS_RETRY_BACKOFF_CAP,
+                base=settings.REDIS_RETRY_BACKOFF_BASE,
+            ),
+            retries=settings.REDIS_RETRY_ATTEMPTS,
+        ),
+        retry_on_error=[ConnectionError, TimeoutError],
+        decode_responses=decode_responses,
+    )
+    return BreakerRedis(connection_pool=pool, breaker=breaker)
+
+
+def create_pubsub_client(settings: Settings) -> Redis:
+    """
+    Builds a client for long-lived subscriptions. Reads block without a
+    socket timeout, since an idle channel is not an error, and dead
+    connections are caught by TCP keepalive and the health check PING.
+    Errors are not retried, so the subscriber sees every disconnect and
+    can resync (clear what it may have missed) before resubscribing.
+    """
+    return Redis.from_url(
+        settings.redis_cache_url,
+        socket_timeout=None,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        retry=Retry(NoBackoff(), retries=0),
+        decode_responses=False,
+    )
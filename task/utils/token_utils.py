@@ -1,37 +1,108 @@
+import hashlib
+import time
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+
+from jose import JWTError
+from jose import jwt as jose_jwt
 
 from task.settings.settings import settings
 from task.utils.exceptions import InvalidTokenException
+from task.utils.local_cache import LocalTTLCache
 
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
+
+
+class JoseBackend:
+    errors = (JWTError,)
+
+    @staticmethod
+    def encode(claims: dict, key: str, algorithm: str) -> str:
+        return jose_jwt.encode(claims, key=key, algorithm=algorithm)
+
+    @staticmethod
+    def decode(token: str, key: str, algorithm: str) -> dict:
+        return jose_jwt.decode(token, key=key, algorithms=[algorithm])
+
+
+class PyJWTBackend:
+    errors = (pyjwt.PyJWTError,) if pyjwt else ()
+
+    @staticmethod
+    def encode(claims: dict, key: str, algorithm: str) -> str:
+        return pyjwt.encode(claims, key=key, algorithm=algorithm)
 
-class TokenUtils:
     @staticmethod
-    def create_access_token(data: dict, expires_minutes: int = 30):
+    def decode(token: str, key: str, algorithm: str) -> dict:
+        return pyjwt.decode(token, key=key, algorithms=[algorithm])
+
+
+def jwt_backend(name: str) -> type[JoseBackend] | type[PyJWTBackend]:
+    if name == "pyjwt":
+        if pyjwt is None:
+            raise RuntimeError("pyjwt JWT backend requires `PyJWT`")
+        return PyJWTBackend
+    return JoseBackend
+
+
+class TokenUtils:
+    """
+    Issues and verifies JWTs through the backend selected by JWT_BACKEND.
+
+    Verified payloads are kept in a per-worker LRU keyed by a SHA-256 digest
+    of the signing key and the token, so a client repeating the same token
+    skips signature checking and JSON parsing. An entry never outlives the
+    token's `exp` (nor JWT_CACHE_TTL), and failed verifications are not
+    cached.
+    """
+
+    backend = jwt_backend(settings.JWT_BACKEND)
+    _verified = LocalTTLCache(
+        maxsize=settings.JWT_CACHE_SIZE, ttl=settings.JWT_CACHE_TTL
+    )
+
+    @classmethod
+    def create_access_token(cls, data: dict, expires_minutes: int = 30):
         expire = datetime.now() + timedelta(minutes=expires_minutes)
         to_encode = data.copy()
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(
+        encoded_jwt = cls.backend.encode(
             to_encode, key=settings.SECRET_KEY, algorithm=settings.ALG
         )
         return encoded_jwt
 
-    @staticmethod
-    def create_refresh_token(data: dict, expires_days: int = 14):
+    @classmethod
+    def create_refresh_token(cls, data: dict, expires_days: int = 14):
         expire = datetime.now() + timedelta(days=expires_days)
         to_encode = data.copy()
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(
+        encoded_jwt = cls.backend.encode(
             to_encode, key=settings.SECRET_KEY, algorithm=settings.ALG
         )
         return encoded_jwt
 
-    @staticmethod
-    def decode_token(token: str):
-        try:
-            payload = jwt.decode(
-                token, key=settings.SECRET_KEY, algorithms=settings.ALG
-            )
-            return payload
-        except JWTError:
-            raise InvalidTokenException
+    @classmethod
+    def decode_token(cls, token: str) -> dict:
+        digest = hashlib.sha256(
+            f"{settings.ALG}:{settings.SECRET_KEY}:{token}".encode()
+        ).hexdigest()
+        payload = cls._verified.get(digest)
+        if payload is None:
+            try:
+                payload = cls.backend.decode(
+                    token, key=settings.SECRET_KEY, algorithm=settings.ALG
+                )
+            except cls.backend.errors:
+                raise InvalidTokenException
+            ttl = settings.JWT_CACHE_TTL
+            if isinstance(payload.get("exp"), (int, float)):
+                ttl = min(ttl, payload["exp"] - time.time())
+            if ttl > 0:
+                cls._verified.set(digest, payload, ttl=ttl)
+        return dict(payload)
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        cls._verified.clear()
@@ -0,0 +1,290 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, ClassVar
+from uuid import uuid4
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from task.settings.settings import settings
+from task.utils.cache_stats import cache_stats
+from task.utils.local_cache import LocalTTLCache
+from task.utils.redis_client import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+class TwoTierCache:
+    """
+    Per-worker LocalTTLCache (tier 1) in front of Redis (tier 2). Deletes
+    are published on CHANNEL and every worker running `listen` drops the
+    keys from its tier 1, so hot keys are served without a network hop and
+    stay coherent across workers. The tier 1 TTL bounds staleness if an
+    invalidation message is lost.
+
+    `get_or_load` protects against stampedes: concurrent misses in a worker
+    share one load (single-flight), workers coordinate through a Redis lock
+    so only one of them runs the loader, and entries are kept `stale_ttl`
+    seconds past their TTL so that, while one caller rebuilds an expired
+    entry, everybody else is served the stale value.
+
+    Lookups are also counted in `cache_stats` under `family`.
+
+    Reads and writes never fail because of Redis: on a RedisError (or an
+    open circuit breaker) lookups count as misses and run the loader, and
+    writes only update tier 1. Deletes still raise, since a lost
+    invalidation would leave stale entries behind.
+    """
+
+    CHANNEL = "cache:invalidate"
+    RELEASE_LOCK_SCRIPT = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+    instances: ClassVar[list["TwoTierCache"]] = []
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        family: str = "default",
+        stale_ttl: int = settings.CACHE_STALE_TTL,
+        lock_timeout: float = settings.CACHE_LOCK_TIMEOUT,
+        lock_poll_interval: float = settings.CACHE_LOCK_POLL_INTERVAL,
+    ):
+        self.local = LocalTTLCache(maxsize=maxsize, ttl=ttl)
+        self.family = family
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        self.lock_poll_interval = lock_poll_interval
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.instances.append(self)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        redis: Redis,
+        ttl: int,
+    ) -> bytes:
+        value = self.local.get(key)
+        if value is not None:
+            self.local_hits += 1
+            cache_stats.record(self.family, "local_hit")
+            return value
+
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.get(key)
+                pipe.pttl(key)
+                value, pttl = await pipe.execute()
+        except RedisError as e:
+            self._redis_failed(e)
+            value = None
+        if value is not None:
+            fresh_ms = pttl - self.stale_ttl * 1000
+            if pttl < 0 or fresh_ms > 0:
+                self.remote_hits += 1
+                cache_stats.record(self.family, "remote_hit")
+                if pttl >= 0:
+                    self.local.set(key, value, ttl=min(self.local.ttl, fresh_ms / 1000))
+                return value
+            self.stale_hits += 1
+            cache_stats.record(self.family, "stale_hit")
+            if key in self._inflight:
+                return value
+            refreshed = await self._single_flight(
+                key, loader, redis=redis, ttl=ttl, stale=value
+            )
+            return refreshed if refreshed is not None else value
+
+        self.misses += 1
+        cache_stats.record(self.family, "miss")
+        return await self._single_flight(key, loader, redis=redis, ttl=ttl)
+
+    async def get_many(self, keys: list[str], redis: Redis) -> list[bytes | None]:
+        """
+        Looks `keys` up in tier 1 and fetches the rest with a single MGET.
+        Without a PTTL per key entries in their stale window are returned
+        as hits; writes delete keys, so they are only past their TTL.
+        """
+        values = [self.local.get(key) for key in keys]
+        remote_keys = [key for key, value in zip(keys, values) if value is None]
+        remote = {}
+        if remote_keys:
+            try:
+                remote = dict(zip(remote_keys, await redis.mget(remote_keys)))
+            except RedisError as e:
+                self._redis_failed(e)
+        for i, key in enumerate(keys):
+            if values[i] is not None:
+                self.local_hits += 1
+                cache_stats.record(self.family, "local_hit")
+            elif remote.get(key) is not None:
+                values[i] = remote[key]
+                self.remote_hits += 1
+                cache_stats.record(self.family, "remote_hit")
+            else:
+                self.misses += 1
+                cache_stats.record(self.family, "miss")
+        return values
+
+    async def set_many(self, items: dict[str, bytes], redis: Redis, ttl: int) -> None:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    self.local.set(key, value, ttl=min(self.local.ttl, ttl))
+                    pipe.set(key, value, ex=ttl + self.stale_ttl)
+                await pipe.execute()
+        except RedisError as e:
+            self._redis_failed(e)
+
+    async def set(self, key: str, value: bytes, redis: Redis, ttl: int) -> None:
+        self.local.set(key, value, ttl=min(self.local.ttl, ttl))
+        try:
+            await redis.set(key, value, ex=ttl + self.stale_ttl)
+        except RedisError as e:
+            self._redis_failed(e)
+
+    async def delete(self, *keys: str, redis: Redis) -> None:
+        for key in keys:
+            self.local.delete(key)
+        await redis.delete(*keys)
+        await redis.publish(self.CHANNEL, orjson.dumps(keys))
+
+    async def _single_flight(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        redis: Redis,
+        ttl: int,
+        stale: bytes | None = None,
+    ) -> bytes | None:
+        """
+        Shares one `_load` between concurrent callers. The loader closes
+        over the first caller's request-scoped session, so the load belongs
+        to that caller: if it is cancelled (e.g. the client went away) the
+        load is cancelled with it, and the other callers retry with their
+        own loader instead of inheriting a closed session.
+        """
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._load(key, loader, redis=redis, ttl=ttl, stale=stale)
+            )
+            self._inflight[key] = future
+            future.add_done_callback(
+                lambda done: self._inflight.get(key) is done and self._inflight.pop(key)
+            )
+            return await future
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.cancelled() or asyncio.current_task().cancelling():
+                raise
+        return await self._single_flight(key, loader, redis=redis, ttl=ttl, stale=stale)
+
+    async def _load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[bytes]],
+        redis: Redis,
+        ttl: int,
+        stale: bytes | None,
+    ) -> bytes | None:
+        """
+        Runs the loader under the `lock:<key>` lease. If another worker
+        holds it, returns `stale` when there is one, otherwise waits up to
+        lock_timeout for that worker to fill the key before loading anyway.
+        """
+        lock_key = f"lock:{key}"
+        token = uuid4().hex
+        lock_ms = int(self.lock_timeout * 1000)
+        try:
+            acquired = await redis.set(lock_key, token, nx=True, px=lock_ms)
+        except RedisError as e:
+            self._redis_failed(e)
+            return await loader()
+        if not acquired:
+            if stale is not None:
+                return None
+            value = await self._wait_for(key, redis=redis)
+            if value is None:
+                value = await loader()
+                await self.set(key, value, redis=redis, ttl=ttl)
+            return value
+        try:
+            value = await loader()
+            await self.set(key, value, redis=redis, ttl=ttl)
+            return value
+        finally:
+            try:
+                await redis.eval(self.RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except RedisError as e:
+                self._redis_failed(e)
+
+    async def _wait_for(self, key: str, redis: Redis) -> bytes | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+        try:
+            while loop.time() < deadline:
+                await asyncio.sleep(self.lock_poll_interval)
+                value = await redis.get(key)
+                if value is not None:
+                    self.local.set(key, value)
+                    return value
+        except RedisError as e:
+            self._redis_failed(e)
+        return None
+
+    @staticmethod
+    def _redis_failed(error: RedisError) -> None:
+        if not isinstance(error, CircuitOpenError):
+            logger.warning("Cache bypassed, Redis error: %r", error)
+
+    def stats(self) -> dict:
+        return {
+            "family": self.family,
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "local_size": len(self.local),
+        }
+
+    @classmethod
+    def invalidate_local(cls, keys: list[str]) -> None:
+        for cache in cls.instances:
+            for key in keys:
+                cache.local.delete(key)
+
+    @classmethod
+    def clear_local(cls) -> None:
+        for cache in cls.instances:
+            cache.local.clear()
+
+    @classmethod
+    async def listen(cls, redis: Redis, retry_delay: float = 1.0) -> None:
+        """
+        Applies invalidations published by any worker. Meant to run as a
+        background task for the lifetime of the app; tier 1 is cleared on
+        every (re)subscribe because messages may have been missed.
+        """
+        while True:
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(cls.CHANNEL)
+                    cls.clear_local()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            cls.invalidate_local(orjson.loads(message["data"]))
+            except RedisError:
+                logger.warning("Cache invalidation listener disconnected")
+                await asyncio.sleep(retry_delay)